@@ -0,0 +1,247 @@
+"""Season analytics: Elo-style skill ratings and finishing statistics.
+
+Game placements are read from the ``game_placements`` table into per-player
+columns of running sums, so a refresh only folds in rows written since the
+last one. When NumPy is installed the column updates
+and the pairwise rating maths run as array operations; otherwise the same
+numbers are computed with plain Python.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable, Optional, Sequence
+
+from db import add_commit_listener, iter_game_placements, remove_commit_listener
+
+try:
+    import numpy as np
+except ImportError:  # optional accelerator; the pure-Python path gives identical results
+    np = None
+
+INITIAL_RATING = 1500.0
+ELO_K = 32.0
+ELO_SCALE = 400.0
+# finishing positions that count as "in the money"
+ITM_PLACES = 3
+STAT_SORT_KEYS = ("rating", "games", "wins", "average_finish", "itm_rate", "points_per_game", "volatility")
+_COLUMNS = ("games", "wins", "itm", "rank_sum", "delta_sum", "delta_sq_sum")
+
+
+# one game as (game_id, played_at, player_ids, ranks, points)
+Game = tuple[int, str, list[int], list[int], list[int]]
+
+
+def group_games(rows: Iterable) -> list[Game]:
+    """Collect placement rows into games, in the order they are rated.
+
+    Rows are grouped on ``game_id`` rather than adjacency: an import can add
+    placements to a game recorded earlier, so its rows need not be
+    consecutive. Games are ordered by ``(played_at, game_id)``.
+    """
+    games: dict[int, Game] = {}
+    for row in rows:
+        game = games.get(row["game_id"])
+        if game is None:
+            game = games[row["game_id"]] = (row["game_id"], row["played_at"], [], [], [])
+        game[2].append(row["player_id"])
+        game[3].append(row["rank"])
+        game[4].append(row["points"])
+    return sorted(games.values(), key=lambda game: (game[1], game[0]))
+
+
+def elo_deltas(ratings: Sequence[float], ranks: Sequence[int], k: float = ELO_K) -> list[float]:
+    """Rating changes for one multi-player game scored as pairwise results.
+
+    Every player is compared with every other: a better finish scores 1, a
+    tie 0.5, a worse one 0. The sum of (actual - expected) is scaled by
+    ``k / (n - 1)`` so a game's total movement does not grow with its size.
+    """
+    n = len(ratings)
+    if n < 2:
+        return [0.0] * n
+    if np is not None:
+        rating = np.asarray(ratings, dtype=float)
+        rank = np.asarray(ranks)
+        expected = 1.0 / (1.0 + 10.0 ** ((rating[None, :] - rating[:, None]) / ELO_SCALE))
+        actual = (rank[:, None] < rank[None, :]) + 0.5 * (rank[:, None] == rank[None, :])
+        # the diagonal contributes 0.5 - 0.5 = 0
+        return ((actual - expected).sum(axis=1) * (k / (n - 1))).tolist()
+
+    changes = []
+    for i in range(n):
+        total = 0.0
+        for j in range(n):
+            if i == j:
+                continue
+            expected = 1.0 / (1.0 + 10.0 ** ((ratings[j] - ratings[i]) / ELO_SCALE))
+            actual = 1.0 if ranks[i] < ranks[j] else 0.5 if ranks[i] == ranks[j] else 0.0
+            total += actual - expected
+        changes.append(total * k / (n - 1))
+    return changes
+
+
+class SeasonStats:
+    """Ratings and per-player finishing statistics, updated incrementally.
+
+    Commits only flag the index as stale; the next query reads the
+    placements added since the last high-water mark and folds them into the
+    columns. Ratings depend on game order, so the index is rebuilt from the
+    first row when new placements join a game that was already rated, when
+    a new game sorts before the last rated one (a back-dated import), or
+    when a commit invalidates everything (re-seed, bulk import).
+    """
+
+    def __init__(self, itm_places: int = ITM_PLACES, k: float = ELO_K) -> None:
+        self.itm_places = itm_places
+        self.k = k
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirty = True
+        self._reload = True
+        self._reset()
+
+    @property
+    def engine(self) -> str:
+        return "numpy" if np is not None else "python"
+
+    def start(self) -> None:
+        add_commit_listener(self._on_commit)
+        self._reload = True
+        self._refresh()
+
+    def stop(self) -> None:
+        remove_commit_listener(self._on_commit)
+
+    def summary(self, limit: int = 50, sort: str = "rating") -> dict[str, object]:
+        """Top ``limit`` players by ``sort`` (see ``STAT_SORT_KEYS``)."""
+        if sort not in STAT_SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(STAT_SORT_KEYS)}")
+        self._refresh()
+        with self._lock:
+            players = [self._player_stats(player_id, column) for player_id, column in self._index.items()]
+            games = self._games
+        # a lower average finish is better; everything else ranks high-to-low
+        descending = sort != "average_finish"
+        players.sort(key=lambda entry: (-entry[sort] if descending else entry[sort], entry["player_id"]))
+        return {"games": games, "players": players[:limit]}
+
+    def player(self, player_id: int) -> Optional[dict[str, object]]:
+        self._refresh()
+        with self._lock:
+            column = self._index.get(player_id)
+            return None if column is None else self._player_stats(player_id, column)
+
+    # --- incremental maintenance -----------------------------------------
+    def _on_commit(self, version: int, player_ids: Optional[frozenset[int]]) -> None:
+        if player_ids is None:
+            self._reload = True
+        if player_ids is None or player_ids:
+            self._dirty = True
+
+    def _refresh(self) -> None:
+        if not self._dirty:
+            return
+        with self._refresh_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            reload, self._reload = self._reload, False
+            rows = [] if reload else list(iter_game_placements(self._high_water))
+            games = group_games(rows)
+            if not reload and games and self._needs_rebuild(games):
+                reload = True
+            if reload:
+                rows = list(iter_game_placements())
+                games = group_games(rows)
+            with self._lock:
+                if reload:
+                    self._reset()
+                if not rows:
+                    return
+                self._apply(games)
+                self._high_water = rows[-1]["id"]
+
+    def _needs_rebuild(self, games: list[Game]) -> bool:
+        first = games[0]
+        return (first[1], first[0]) < self._last_game or any(game[0] in self._rated for game in games)
+
+    def _reset(self) -> None:
+        self._index: dict[int, int] = {}
+        self._ids: list[int] = []
+        self._games = 0
+        self._high_water = 0
+        self._rated: set[int] = set()
+        self._last_game: tuple[str, int] = ("", 0)
+        self._columns = {name: self._zeros(0) for name in _COLUMNS}
+        self._ratings = self._zeros(0)
+
+    def _apply(self, games: list[Game]) -> None:
+        for _, _, players, _, _ in games:
+            for player_id in players:
+                if player_id not in self._index:
+                    self._index[player_id] = len(self._ids)
+                    self._ids.append(player_id)
+        self._grow(len(self._ids))
+
+        # ratings depend on game order, so games are applied one at a time
+        for _, _, players, ranks, _ in games:
+            columns = [self._index[player_id] for player_id in players]
+            changes = elo_deltas([self._ratings[column] for column in columns], ranks, self.k)
+            for column, change in zip(columns, changes):
+                self._ratings[column] += change
+        self._games += len(games)
+        self._rated.update(game[0] for game in games)
+        self._last_game = max(self._last_game, (games[-1][1], games[-1][0]))
+
+        # the running sums are order-independent and updated in one batch
+        columns = [self._index[player_id] for _, _, players, _, _ in games for player_id in players]
+        ranks = [rank for _, _, _, game_ranks, _ in games for rank in game_ranks]
+        deltas = [delta for _, _, _, _, game_deltas in games for delta in game_deltas]
+        self._add("games", columns, [1] * len(columns))
+        self._add("wins", columns, [1 if rank == 1 else 0 for rank in ranks])
+        self._add("itm", columns, [1 if rank <= self.itm_places else 0 for rank in ranks])
+        self._add("rank_sum", columns, ranks)
+        self._add("delta_sum", columns, deltas)
+        self._add("delta_sq_sum", columns, [delta * delta for delta in deltas])
+
+    def _add(self, name: str, columns: list[int], weights: list[float]) -> None:
+        column = self._columns[name]
+        if np is not None:
+            column += np.bincount(columns, weights=weights, minlength=len(column))
+            return
+        for index, weight in zip(columns, weights):
+            column[index] += weight
+
+    def _grow(self, size: int) -> None:
+        extra = size - len(self._ratings)
+        if extra <= 0:
+            return
+        if np is not None:
+            self._columns = {
+                name: np.concatenate([column, np.zeros(extra)]) for name, column in self._columns.items()
+            }
+            self._ratings = np.concatenate([self._ratings, np.full(extra, INITIAL_RATING)])
+        else:
+            for column in self._columns.values():
+                column.extend([0.0] * extra)
+            self._ratings.extend([INITIAL_RATING] * extra)
+
+    @staticmethod
+    def _zeros(size: int):
+        return np.zeros(size) if np is not None else [0.0] * size
+
+    def _player_stats(self, player_id: int, column: int) -> dict[str, object]:
+        games = int(self._columns["games"][column])
+        mean_delta = self._columns["delta_sum"][column] / games
+        variance = max(self._columns["delta_sq_sum"][column] / games - mean_delta * mean_delta, 0.0)
+        return {
+            "player_id": player_id,
+            "rating": round(float(self._ratings[column]), 1),
+            "games": games,
+            "wins": int(self._columns["wins"][column]),
+            "average_finish": round(float(self._columns["rank_sum"][column]) / games, 2),
+            "itm_rate": round(float(self._columns["itm"][column]) / games, 3),
+            "points_per_game": round(float(mean_delta), 1),
+            "volatility": round(math.sqrt(float(variance)), 1),
+        }
@@ -2,26 +2,77 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
-import mimetypes
+import math
 import os
+import select
+import socket
+import sqlite3
+import time
 import urllib.parse
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Optional
+from typing import AsyncGenerator, Callable, Iterable, Iterator, Optional
 
+from analytics import STAT_SORT_KEYS, SeasonStats
+from assets import AssetStore
+from async_server import DEFAULT_MAX_CONNECTIONS, DEFAULT_WORKERS, serve_async
+from auth import BasicAuthenticator
+from backup import BACKUP_DIR, COMPACT_KEEP, SNAPSHOT_KEEP, compact_and_rotate, optimize, snapshot_and_rotate
+from cache import GenerationCache
 from db import (
+    DEFAULT_POOL_SIZE,
+    PERIOD_PATTERN,
+    READ_ROUTES,
+    REPLICA_MAX_STALENESS,
+    REPLICA_REFRESH_INTERVAL,
+    STORAGE_MODES,
+    IdempotencyConflict,
+    IdempotentOutcome,
     add_player,
+    add_query_observer,
+    close_pool,
+    close_reads,
+    configure_pool,
+    configure_reads,
+    configure_storage,
+    data_version,
+    get_game,
     get_player,
     get_player_history,
+    get_players,
+    get_pool,
+    get_recent_history,
     initialize_database,
+    iter_leaderboard,
+    iter_player_history,
+    list_games,
     list_leaderboard,
-    record_score_change,
+    list_period_leaderboard,
+    note_session_write,
+    parse_played_at,
+    purge_idempotency_keys,
+    read_version,
     record_game_results,
+    record_game_results_once,
+    record_score_change,
+    record_score_change_once,
+    remove_query_observer,
+    replica_reads,
     update_player_profile,
     seed_sample_data,
+    stop_external_watch,
+    stop_writer,
+    watch_external_writes,
 )
+from live import DISCONNECT_CHECK_SECONDS, HEARTBEAT_SECONDS, LeaderboardHub
+from metrics import Counter, Gauge, Histogram, Registry, SlowQueryLog
+from ranking import RankIndex
+from ratelimit import AdmissionController
+from router import RouteMatch, Router
+from scheduler import PeriodicTask
 
 # --- configuration ---------------------------------------------------
 ROOT_DIR = Path(__file__).resolve().parent.parent
@@ -43,19 +94,300 @@ def load_config() -> dict[str, str]:
 CONFIG = load_config()
 ADMIN_USERNAME = CONFIG.get("admin_username") or os.environ.get("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = CONFIG.get("admin_password") or os.environ.get("ADMIN_PASSWORD", "clubsecret")
+# a hash from ``python auth.py hash`` takes precedence over the plain-text password
+ADMIN_PASSWORD_HASH = CONFIG.get("admin_password_hash") or os.environ.get("ADMIN_PASSWORD_HASH", "")
+# API responses are revalidated on every use (cheap thanks to ETags); static
+# assets may be reused for a short while without asking
+API_CACHE_CONTROL = CONFIG.get("api_cache_control") or os.environ.get("API_CACHE_CONTROL", "no-cache")
+STATIC_CACHE_CONTROL = CONFIG.get("static_cache_control") or os.environ.get(
+    "STATIC_CACHE_CONTROL", "public, max-age=300"
+)
+ADMIN_CACHE_CONTROL = "private, no-cache"
+
+
+# server-side ceiling for any page of leaderboard or history rows
+MAX_PAGE_SIZE = 200
+DEFAULT_HISTORY_PAGE_SIZE = 20
+
+ADMIN_AUTH = BasicAuthenticator(ADMIN_USERNAME, ADMIN_PASSWORD_HASH or ADMIN_PASSWORD)
+
+# admission control: writes are rate limited per client (all POSTs) and per
+# client and route; every non-streaming request needs a concurrency slot.
+# Limits are (burst, requests per second) and may be overridden in config.json
+# under "rate_limits" using the keys below.
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, float]] = {
+    "client": (30, 5),
+    "POST /api/players": (5, 0.1),
+    "POST /api/players/{player_id:int}/scores": (20, 2),
+}
+MAX_CONCURRENT_REQUESTS = int(
+    CONFIG.get("max_concurrent_requests") or os.environ.get("MAX_CONCURRENT_REQUESTS", "64")
+)
+# handlers that hold their slot for the life of a connection are not counted
+UNCAPPED_HANDLERS = frozenset({"handle_leaderboard_stream"})
+
+
+def build_admission_controller() -> AdmissionController:
+    limits = dict(DEFAULT_RATE_LIMITS)
+    limits.update({key: tuple(value) for key, value in CONFIG.get("rate_limits", {}).items()})
+    client_limit = limits.pop("client", None)
+    try:
+        return AdmissionController(client_limit, limits, MAX_CONCURRENT_REQUESTS)
+    except (TypeError, ValueError) as exc:
+        raise RuntimeError(f"Invalid rate_limits in config.json: {exc}") from exc
+
+
+ADMISSION = build_admission_controller()
+
+# clients may retry score and game submissions safely by repeating the same
+# Idempotency-Key header; stored outcomes are purged once they expire
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+IDEMPOTENCY_JANITOR = PeriodicTask("idempotency-expiry", 3600, purge_idempotency_keys, run_at_start=True)
+CORS_ALLOW_HEADERS = "Content-Type, Idempotency-Key"
+
+# where GET handlers read from (see db.READ_ROUTES); "snapshot" serves them
+# from a copy refreshed every few seconds and falls back to the live file
+# once the copy is more than read_max_staleness seconds behind
+READ_ROUTE = CONFIG.get("read_route") or os.environ.get("READ_ROUTE", "primary")
+READ_REFRESH_INTERVAL = float(
+    CONFIG.get("read_refresh_interval") or os.environ.get("READ_REFRESH_INTERVAL", str(REPLICA_REFRESH_INTERVAL))
+)
+READ_MAX_STALENESS = float(
+    CONFIG.get("read_max_staleness") or os.environ.get("READ_MAX_STALENESS", str(REPLICA_MAX_STALENESS))
+)
+
+# online snapshots, compacted copies and planner statistics (see backup.py);
+# intervals are in seconds and 0 disables a job
+SNAPSHOT_DIR = Path(CONFIG.get("backup_dir") or os.environ.get("BACKUP_DIR") or BACKUP_DIR)
+SNAPSHOT_INTERVAL = float(CONFIG.get("snapshot_interval", os.environ.get("SNAPSHOT_INTERVAL", "21600")))
+SNAPSHOT_RETAIN = int(CONFIG.get("snapshot_keep") or os.environ.get("SNAPSHOT_KEEP", str(SNAPSHOT_KEEP)))
+COMPACT_INTERVAL = float(CONFIG.get("compact_interval", os.environ.get("COMPACT_INTERVAL", "604800")))
+OPTIMIZE_INTERVAL = float(CONFIG.get("optimize_interval", os.environ.get("OPTIMIZE_INTERVAL", "86400")))
+_snapshot_version = -1
+
+
+def snapshot_if_changed() -> None:
+    """Take a snapshot unless nothing has been committed since the last one."""
+    global _snapshot_version
+    version = data_version()
+    if version == _snapshot_version:
+        return
+    snapshot_and_rotate(SNAPSHOT_DIR, SNAPSHOT_RETAIN)
+    _snapshot_version = version
+
+
+MAINTENANCE_TASKS = [
+    task
+    for task in (
+        PeriodicTask("db-snapshot", SNAPSHOT_INTERVAL, snapshot_if_changed),
+        PeriodicTask("db-compact", COMPACT_INTERVAL, lambda: compact_and_rotate(SNAPSHOT_DIR, COMPACT_KEEP)),
+        PeriodicTask("db-optimize", OPTIMIZE_INTERVAL, optimize),
+    )
+    if task.interval > 0
+]
+LEADERBOARD_CACHE = GenerationCache()
+LIVE_HUB = LeaderboardHub()
+RANK_INDEX = RankIndex()
+SEASON_STATS = SeasonStats()
+DEFAULT_NEIGHBOURS = 2
+MAX_NEIGHBOURS = 25
+# GET /api/players?ids=...&history=N
+MAX_BATCH_IDS = 100
+MAX_BATCH_HISTORY = 50
+ASSETS = AssetStore(FRONTEND_DIR)
+# data_version() restarts at zero with the process; the epoch keeps API ETags
+# from one run from validating responses of another
+ETAG_EPOCH = format(time.time_ns(), "x")
+
+# --- metrics ---------------------------------------------------------
+# off by default: dispatch then skips all timing and /metrics answers 404
+METRICS_ENABLED = bool(CONFIG.get("metrics")) or os.environ.get("METRICS", "") == "1"
+SLOW_QUERY_MS = float(CONFIG.get("slow_query_ms") or os.environ.get("SLOW_QUERY_MS", "0"))
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS = Registry()
+HTTP_REQUESTS = METRICS.register(
+    Counter("http_requests_total", "HTTP requests handled", ("route", "method", "status"))
+)
+HTTP_LATENCY = METRICS.register(
+    Histogram("http_request_duration_seconds", "Time spent handling a request", ("route",))
+)
+HTTP_IN_FLIGHT = METRICS.register(
+    Gauge("http_requests_in_flight", "Requests currently being handled", ("route",))
+)
+DB_LATENCY = METRICS.register(
+    Histogram("db_query_duration_seconds", "Time spent in db.py query functions", ("function",))
+)
+DB_ROWS = METRICS.register(Counter("db_rows_total", "Rows returned or written by db.py functions", ("function",)))
+METRICS.register(
+    Gauge(
+        "db_pool_connections",
+        "SQLite connections held by the pool",
+        ("state",),
+        collect=lambda: [(("open",), get_pool().stats()["opened"]), (("idle",), get_pool().stats()["idle"])],
+    )
+)
+METRICS.register(
+    Counter(
+        "leaderboard_cache_requests_total",
+        "Leaderboard response cache lookups",
+        ("result",),
+        collect=lambda: [(("hit",), LEADERBOARD_CACHE.hits), (("miss",), LEADERBOARD_CACHE.misses)],
+    )
+)
+METRICS.register(
+    Gauge(
+        "sse_subscribers",
+        "Connected live leaderboard clients",
+        collect=lambda: [((), LIVE_HUB.subscriber_count())],
+    )
+)
+METRICS.register(
+    Counter(
+        "sse_evictions_total",
+        "Live clients dropped for falling behind",
+        collect=lambda: [((), LIVE_HUB.evicted)],
+    )
+)
+
+
+def observe_query(name: str, seconds: float, rows: int) -> None:
+    DB_LATENCY.observe(seconds, name)
+    DB_ROWS.inc(name, amount=rows)
+
+
+def etag_matches(handler: BaseHTTPRequestHandler, etag: str) -> bool:
+    """Return True if the request's If-None-Match covers ``etag``."""
+    header = handler.headers.get("If-None-Match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
 
 
-def json_response(handler: BaseHTTPRequestHandler, data: object, status: HTTPStatus = HTTPStatus.OK) -> None:
-    payload = json.dumps(data).encode("utf-8")
+def send_not_modified(handler: BaseHTTPRequestHandler, etag: str, cache_control: str) -> None:
+    handler.send_response(HTTPStatus.NOT_MODIFIED.value)
+    handler.send_header("ETag", etag)
+    handler.send_header("Cache-Control", cache_control)
+    handler.send_header("Access-Control-Allow-Origin", "*")
+    handler.end_headers()
+
+
+def json_response(
+    handler: BaseHTTPRequestHandler,
+    data: object,
+    status: HTTPStatus = HTTPStatus.OK,
+    *,
+    etag: Optional[str] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> None:
+    send_json_bytes(handler, json.dumps(data).encode("utf-8"), status, etag=etag, headers=headers)
+
+
+def send_json_bytes(
+    handler: BaseHTTPRequestHandler,
+    payload: bytes,
+    status: HTTPStatus = HTTPStatus.OK,
+    *,
+    etag: Optional[str] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> None:
     handler.send_response(status.value)
     handler.send_header("Content-Type", "application/json; charset=utf-8")
     handler.send_header("Content-Length", str(len(payload)))
-    handler.send_header("Access-Control-Allow-Origin", "*")
-    handler.send_header("Access-Control-Allow-Headers", "Content-Type")
+    if etag is not None:
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", API_CACHE_CONTROL)
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if getattr(handler, "cors_enabled", True):
+        handler.send_header("Access-Control-Allow-Origin", "*")
+        handler.send_header("Access-Control-Allow-Headers", CORS_ALLOW_HEADERS)
     handler.end_headers()
     handler.wfile.write(payload)
 
 
+def client_disconnected(sock: socket.socket) -> bool:
+    """True once the peer has closed ``sock``; streaming clients send nothing after the request."""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b""
+    except (OSError, ValueError):
+        return True
+
+
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def stream_response(
+    handler: BaseHTTPRequestHandler,
+    chunks: Iterable[bytes],
+    content_type: str,
+    status: HTTPStatus = HTTPStatus.OK,
+) -> None:
+    """Send a body of unknown length without materialising it.
+
+    HTTP/1.1 connections (the asyncio engine) get chunked transfer encoding;
+    HTTP/1.0 responses are delimited by closing the connection instead.
+    """
+    chunked = handler.protocol_version >= "HTTP/1.1" and handler.request_version >= "HTTP/1.1"
+    handler.send_response(status.value)
+    handler.send_header("Content-Type", content_type)
+    if getattr(handler, "cors_enabled", True):
+        handler.send_header("Access-Control-Allow-Origin", "*")
+    if chunked:
+        handler.send_header("Transfer-Encoding", "chunked")
+    else:
+        handler.close_connection = True
+        handler.send_header("Connection", "close")
+    handler.end_headers()
+
+    try:
+        for chunk in coalesce_chunks(chunks):
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+        if chunked:
+            handler.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionError):
+        handler.close_connection = True
+
+
+def coalesce_chunks(pieces: Iterable[bytes], size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """Group small encoded pieces into writes of roughly ``size`` bytes."""
+    buffer: list[bytes] = []
+    pending = 0
+    for piece in pieces:
+        buffer.append(piece)
+        pending += len(piece)
+        if pending >= size:
+            yield b"".join(buffer)
+            buffer, pending = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def encode_json_stream(prefix: dict[str, object], key: str, items: Iterable[object]) -> Iterator[bytes]:
+    """Encode ``{**prefix, key: [items...]}`` incrementally, one item at a time."""
+    head = json.dumps(prefix)[:-1]
+    yield f'{head}{", " if prefix else ""}{json.dumps(key)}: ['.encode("utf-8")
+    separator = b""
+    for item in items:
+        yield separator + json.dumps(item).encode("utf-8")
+        separator = b", "
+    yield b"]}"
+
+
+def encode_ndjson_stream(items: Iterable[object]) -> Iterator[bytes]:
+    for item in items:
+        yield json.dumps(item).encode("utf-8") + b"\n"
+
+
+def replay_headers(outcome: IdempotentOutcome) -> dict[str, str]:
+    return {"Idempotent-Replayed": "true"} if outcome.replayed else {}
+
+
 def read_request_json(handler: BaseHTTPRequestHandler) -> dict:
     length = int(handler.headers.get("Content-Length", "0"))
     raw = handler.rfile.read(length) if length else b"{}"
@@ -68,123 +400,531 @@ def read_request_json(handler: BaseHTTPRequestHandler) -> dict:
 
 def serve_static(handler: BaseHTTPRequestHandler, path: str) -> None:
     relative = path.lstrip("/") or "index.html"
-    candidate = FRONTEND_DIR / relative
-    candidate = candidate.resolve()
-    try:
-        candidate.relative_to(FRONTEND_DIR)
-    except ValueError:
+    asset = ASSETS.get(relative)
+    if asset is None:
         handler.send_error(HTTPStatus.NOT_FOUND)
         return
 
-    if not candidate.exists() or candidate.is_dir():
-        handler.send_error(HTTPStatus.NOT_FOUND)
+    cache_control = ADMIN_CACHE_CONTROL if relative in {"admin.html", "admin.js"} else STATIC_CACHE_CONTROL
+    payload, etag, encoding = asset.negotiate(handler.headers.get("Accept-Encoding", ""))
+    if etag_matches(handler, etag):
+        send_not_modified(handler, etag, cache_control)
         return
 
-    mime, _ = mimetypes.guess_type(str(candidate))
-    payload = candidate.read_bytes()
-
     handler.send_response(HTTPStatus.OK.value)
-    handler.send_header("Content-Type", mime or "application/octet-stream")
+    handler.send_header("Content-Type", asset.mime)
     handler.send_header("Content-Length", str(len(payload)))
+    if encoding is not None:
+        handler.send_header("Content-Encoding", encoding)
+    if asset.encodings:
+        handler.send_header("Vary", "Accept-Encoding")
+    handler.send_header("ETag", etag)
+    handler.send_header("Cache-Control", cache_control)
     handler.end_headers()
     handler.wfile.write(payload)
 
 
+def encode_cursor(*values: object) -> str:
+    """Opaque page token carrying the sort key of the last row served."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, *types: type) -> tuple:
+    """Inverse of ``encode_cursor``; raises ValueError for tampered tokens."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("malformed cursor")
+    if not all(isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types)):
+        raise ValueError("malformed cursor")
+    return tuple(values)
+
+
+def build_leaderboard_payload(
+    limit: int, after: Optional[tuple[int, str]] = None, period: Optional[str] = None
+) -> bytes:
+    if period is None:
+        rows = list_leaderboard(limit=limit, after=after)
+    else:
+        rows = list_period_leaderboard(period, limit=limit, after=after)
+    players = [
+        {
+            "id": row["id"],
+            "nickname": row["nickname"],
+            "total_points": row["total_points"],
+            "slogan": row["slogan"],
+            "avatar_url": row["avatar_url"],
+            "finals_played": row["finals_played"],
+        }
+        for row in rows
+    ]
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1]["total_points"], rows[-1]["nickname"])
+    body: dict[str, object] = {"players": players, "next_cursor": next_cursor}
+    if period is not None:
+        body["period"] = period
+    return json.dumps(body).encode("utf-8")
+
+
+def player_payload(row: sqlite3.Row) -> dict[str, object]:
+    return {
+        "id": row["id"],
+        "nickname": row["nickname"],
+        "total_points": row["total_points"],
+        "slogan": row["slogan"],
+        "avatar_url": row["avatar_url"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "finals_played": row["finals_played"],
+        "rank": RANK_INDEX.rank(row["id"]),
+    }
+
+
+def history_payload(rows: Iterable[sqlite3.Row]) -> list[dict[str, object]]:
+    return [{"delta": row["delta"], "reason": row["reason"], "created_at": row["created_at"]} for row in rows]
+
+
+def build_stats_payload(limit: int, sort: str) -> bytes:
+    summary = SEASON_STATS.summary(limit=limit, sort=sort)
+    rows = get_players(entry["player_id"] for entry in summary["players"])
+    nicknames = {row["id"]: row["nickname"] for row in rows}
+    players = [{**entry, "nickname": nicknames.get(entry["player_id"])} for entry in summary["players"]]
+    payload = {
+        "engine": SEASON_STATS.engine,
+        "itm_places": SEASON_STATS.itm_places,
+        "games": summary["games"],
+        "sort": sort,
+        "players": players,
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def build_history_page(
+    player_id: int, limit: int, before: Optional[tuple[str, int]] = None
+) -> tuple[list[dict[str, object]], Optional[str]]:
+    rows = get_player_history(player_id, limit=limit, before=before)
+    history = history_payload(rows)
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if len(rows) == limit else None
+    return history, next_cursor
+
+
+def build_games_page(
+    limit: int,
+    since: Optional[str] = None,
+    after: Optional[tuple[str, int]] = None,
+    player_id: Optional[int] = None,
+) -> bytes:
+    rows = list_games(since=since, limit=limit, after=after, player_id=player_id)
+    games = []
+    for row in rows:
+        entry = {
+            "id": row["id"],
+            "label": row["label"],
+            "played_at": row["played_at"],
+            "entrants": row["entrants"],
+            "winner": row["winner"],
+        }
+        if player_id is not None:
+            entry["rank"] = row["rank"]
+            entry["points"] = row["points"]
+        games.append(entry)
+    next_cursor = encode_cursor(rows[-1]["played_at"], rows[-1]["id"]) if len(rows) == limit else None
+    return json.dumps({"games": games, "next_cursor": next_cursor}).encode("utf-8")
+
+
+ROUTES = Router()
+ROUTES.add("GET", "/api/leaderboard", "handle_leaderboard")
+ROUTES.add("GET", "/api/leaderboard/stream", "handle_leaderboard_stream")
+ROUTES.add("GET", "/api/players", "handle_player_batch")
+ROUTES.add("GET", "/api/players/{player_id:int}", "handle_player_detail")
+ROUTES.add("GET", "/api/players/{player_id:int}/history", "handle_player_history")
+ROUTES.add("GET", "/api/stats", "handle_stats")
+ROUTES.add("GET", "/api/games", "handle_list_games")
+ROUTES.add("GET", "/api/games/{game_id:int}", "handle_game_detail")
+ROUTES.add("GET", "/api/export/leaderboard", "handle_export_leaderboard")
+ROUTES.add("GET", "/api/export/players/{player_id:int}/history", "handle_export_history")
+ROUTES.add("GET", "/metrics", "handle_metrics", cors=False)
+ROUTES.add("GET", "/admin.html", "handle_static", admin=True, cors=False)
+ROUTES.add("GET", "/admin.js", "handle_static", admin=True, cors=False)
+ROUTES.add("POST", "/api/players", "handle_create_player")
+ROUTES.add("POST", "/api/players/{player_id:int}/scores", "handle_record_score")
+ROUTES.add("POST", "/api/players/{player_id:int}/profile", "handle_update_profile", admin=True)
+ROUTES.add("POST", "/api/games", "handle_submit_game", admin=True)
+ROUTES.compile()
+ALLOWED_METHODS = ", ".join([*ROUTES.methods(), "OPTIONS"])
+
+
 class LeaderboardHandler(BaseHTTPRequestHandler):
+    cors_enabled = True
+    query: dict[str, list[str]] = {}
+    status_code = 0
+    async_stream: Optional[Callable[[], AsyncGenerator[bytes, None]]] = None
+
     # --- auth helpers -------------------------------------------------
     def ensure_admin(self) -> bool:
-        if not ADMIN_PASSWORD:
+        decision = ADMIN_AUTH.check(self.headers.get("Authorization", ""), self.client_address[0])
+        if decision.allowed:
             return True
-
-        header = self.headers.get("Authorization", "")
-        if not header.startswith("Basic "):
-            self.send_auth_challenge()
-            return False
-
-        try:
-            decoded = base64.b64decode(header.split(" ", 1)[1]).decode("utf-8")
-        except Exception:
-            self.send_auth_challenge()
-            return False
-
-        username, _, password = decoded.partition(":")
-        if username != ADMIN_USERNAME or password != ADMIN_PASSWORD:
+        if decision.retry_after:
+            self.send_login_throttled(decision.retry_after)
+        else:
             self.send_auth_challenge()
-            return False
-
-        return True
+        return False
 
     def send_auth_challenge(self) -> None:
         self.send_response(HTTPStatus.UNAUTHORIZED.value)
         self.send_header("WWW-Authenticate", f'Basic realm="{ADMIN_REALM}"')
         self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(b"Authentication required")))
         self.end_headers()
         self.wfile.write(b"Authentication required")
 
+    def send_login_throttled(self, retry_after: float) -> None:
+        body = b"Too many failed login attempts"
+        self.send_response(HTTPStatus.TOO_MANY_REQUESTS.value)
+        self.send_header("Retry-After", str(math.ceil(retry_after)))
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_OPTIONS(self) -> None:  # noqa: N802
         self.send_response(HTTPStatus.NO_CONTENT.value)
         self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", CORS_ALLOW_HEADERS)
+        self.send_header("Access-Control-Allow-Methods", ALLOWED_METHODS)
         self.end_headers()
 
     def do_GET(self) -> None:  # noqa: N802
-        if self.path.startswith("/api/leaderboard"):
-            self.handle_leaderboard()
-        elif self.path.startswith("/api/players/"):
-            self.handle_player_detail()
-        elif self.path in {"/admin.html", "/admin.js"}:
-            if not self.ensure_admin():
-                return
-            serve_static(self, urllib.parse.urlparse(self.path).path)
-        else:
-            serve_static(self, urllib.parse.urlparse(self.path).path)
+        self.dispatch()
 
     def do_POST(self) -> None:  # noqa: N802
-        if self.path == "/api/players":
-            self.handle_create_player()
-        elif self.path.startswith("/api/players/") and self.path.endswith("/scores"):
-            self.handle_record_score()
-        elif self.path.startswith("/api/players/") and self.path.endswith("/profile"):
-            if not self.ensure_admin():
-                return
-            self.handle_update_profile()
-        elif self.path == "/api/games":
-            if not self.ensure_admin():
-                return
-            self.handle_submit_game()
+        self.dispatch()
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        self.status_code = code
+        super().send_response(code, message)
+
+    def dispatch(self) -> None:
+        match = ROUTES.match(self.command, self.path)
+        if not METRICS_ENABLED:
+            self.run_route(match)
+            return
+
+        if match is not None:
+            label = match.route.template
         else:
-            self.send_error(HTTPStatus.NOT_FOUND)
+            label = "static" if self.command == "GET" else "unmatched"
+        HTTP_IN_FLIGHT.inc(label)
+        started = time.perf_counter()
+        try:
+            self.run_route(match)
+        finally:
+            HTTP_IN_FLIGHT.dec(label)
+            HTTP_LATENCY.observe(time.perf_counter() - started, label)
+            HTTP_REQUESTS.inc(label, self.command, str(self.status_code))
+
+    def run_route(self, match: Optional[RouteMatch]) -> None:
+        if self.command == "POST":
+            template = match.route.template if match is not None else "unmatched"
+            retry_after = ADMISSION.check(self.client_address[0], f"POST {template}")
+            if retry_after:
+                self.send_rejection(HTTPStatus.TOO_MANY_REQUESTS, "Too many requests", retry_after)
+                return
+
+        if match is not None and match.route.handler in UNCAPPED_HANDLERS:
+            self.route_request(match)
+            return
+        if not ADMISSION.enter():
+            self.send_rejection(HTTPStatus.SERVICE_UNAVAILABLE, "Server is busy", 1)
+            return
+        try:
+            if self.command == "GET":
+                # GET handlers may read the snapshot replica when one is configured, but
+                # never one older than what this client has already seen or written
+                with replica_reads(self.client_address[0]):
+                    self.route_request(match)
+            else:
+                self.route_request(match)
+                note_session_write(self.client_address[0])
+        finally:
+            ADMISSION.leave()
+
+    def route_request(self, match: Optional[RouteMatch]) -> None:
+        if match is None:
+            allowed = ROUTES.allowed_methods(self.path)
+            if allowed:
+                self.send_method_not_allowed(allowed)
+            elif self.command == "GET":
+                self.query = {}
+                self.handle_static()
+            else:
+                self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        route = match.route
+        if route.admin and not self.ensure_admin():
+            return
+        self.cors_enabled = route.cors
+        self.query = match.query
+        getattr(self, route.handler)(**match.params)
+
+    def send_method_not_allowed(self, allowed: list[str]) -> None:
+        # the request body is never read, so the connection cannot be reused
+        self.close_connection = True
+        json_response(
+            self,
+            {"error": f"{self.command} is not allowed here"},
+            HTTPStatus.METHOD_NOT_ALLOWED,
+            headers={"Allow": ", ".join([*allowed, "OPTIONS"]), "Connection": "close"},
+        )
+
+    def send_rejection(self, status: HTTPStatus, message: str, retry_after: float) -> None:
+        # the request body is never read, so the connection cannot be reused
+        self.close_connection = True
+        json_response(
+            self,
+            {"error": message},
+            status,
+            headers={"Retry-After": str(math.ceil(retry_after)), "Connection": "close"},
+        )
+
+    def query_param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[0] if values else default
 
     # --- API handlers -------------------------------------------------
+    def handle_metrics(self) -> None:
+        if not METRICS_ENABLED:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        payload = METRICS.render()
+        self.send_response(HTTPStatus.OK.value)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_static(self) -> None:
+        serve_static(self, urllib.parse.urlsplit(self.path).path)
+
+    def page_limit(self, name: str, default: int) -> Optional[int]:
+        """Parse a page-size parameter, clamped to ``MAX_PAGE_SIZE``; None after a 400."""
+        try:
+            limit = int(self.query_param(name, str(default)))
+        except ValueError:
+            json_response(self, {"error": f"{name} must be an integer"}, HTTPStatus.BAD_REQUEST)
+            return None
+        return max(1, min(limit, MAX_PAGE_SIZE))
+
+    def page_cursor(self, name: str, *types: type) -> tuple[bool, Optional[tuple]]:
+        """Return ``(ok, cursor)``; ``ok`` is False once a 400 has been sent."""
+        token = self.query_param(name)
+        if not token:
+            return True, None
+        try:
+            return True, decode_cursor(token, *types)
+        except ValueError:
+            json_response(self, {"error": f"{name} is not a valid cursor"}, HTTPStatus.BAD_REQUEST)
+            return False, None
+
     def handle_leaderboard(self) -> None:
-        query = urllib.parse.urlparse(self.path).query
-        params = urllib.parse.parse_qs(query)
+        limit = self.page_limit("limit", 50)
+        if limit is None:
+            return
+        ok, after = self.page_cursor("cursor", int, str)
+        if not ok:
+            return
+        period = self.query_param("period")
+        if period is not None and not PERIOD_PATTERN.match(period):
+            json_response(
+                self, {"error": "period must look like 2026, 2026-S2 or 2026-07"}, HTTPStatus.BAD_REQUEST
+            )
+            return
+
+        # the payload is a pure function of (data version, period, limit, cursor)
+        token = self.query_param("cursor") or ""
+        etag = f'"lb-{ETAG_EPOCH}-{read_version()}-{period or "all"}-{limit}-{token}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
+            return
+
+        payload = LEADERBOARD_CACHE.get_or_build(
+            ("leaderboard", period, limit, after), lambda: build_leaderboard_payload(limit, after, period)
+        )
+        send_json_bytes(self, payload, etag=etag)
+
+    def handle_stats(self) -> None:
+        limit = self.page_limit("limit", 50)
+        if limit is None:
+            return
+        sort = self.query_param("sort", "rating")
+        if sort not in STAT_SORT_KEYS:
+            json_response(
+                self, {"error": f"sort must be one of {', '.join(STAT_SORT_KEYS)}"}, HTTPStatus.BAD_REQUEST
+            )
+            return
+
+        etag = f'"stats-{ETAG_EPOCH}-{read_version()}-{sort}-{limit}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
+            return
+        payload = LEADERBOARD_CACHE.get_or_build(("stats", sort, limit), lambda: build_stats_payload(limit, sort))
+        send_json_bytes(self, payload, etag=etag)
+
+    def handle_list_games(self) -> None:
+        limit = self.page_limit("limit", 50)
+        if limit is None:
+            return
+        ok, after = self.page_cursor("cursor", str, int)
+        if not ok:
+            return
+        since = self.query_param("since")
+        if since is not None:
+            try:
+                since = parse_played_at(since)
+            except ValueError:
+                json_response(self, {"error": "since must be an ISO date or datetime"}, HTTPStatus.BAD_REQUEST)
+                return
         try:
-            limit = int(params.get("limit", [50])[0])
+            player_id = int(self.query_param("player_id")) if self.query_param("player_id") else None
         except ValueError:
-            json_response(self, {"error": "limit must be an integer"}, HTTPStatus.BAD_REQUEST)
+            json_response(self, {"error": "player_id must be an integer"}, HTTPStatus.BAD_REQUEST)
             return
 
-        rows = list_leaderboard(limit=limit)
-        payload = [
-            {
-                "id": row["id"],
-                "nickname": row["nickname"],
-                "total_points": row["total_points"],
-                "slogan": row["slogan"],
-                "avatar_url": row["avatar_url"],
-                "finals_played": row["finals_played"],
-            }
-            for row in rows
-        ]
-        json_response(self, {"players": payload})
+        token = self.query_param("cursor") or ""
+        selection = hashlib.sha256(f"{since}|{player_id}|{token}".encode("utf-8")).hexdigest()[:16]
+        etag = f'"games-{ETAG_EPOCH}-{read_version()}-{limit}-{selection}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
+            return
+        payload = LEADERBOARD_CACHE.get_or_build(
+            ("games", since, player_id, limit, after), lambda: build_games_page(limit, since, after, player_id)
+        )
+        send_json_bytes(self, payload, etag=etag)
+
+    def handle_game_detail(self, game_id: int) -> None:
+        etag = f'"game-{game_id}-{ETAG_EPOCH}-{read_version()}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
+            return
+        found = get_game(game_id)
+        if found is None:
+            json_response(self, {"error": "Game not found"}, HTTPStatus.NOT_FOUND)
+            return
+        game, placements = found
+        payload = {
+            "id": game["id"],
+            "label": game["label"],
+            "played_at": game["played_at"],
+            "entrants": game["entrants"],
+            "placements": [
+                {
+                    "rank": row["rank"],
+                    "player_id": row["player_id"],
+                    "nickname": row["nickname"],
+                    "points": row["points"],
+                }
+                for row in placements
+            ],
+        }
+        json_response(self, payload, etag=etag)
 
-    def handle_player_detail(self) -> None:
+    def handle_leaderboard_stream(self) -> None:
+        subscription = LIVE_HUB.subscribe()
+        if subscription is None:
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE.value)
+            self.send_header("Retry-After", "5")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        # the body has no length; the connection ends with the stream
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK.value)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if getattr(self.server, "async_streams", False):
+            # the event loop pumps the frames, so a spectator never holds a worker thread
+            self.async_stream = lambda: LIVE_HUB.stream(subscription)
+            return
+        idle = 0.0
         try:
-            player_id = int(self.path.split("/")[3])
-        except (IndexError, ValueError):
-            self.send_error(HTTPStatus.NOT_FOUND)
+            while True:
+                frame = subscription.next_frame(DISCONNECT_CHECK_SECONDS)
+                if frame is None:
+                    break
+                if not frame:
+                    # notice a closed client between heartbeats instead of on the next write
+                    if client_disconnected(self.connection):
+                        break
+                    idle += DISCONNECT_CHECK_SECONDS
+                    if idle < HEARTBEAT_SECONDS:
+                        continue
+                idle = 0.0
+                # an SSE comment line doubles as a keep-alive probe
+                self.wfile.write(frame or b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionError):
+            pass
+        finally:
+            LIVE_HUB.unsubscribe(subscription)
+
+    def handle_player_batch(self) -> None:
+        try:
+            ids = [int(part) for part in (self.query_param("ids") or "").split(",") if part.strip()]
+            history_limit = int(self.query_param("history", "0"))
+        except ValueError:
+            json_response(self, {"error": "ids must be comma-separated integers"}, HTTPStatus.BAD_REQUEST)
+            return
+        ids = list(dict.fromkeys(ids))
+        if not ids or len(ids) > MAX_BATCH_IDS:
+            json_response(self, {"error": f"ids must list 1-{MAX_BATCH_IDS} players"}, HTTPStatus.BAD_REQUEST)
+            return
+        history_limit = max(0, min(history_limit, MAX_BATCH_HISTORY))
+
+        selection = hashlib.sha256(",".join(map(str, ids)).encode("ascii")).hexdigest()[:16]
+        etag = f'"players-{ETAG_EPOCH}-{read_version()}-{history_limit}-{selection}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
+            return
+
+        rows = {row["id"]: row for row in get_players(ids)}
+        history = get_recent_history(rows, history_limit) if history_limit else {}
+        players = []
+        for player_id in ids:
+            row = rows.get(player_id)
+            if row is None:
+                continue
+            entry = player_payload(row)
+            if history_limit:
+                entry["history"] = history_payload(history[player_id])
+            players.append(entry)
+        missing = [player_id for player_id in ids if player_id not in rows]
+        json_response(self, {"players": players, "missing": missing}, etag=etag)
+
+    def handle_player_detail(self, player_id: int) -> None:
+        limit = self.page_limit("history_limit", DEFAULT_HISTORY_PAGE_SIZE)
+        if limit is None:
+            return
+        try:
+            k = int(self.query_param("neighbours", str(DEFAULT_NEIGHBOURS)))
+        except ValueError:
+            json_response(self, {"error": "neighbours must be an integer"}, HTTPStatus.BAD_REQUEST)
+            return
+        k = max(0, min(k, MAX_NEIGHBOURS))
+
+        etag = f'"player-{player_id}-{ETAG_EPOCH}-{read_version()}-{limit}-{k}"'
+        if etag_matches(self, etag):
+            send_not_modified(self, etag, API_CACHE_CONTROL)
             return
 
         player = get_player(player_id)
@@ -192,28 +932,67 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
             json_response(self, {"error": "Player not found"}, HTTPStatus.NOT_FOUND)
             return
 
-        history = get_player_history(player_id)
+        history, next_cursor = build_history_page(player_id, limit)
         payload = {
-            "player": {
-                "id": player["id"],
-                "nickname": player["nickname"],
-                "total_points": player["total_points"],
-                "slogan": player["slogan"],
-                "avatar_url": player["avatar_url"],
-                "created_at": player["created_at"],
-                "updated_at": player["updated_at"],
-                "finals_played": player["finals_played"],
-            },
-            "history": [
-                {
-                    "delta": row["delta"],
-                    "reason": row["reason"],
-                    "created_at": row["created_at"],
-                }
-                for row in history
-            ],
+            "player": player_payload(player),
+            "neighbours": RANK_INDEX.neighbours(player_id, k),
+            "history": history,
+            "history_next_cursor": next_cursor,
         }
-        json_response(self, payload)
+        json_response(self, payload, etag=etag)
+
+    def handle_player_history(self, player_id: int) -> None:
+        limit = self.page_limit("limit", DEFAULT_HISTORY_PAGE_SIZE)
+        if limit is None:
+            return
+        ok, before = self.page_cursor("cursor", str, int)
+        if not ok:
+            return
+
+        if get_player(player_id) is None:
+            json_response(self, {"error": "Player not found"}, HTTPStatus.NOT_FOUND)
+            return
+
+        history, next_cursor = build_history_page(player_id, limit, before)
+        json_response(self, {"history": history, "next_cursor": next_cursor})
+
+    def send_export(self, prefix: dict[str, object], key: str, items: Iterable[dict[str, object]]) -> None:
+        """Stream ``items`` as one JSON document, or as NDJSON with ``?format=ndjson``."""
+        fmt = self.query_param("format", "json")
+        if fmt == "ndjson":
+            stream_response(self, encode_ndjson_stream(items), "application/x-ndjson; charset=utf-8")
+        elif fmt == "json":
+            stream_response(self, encode_json_stream(prefix, key, items), "application/json; charset=utf-8")
+        else:
+            json_response(self, {"error": "format must be json or ndjson"}, HTTPStatus.BAD_REQUEST)
+
+    def handle_export_leaderboard(self) -> None:
+        players = (
+            {
+                "id": row["id"],
+                "nickname": row["nickname"],
+                "total_points": row["total_points"],
+                "slogan": row["slogan"],
+                "avatar_url": row["avatar_url"],
+                "finals_played": row["finals_played"],
+            }
+            for row in iter_leaderboard()
+        )
+        self.send_export({}, "players", players)
+
+    def handle_export_history(self, player_id: int) -> None:
+        if get_player(player_id) is None:
+            json_response(self, {"error": "Player not found"}, HTTPStatus.NOT_FOUND)
+            return
+        history = (
+            {
+                "delta": row["delta"],
+                "reason": row["reason"],
+                "created_at": row["created_at"],
+            }
+            for row in iter_player_history(player_id)
+        )
+        self.send_export({"player_id": player_id}, "history", history)
 
     def handle_create_player(self) -> None:
         payload = read_request_json(self)
@@ -233,17 +1012,7 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
 
         json_response(self, {"player_id": player_id}, HTTPStatus.CREATED)
 
-    def handle_record_score(self) -> None:
-        parts = self.path.strip("/").split("/")
-        if len(parts) < 3:
-            self.send_error(HTTPStatus.NOT_FOUND)
-            return
-        try:
-            player_id = int(parts[1])
-        except ValueError:
-            json_response(self, {"error": "Invalid player id"}, HTTPStatus.BAD_REQUEST)
-            return
-
+    def handle_record_score(self, player_id: int) -> None:
         payload = read_request_json(self)
         try:
             delta = int(payload.get("delta"))
@@ -251,9 +1020,23 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
             json_response(self, {"error": "delta must be an integer"}, HTTPStatus.BAD_REQUEST)
             return
         reason = (payload.get("reason") or "").strip()
+        # score_history's foreign key would reject the write; answer before taking the write lock
+        if get_player(player_id) is None:
+            json_response(self, {"error": "Player not found"}, HTTPStatus.NOT_FOUND)
+            return
 
-        record_score_change(player_id=player_id, delta=delta, reason=reason)
-        json_response(self, {"status": "ok"}, HTTPStatus.CREATED)
+        ok, key = self.idempotency_key()
+        if not ok:
+            return
+        if key is None:
+            record_score_change(player_id=player_id, delta=delta, reason=reason)
+            json_response(self, {"status": "ok"}, HTTPStatus.CREATED)
+            return
+        outcome = self.run_idempotent(
+            lambda fingerprint: record_score_change_once(key, fingerprint, player_id, delta, reason), payload
+        )
+        if outcome is not None:
+            json_response(self, {"status": "ok"}, HTTPStatus.CREATED, headers=replay_headers(outcome))
 
     def handle_submit_game(self) -> None:
         payload = read_request_json(self)
@@ -264,22 +1047,52 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
 
         label = (payload.get("label") or "").strip() or "Game result"
 
-        summary = record_game_results(placements, game_label=label)
+        ok, key = self.idempotency_key()
+        if not ok:
+            return
+        headers = None
+        if key is None:
+            summary = record_game_results(placements, game_label=label)
+        else:
+            outcome = self.run_idempotent(
+                lambda fingerprint: record_game_results_once(key, fingerprint, placements, game_label=label),
+                payload,
+            )
+            if outcome is None:
+                return
+            summary, headers = outcome.result, replay_headers(outcome)
         status = HTTPStatus.CREATED if summary["applied"] else HTTPStatus.BAD_REQUEST
-        json_response(self, summary, status=status)
+        json_response(self, summary, status=status, headers=headers)
 
-    def handle_update_profile(self) -> None:
-        parts = self.path.strip("/").split("/")
-        if len(parts) < 3:
-            self.send_error(HTTPStatus.NOT_FOUND)
-            return
+    def idempotency_key(self) -> tuple[bool, Optional[str]]:
+        """Return ``(ok, key)`` from the Idempotency-Key header; ``ok`` is False after a 400."""
+        key = self.headers.get("Idempotency-Key")
+        if key is None:
+            return True, None
+        key = key.strip()
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH or not key.isprintable():
+            json_response(
+                self,
+                {"error": f"Idempotency-Key must be 1-{MAX_IDEMPOTENCY_KEY_LENGTH} printable characters"},
+                HTTPStatus.BAD_REQUEST,
+            )
+            return False, None
+        return True, key
 
+    def run_idempotent(
+        self, write: Callable[[str], IdempotentOutcome], payload: dict
+    ) -> Optional[IdempotentOutcome]:
+        """Call ``write(fingerprint)``; None once a 422 for a reused key has been sent."""
+        path = urllib.parse.urlsplit(self.path).path
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        fingerprint = hashlib.sha256(f"{self.command} {path}\n{canonical}".encode("utf-8")).hexdigest()
         try:
-            player_id = int(parts[1])
-        except ValueError:
-            json_response(self, {"error": "Invalid player id"}, HTTPStatus.BAD_REQUEST)
-            return
+            return write(fingerprint)
+        except IdempotencyConflict as exc:
+            json_response(self, {"error": str(exc)}, HTTPStatus.UNPROCESSABLE_ENTITY)
+            return None
 
+    def handle_update_profile(self, player_id: int) -> None:
         payload = read_request_json(self)
         updates: dict[str, Optional[str]] = {}
 
@@ -311,15 +1124,95 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
         return
 
 
-def run_server(port: int = 8000) -> None:
+_QUERY_OBSERVERS: list[Callable[[str, float, int], None]] = []
+
+
+def start_services(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    storage: str = "rollback",
+    dev: bool = False,
+    metrics: bool = METRICS_ENABLED,
+    slow_query_ms: float = SLOW_QUERY_MS,
+    seed: bool = True,
+    reads: str = READ_ROUTE,
+    max_staleness: float = READ_MAX_STALENESS,
+) -> None:
+    """Open the database and start the background services the handlers use."""
+    global METRICS_ENABLED
+    METRICS_ENABLED = metrics
+    if metrics:
+        _QUERY_OBSERVERS.append(observe_query)
+    if slow_query_ms > 0:
+        _QUERY_OBSERVERS.append(SlowQueryLog(slow_query_ms / 1000))
+    for observer in _QUERY_OBSERVERS:
+        add_query_observer(observer)
+    configure_pool(size=pool_size)
     initialize_database()
-    seed_sample_data()
-    server = ThreadingHTTPServer(("0.0.0.0", port), LeaderboardHandler)
-    print(f"Serving leaderboard on http://localhost:{port}")
+    if seed:
+        seed_sample_data()
+    configure_storage(storage)
+    configure_reads(reads, size=pool_size, refresh_interval=READ_REFRESH_INTERVAL, max_staleness=max_staleness)
+    watch_external_writes()
+    ASSETS.dev = dev
+    ASSETS.start()
+    LIVE_HUB.start()
+    RANK_INDEX.start()
+    SEASON_STATS.start()
+    IDEMPOTENCY_JANITOR.start()
+    for task in MAINTENANCE_TASKS:
+        task.start()
+
+
+def stop_services() -> None:
+    for task in MAINTENANCE_TASKS:
+        task.stop()
+    IDEMPOTENCY_JANITOR.stop()
+    ASSETS.stop()
+    LIVE_HUB.stop()
+    RANK_INDEX.stop()
+    SEASON_STATS.stop()
+    stop_external_watch()
+    close_reads()
+    stop_writer()
+    close_pool()
+    for observer in _QUERY_OBSERVERS:
+        remove_query_observer(observer)
+    _QUERY_OBSERVERS.clear()
+
+
+def run_server(
+    port: int = 8000,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    storage: str = "rollback",
+    dev: bool = False,
+    engine: str = "threading",
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    workers: int = DEFAULT_WORKERS,
+    metrics: bool = METRICS_ENABLED,
+    slow_query_ms: float = SLOW_QUERY_MS,
+    reads: str = READ_ROUTE,
+    max_staleness: float = READ_MAX_STALENESS,
+) -> None:
+    start_services(pool_size, storage, dev, metrics, slow_query_ms, reads=reads, max_staleness=max_staleness)
+    print(f"Serving leaderboard on http://localhost:{port} ({engine} engine)")
+    server: Optional[ThreadingHTTPServer] = None
     try:
-        server.serve_forever()
+        if engine == "asyncio":
+            serve_async(
+                ("0.0.0.0", port),
+                LeaderboardHandler,
+                max_connections=max_connections,
+                workers=workers,
+            )
+        else:
+            server = ThreadingHTTPServer(("0.0.0.0", port), LeaderboardHandler)
+            server.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped")
+    finally:
+        if server is not None:
+            server.server_close()
+        stop_services()
 
 
 if __name__ == "__main__":
@@ -327,5 +1220,70 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Run the local leaderboard server")
     parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--pool-size", type=int, default=DEFAULT_POOL_SIZE, help="Maximum pooled SQLite connections"
+    )
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_MODES,
+        default="rollback",
+        help="'wal' enables write-ahead logging with a single group-committing writer thread",
+    )
+    parser.add_argument("--dev", action="store_true", help="Reload edited frontend files without a restart")
+    parser.add_argument(
+        "--engine",
+        choices=("threading", "asyncio"),
+        default="threading",
+        help="'asyncio' serves keep-alive connections from one event loop with a bounded worker pool",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help="Open connections allowed by the asyncio engine before answering 503",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="Handler threads used by the asyncio engine"
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=MAX_CONCURRENT_REQUESTS,
+        help="Requests handled at once before answering 503 (streams excluded)",
+    )
+    parser.add_argument(
+        "--metrics", action="store_true", default=METRICS_ENABLED, help="Serve /metrics and time every request"
+    )
+    parser.add_argument(
+        "--slow-query-ms",
+        type=float,
+        default=SLOW_QUERY_MS,
+        help="Log db.py calls slower than this many milliseconds to stderr (0 disables)",
+    )
+    parser.add_argument(
+        "--reads",
+        choices=READ_ROUTES,
+        default=READ_ROUTE,
+        help="'readonly' gives reads their own mode=ro pool; 'snapshot' serves GETs from a refreshed copy",
+    )
+    parser.add_argument(
+        "--max-staleness",
+        type=float,
+        default=READ_MAX_STALENESS,
+        help="Seconds a snapshot copy may lag before GETs fall back to the live database",
+    )
     args = parser.parse_args()
-    run_server(port=args.port)
+    ADMISSION.max_concurrent = args.max_concurrent
+    run_server(
+        port=args.port,
+        pool_size=args.pool_size,
+        storage=args.storage,
+        dev=args.dev,
+        engine=args.engine,
+        max_connections=args.max_connections,
+        workers=args.workers,
+        metrics=args.metrics,
+        slow_query_ms=args.slow_query_ms,
+        reads=args.reads,
+        max_staleness=args.max_staleness,
+    )
@@ -0,0 +1,152 @@
+"""Preloaded, pre-compressed frontend assets served straight from memory."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:  # optional; only used when installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+# formats that are already compressed gain nothing from gzip/brotli
+INCOMPRESSIBLE_PREFIXES = ("image/png", "image/jpeg", "image/gif", "image/webp", "font/woff")
+MIN_COMPRESS_BYTES = 256
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    path: Path
+    mime: str
+    body: bytes
+    etag: str
+    mtime_ns: int
+    encodings: dict[str, tuple[bytes, str]]
+
+    def negotiate(self, accept_encoding: str) -> tuple[bytes, str, Optional[str]]:
+        """Return ``(body, etag, content_encoding)`` for an Accept-Encoding header."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and accepted.get(encoding, 0.0) > 0:
+                body, etag = self.encodings[encoding]
+                return body, etag, encoding
+        return self.body, self.etag, None
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def load_asset(path: Path) -> StaticAsset:
+    body = path.read_bytes()
+    mime, _ = mimetypes.guess_type(str(path))
+    mime = mime or "application/octet-stream"
+    digest = hashlib.sha256(body).hexdigest()[:32]
+
+    encodings: dict[str, tuple[bytes, str]] = {}
+    if len(body) >= MIN_COMPRESS_BYTES and not mime.startswith(INCOMPRESSIBLE_PREFIXES):
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gzipped) < len(body):
+            encodings["gzip"] = (gzipped, f'"{digest}-gzip"')
+        if brotli is not None:
+            compressed = brotli.compress(body)
+            if len(compressed) < len(body):
+                encodings["br"] = (compressed, f'"{digest}-br"')
+
+    return StaticAsset(
+        path=path,
+        mime=mime,
+        body=body,
+        etag=f'"{digest}"',
+        mtime_ns=path.stat().st_mtime_ns,
+        encodings=encodings,
+    )
+
+
+class AssetStore:
+    """In-memory copy of a static directory keyed by URL-relative path.
+
+    Lookups are plain dictionary reads, so serving a file costs no filesystem
+    calls. Paths outside the loaded set (including any ``..`` traversal) are
+    simply not found. In dev mode a background thread polls file mtimes and
+    swaps in fresh copies of edited, added or removed files.
+    """
+
+    def __init__(self, root: Path, *, dev: bool = False, poll_interval: float = 1.0) -> None:
+        self.root = root
+        self.dev = dev
+        self.poll_interval = poll_interval
+        self._assets: dict[str, StaticAsset] = {}
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def load(self) -> None:
+        assets: dict[str, StaticAsset] = {}
+        if self.root.is_dir():
+            for path in sorted(self.root.rglob("*")):
+                if path.is_file():
+                    assets[path.relative_to(self.root).as_posix()] = load_asset(path)
+        self._assets = assets
+
+    def get(self, relative: str) -> Optional[StaticAsset]:
+        return self._assets.get(relative)
+
+    def start(self) -> None:
+        self.load()
+        if self.dev and self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="asset-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def refresh(self) -> bool:
+        """Reload files whose mtime changed; return True if anything changed."""
+        current: dict[str, Path] = {}
+        if self.root.is_dir():
+            current = {
+                path.relative_to(self.root).as_posix(): path for path in self.root.rglob("*") if path.is_file()
+            }
+        assets = dict(self._assets)
+        changed = False
+        for relative in set(assets) - set(current):
+            del assets[relative]
+            changed = True
+        for relative, path in current.items():
+            existing = assets.get(relative)
+            try:
+                if existing is None or existing.mtime_ns != path.stat().st_mtime_ns:
+                    assets[relative] = load_asset(path)
+                    changed = True
+            except FileNotFoundError:
+                assets.pop(relative, None)
+                changed = True
+        if changed:
+            self._assets = assets
+        return changed
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
@@ -0,0 +1,229 @@
+"""Asyncio HTTP/1.1 engine that drives the existing request handler class.
+
+The event loop owns sockets, request framing, keep-alive and connection
+limits. Each complete request is replayed into a ``BaseHTTPRequestHandler``
+subclass running on a bounded thread pool, so routing, auth and the blocking
+``db.py`` calls are shared verbatim with the ``ThreadingHTTPServer`` engine.
+
+Long-lived responses must not hold a worker. A handler running on this
+server (``server.async_streams`` is true) may send its headers and then set
+``handler.async_stream`` to a callable returning an async iterator of body
+chunks. The event loop writes those chunks after the handler returns and
+closes the connection when the iterator ends.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from typing import AsyncGenerator, Optional
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_CONNECTIONS = 512
+DEFAULT_WORKERS = 16
+KEEP_ALIVE_TIMEOUT = 15.0
+
+
+class _StreamWriterFile(io.RawIOBase):
+    """File-like ``wfile`` that forwards handler output to the event loop.
+
+    Writes block the worker thread until the transport has drained, which
+    gives streaming handlers natural backpressure.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__()
+        self._writer = writer
+        self._loop = loop
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if not data:
+            return 0
+        payload = bytes(data)
+        asyncio.run_coroutine_threadsafe(self._send(payload), self._loop).result()
+        return len(payload)
+
+    async def _send(self, data: bytes) -> None:
+        self._writer.write(data)
+        await self._writer.drain()
+
+
+class AsyncHTTPServer:
+    """Keep-alive capable HTTP server that enforces a connection ceiling."""
+
+    async_streams = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        workers: int = DEFAULT_WORKERS,
+        keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT,
+    ) -> None:
+        self.server_address = address
+        self.handler_class = handler_class
+        self.max_connections = max_connections
+        self.keep_alive_timeout = keep_alive_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self.active_connections = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        host, port = self.server_address
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        self.server_address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        self.executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.active_connections >= self.max_connections:
+            writer.write(
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"Retry-After: 1\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+            )
+            await self._close(writer)
+            return
+
+        self.active_connections += 1
+        try:
+            loop = asyncio.get_running_loop()
+            wfile = _StreamWriterFile(writer, loop)
+            peer = writer.get_extra_info("peername") or ("", 0)
+            while True:
+                raw = await self._read_request(reader, writer)
+                if raw is None:
+                    break
+                handler = self._build_handler(raw, wfile, peer[:2])
+                await loop.run_in_executor(self.executor, handler.handle_one_request)
+                if handler.async_stream is not None:
+                    await self._pump(handler.async_stream(), reader, writer)
+                    break
+                if handler.close_connection:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception:
+            # mirror socketserver.BaseServer.handle_error: report and drop the connection
+            print(f"Exception while handling request from {peer}", file=sys.stderr)
+            traceback.print_exc()
+        finally:
+            self.active_connections -= 1
+            await self._close(writer)
+
+    async def _read_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[bytes]:
+        """Return one complete request (head plus body), or None to hang up."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return None
+        except asyncio.LimitOverrunError:
+            await self._reject(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            return None
+
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                try:
+                    length = int(value.strip())
+                except ValueError:
+                    await self._reject(writer, HTTPStatus.BAD_REQUEST)
+                    return None
+            elif name == b"transfer-encoding":
+                await self._reject(writer, HTTPStatus.LENGTH_REQUIRED)
+                return None
+
+        if length < 0 or length > MAX_BODY_BYTES:
+            await self._reject(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return None
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), self.keep_alive_timeout) if length else b""
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return None
+        return head + body
+
+    @staticmethod
+    async def _pump(
+        chunks: AsyncGenerator[bytes, None], reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Write ``chunks`` until they run out or the client hangs up."""
+
+        async def send() -> None:
+            async for chunk in chunks:
+                writer.write(chunk)
+                await writer.drain()
+
+        async def hangup() -> None:
+            # anything the client sends on a stream is discarded; EOF ends it
+            while await reader.read(4096):
+                pass
+
+        sender = asyncio.ensure_future(send())
+        watcher = asyncio.ensure_future(hangup())
+        try:
+            await asyncio.wait((sender, watcher), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (sender, watcher):
+                task.cancel()
+            await asyncio.gather(sender, watcher, return_exceptions=True)
+            await chunks.aclose()
+
+    def _build_handler(self, raw: bytes, wfile: io.RawIOBase, client_address: tuple) -> BaseHTTPRequestHandler:
+        # skip BaseRequestHandler.__init__, which would try to own a socket
+        handler = self.handler_class.__new__(self.handler_class)
+        handler.protocol_version = "HTTP/1.1"
+        handler.server = self
+        handler.request = None
+        handler.client_address = client_address
+        handler.rfile = io.BytesIO(raw)
+        handler.wfile = wfile
+        handler.close_connection = True
+        handler.async_stream = None
+        return handler
+
+    @staticmethod
+    async def _reject(writer: asyncio.StreamWriter, status: HTTPStatus) -> None:
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+        writer.write(head.encode("ascii"))
+        await writer.drain()
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def serve_async(
+    address: tuple[str, int],
+    handler_class: type[BaseHTTPRequestHandler],
+    **options: object,
+) -> None:
+    """Run the asyncio engine until interrupted."""
+    server = AsyncHTTPServer(address, handler_class, **options)
+    try:
+        asyncio.run(server.serve_forever())
+    finally:
+        server.close()
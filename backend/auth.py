@@ -0,0 +1,196 @@
+"""Admin authentication: password hashing, verified-header caching and
+throttling of failed logins.
+
+Stored passwords may be plain text (legacy ``admin_password``) or a hash
+produced by ``python auth.py hash``::
+
+    pbkdf2_sha256$<iterations>$<salt>$<digest>
+    scrypt$<n>$<r>$<p>$<salt>$<digest>
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from ratelimit import BucketTable
+
+PBKDF2_ITERATIONS = 600_000
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+HASH_SCHEMES = ("pbkdf2_sha256", "scrypt")
+SALT_BYTES = 16
+
+# verified Authorization headers are trusted for this long without re-running the KDF
+AUTH_CACHE_TTL = 300.0
+AUTH_CACHE_SIZE = 256
+# failed logins per client: a burst of 5, then one more every 12 seconds
+FAILED_LOGIN_BURST = 5
+FAILED_LOGIN_RATE = 1 / 12
+MAX_TRACKED_CLIENTS = 4096
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"), validate=True)
+
+
+def hash_password(password: str, scheme: str = "pbkdf2_sha256", *, salt: Optional[bytes] = None) -> str:
+    """Return a self-describing hash of ``password`` for ``config.json``."""
+    salt = salt or os.urandom(SALT_BYTES)
+    secret = password.encode("utf-8")
+    if scheme == "pbkdf2_sha256":
+        digest = hashlib.pbkdf2_hmac("sha256", secret, salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64encode(salt)}${_b64encode(digest)}"
+    if scheme == "scrypt":
+        digest = hashlib.scrypt(secret, salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+    raise ValueError(f"Unknown password scheme {scheme!r}; expected one of {', '.join(HASH_SCHEMES)}")
+
+
+def is_password_hash(value: str) -> bool:
+    return value.split("$", 1)[0] in HASH_SCHEMES and value.count("$") >= 3
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check ``password`` against a hash from ``hash_password`` or a plain-text value."""
+    secret = password.encode("utf-8")
+    if not is_password_hash(stored):
+        return hmac.compare_digest(secret, stored.encode("utf-8"))
+
+    scheme, *fields = stored.split("$")
+    try:
+        if scheme == "pbkdf2_sha256":
+            iterations, salt, expected = int(fields[0]), _b64decode(fields[1]), _b64decode(fields[2])
+            digest = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations, dklen=len(expected))
+        else:
+            n, r, p = int(fields[0]), int(fields[1]), int(fields[2])
+            salt, expected = _b64decode(fields[3]), _b64decode(fields[4])
+            digest = hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, dklen=len(expected))
+    except (IndexError, ValueError) as exc:
+        raise ValueError(f"Malformed {scheme} password hash") from exc
+    return hmac.compare_digest(digest, expected)
+
+
+class AuthDecision(NamedTuple):
+    allowed: bool
+    # seconds the client must wait before trying again; 0 means "just challenge"
+    retry_after: float = 0.0
+
+
+class BasicAuthenticator:
+    """Checks HTTP Basic credentials against one configured admin account.
+
+    A successful header is remembered (as a SHA-256 digest, never the
+    header itself) in a small TTL-bounded LRU, so repeat requests from a
+    logged-in browser skip the base64 decode and password KDF. Each failed
+    attempt spends a token from the client's bucket; once it is empty the
+    client is refused before any password work happens.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        cache_ttl: float = AUTH_CACHE_TTL,
+        cache_size: int = AUTH_CACHE_SIZE,
+        failure_burst: float = FAILED_LOGIN_BURST,
+        failure_rate: float = FAILED_LOGIN_RATE,
+        max_clients: int = MAX_TRACKED_CLIENTS,
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.failures = BucketTable(failure_burst, failure_rate, max_clients)
+        self._verified: OrderedDict[bytes, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.password)
+
+    def check(self, header: str, client: str) -> AuthDecision:
+        if not self.enabled:
+            return AuthDecision(True)
+        if not header:
+            # browsers always probe without credentials first; that is not a failure
+            return AuthDecision(False)
+
+        key = hashlib.sha256(header.encode("utf-8", "surrogateescape")).digest()
+        if self._cached(key):
+            return AuthDecision(True)
+
+        wait = self.failures.peek(client)
+        if wait:
+            return AuthDecision(False, wait)
+
+        if self._verify(header):
+            self._remember(key)
+            return AuthDecision(True)
+        self.failures.take(client)
+        return AuthDecision(False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._verified.clear()
+
+    def _verify(self, header: str) -> bool:
+        scheme, _, token = header.partition(" ")
+        if scheme != "Basic":
+            return False
+        try:
+            decoded = base64.b64decode(token, validate=True).decode("utf-8")
+        except ValueError:
+            return False
+        username, _, password = decoded.partition(":")
+        # run the password check even for a wrong username so timing does not tell them apart
+        username_ok = hmac.compare_digest(username.encode("utf-8"), self.username.encode("utf-8"))
+        password_ok = verify_password(password, self.password)
+        return username_ok and password_ok
+
+    def _cached(self, key: bytes) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires = self._verified.get(key)
+            if expires is None:
+                return False
+            if expires <= now:
+                del self._verified[key]
+                return False
+            self._verified.move_to_end(key)
+            return True
+
+    def _remember(self, key: bytes) -> None:
+        with self._lock:
+            self._verified[key] = time.monotonic() + self.cache_ttl
+            self._verified.move_to_end(key)
+            while len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+
+
+if __name__ == "__main__":
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Admin credential utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    hash_parser = subparsers.add_parser("hash", help="Print a password hash for config.json's admin_password_hash")
+    hash_parser.add_argument("--scheme", choices=HASH_SCHEMES, default="pbkdf2_sha256")
+    args = parser.parse_args()
+
+    if args.command == "hash":
+        password = getpass.getpass("Admin password: ")
+        if password != getpass.getpass("Repeat password: "):
+            parser.exit(1, "Passwords do not match\n")
+        print(hash_password(password, args.scheme))
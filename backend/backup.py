@@ -0,0 +1,271 @@
+"""Online snapshots, compaction and planner maintenance for the club database.
+
+Snapshots use SQLite's online backup API. It copies ``BACKUP_PAGES`` pages
+per step and sleeps briefly between steps, so the server keeps answering
+and writing throughout. In WAL mode the copy reads from one pinned read
+transaction. Writers carry on undisturbed and the snapshot shows the
+database as of the moment it started. In rollback mode a commit by another
+connection makes SQLite restart the copy. After ``MAX_BACKUP_RESTARTS``
+restarts the remainder is copied in a single step, which holds off writers
+only for that step.
+
+Snapshots are named ``club-<tag>-<YYYYmmdd-HHMMSS>.db``. They are written
+to a ``.partial`` file, checked, and then renamed into place, so a crash
+never leaves a half-written snapshot that looks complete.
+
+Usage::
+
+    python backup.py snapshot [--dir backups] [--keep 14]
+    python backup.py compact [--dir backups] [--keep 7]
+    python backup.py optimize
+    python backup.py list [--dir backups]
+    python backup.py restore backups/club-snapshot-20261017-030000.db
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from db import DB_PATH, connect
+
+BACKUP_DIR = Path(__file__).resolve().parent / "backups"
+# pages copied per backup step and the pause between steps
+BACKUP_PAGES = 256
+BACKUP_STEP_PAUSE = 0.005
+# a busy rollback-journal database is copied in one step after this many restarts
+MAX_BACKUP_RESTARTS = 3
+SNAPSHOT_KEEP = 14
+COMPACT_KEEP = 7
+# rows sampled per index by ANALYZE, so a scheduled run stays cheap on a big table
+ANALYSIS_LIMIT = 1000
+
+
+def snapshot_name(tag: str, when: Optional[float] = None) -> str:
+    return f"club-{tag}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(when))}.db"
+
+
+def list_snapshots(directory: Optional[Path] = None, tag: str = "*") -> list[Path]:
+    """Snapshots in ``directory``, oldest first."""
+    directory = directory or BACKUP_DIR
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"club-{tag}-*.db"), key=lambda path: (path.stat().st_mtime_ns, path.name))
+
+
+def rotate_snapshots(
+    directory: Optional[Path] = None, tag: str = "snapshot", keep: int = SNAPSHOT_KEEP
+) -> list[Path]:
+    """Delete all but the newest ``keep`` snapshots with ``tag``; returns the removed paths."""
+    snapshots = list_snapshots(directory, tag)
+    expired = snapshots[: max(len(snapshots) - keep, 0)]
+    for path in expired:
+        path.unlink(missing_ok=True)
+    return expired
+
+
+def _target(directory: Path, tag: str) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    name = snapshot_name(tag)
+    target = directory / name
+    suffix = 1
+    while target.exists():
+        # two snapshots within the same second
+        target = directory / name.replace(".db", f"-{suffix}.db")
+        suffix += 1
+    return target
+
+
+def _check(conn: sqlite3.Connection) -> None:
+    result = conn.execute("PRAGMA quick_check;").fetchone()[0]
+    if result != "ok":
+        raise sqlite3.DatabaseError(f"Snapshot failed its integrity check: {result}")
+
+
+class _CopyRestarted(Exception):
+    pass
+
+
+def _copy(source: sqlite3.Connection, dest: sqlite3.Connection, pages: int, pause: float) -> None:
+    restarts = 0
+    last_remaining: Optional[int] = None
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > MAX_BACKUP_RESTARTS:
+                raise _CopyRestarted
+        last_remaining = remaining
+        # yield between steps so writers are not kept waiting behind the copy
+        if remaining and pause:
+            time.sleep(pause)
+
+    source.isolation_level = None
+    if source.execute("PRAGMA journal_mode;").fetchone()[0] == "wal":
+        source.execute("BEGIN;")
+        try:
+            source.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()
+            source.backup(dest, pages=pages, progress=progress, sleep=pause)
+        finally:
+            source.execute("COMMIT;")
+        return
+    try:
+        source.backup(dest, pages=pages, progress=progress, sleep=pause)
+    except _CopyRestarted:
+        source.backup(dest)
+
+
+def take_snapshot(
+    directory: Optional[Path] = None,
+    *,
+    tag: str = "snapshot",
+    pages: int = BACKUP_PAGES,
+    pause: float = BACKUP_STEP_PAUSE,
+    db_path: Optional[Path] = None,
+) -> Path:
+    """Copy the live database into a new snapshot file and return its path."""
+    target = _target(directory or BACKUP_DIR, tag)
+    partial = target.with_name(target.name + ".partial")
+    source = connect(db_path)
+    try:
+        dest = sqlite3.connect(partial)
+        try:
+            _copy(source, dest, pages, pause)
+            _check(dest)
+        finally:
+            dest.close()
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    return target
+
+
+def compact_snapshot(directory: Optional[Path] = None, *, db_path: Optional[Path] = None) -> Path:
+    """Write a defragmented copy of the database with ``VACUUM INTO``.
+
+    Unlike the page-by-page backup, ``VACUUM INTO`` reads the database in one
+    transaction. In rollback mode that holds off writers while it runs, so it
+    is scheduled less often than snapshots. It never changes the live file,
+    which keeps serving as before.
+    """
+    target = _target(directory or BACKUP_DIR, "compact")
+    partial = target.with_name(target.name + ".partial")
+    conn = connect(db_path)
+    try:
+        conn.isolation_level = None
+        conn.execute("VACUUM INTO ?;", (str(partial),))
+        check = sqlite3.connect(partial)
+        try:
+            _check(check)
+        finally:
+            check.close()
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.close()
+    return target
+
+
+def optimize(db_path: Optional[Path] = None) -> None:
+    """Refresh the query planner's statistics with ``ANALYZE`` and ``PRAGMA optimize``."""
+    conn = connect(db_path)
+    try:
+        conn.isolation_level = None
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT};")
+        conn.execute("ANALYZE;")
+        conn.execute("PRAGMA optimize;")
+    finally:
+        conn.close()
+
+
+def snapshot_and_rotate(directory: Optional[Path] = None, keep: int = SNAPSHOT_KEEP) -> Path:
+    path = take_snapshot(directory)
+    rotate_snapshots(directory, "snapshot", keep)
+    return path
+
+
+def compact_and_rotate(directory: Optional[Path] = None, keep: int = COMPACT_KEEP) -> Path:
+    path = compact_snapshot(directory)
+    rotate_snapshots(directory, "compact", keep)
+    return path
+
+
+def restore_snapshot(
+    snapshot: Path, *, db_path: Optional[Path] = None, backup_dir: Optional[Path] = None
+) -> Optional[Path]:
+    """Replace the database's contents with ``snapshot``.
+
+    Best run with the server stopped. A running server notices the new
+    contents through its external write watch and reloads within
+    ``EXTERNAL_WRITE_POLL`` seconds. The snapshot is checked before anything
+    is touched. The current database is saved as a ``pre-restore`` snapshot,
+    whose path is returned (None if there was no database). The copy goes
+    through the backup API, not a file copy, so a leftover WAL file cannot
+    be replayed over the restored pages.
+    """
+    db_path = db_path or DB_PATH
+    if not snapshot.is_file():
+        raise FileNotFoundError(f"No snapshot at {snapshot}")
+    source = sqlite3.connect(f"{snapshot.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        _check(source)
+        tables = source.execute("SELECT name FROM sqlite_master WHERE type = 'table';").fetchall()
+        if ("players",) not in tables:
+            raise sqlite3.DatabaseError(f"{snapshot} is not a club database")
+
+        saved = take_snapshot(backup_dir, tag="pre-restore", db_path=db_path) if db_path.exists() else None
+        dest = sqlite3.connect(db_path)
+        try:
+            source.backup(dest)
+            dest.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        finally:
+            dest.close()
+    finally:
+        source.close()
+    return saved
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Back up, compact and restore the club database")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Database file to operate on")
+    parser.add_argument("--dir", type=Path, default=BACKUP_DIR, help="Directory holding snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    snapshot_parser = commands.add_parser("snapshot", help="Take an online snapshot and rotate old ones")
+    snapshot_parser.add_argument("--keep", type=int, default=SNAPSHOT_KEEP, help="Snapshots to keep")
+    compact_parser = commands.add_parser("compact", help="Write a VACUUM INTO copy and rotate old ones")
+    compact_parser.add_argument("--keep", type=int, default=COMPACT_KEEP, help="Compacted copies to keep")
+    commands.add_parser("optimize", help="Run ANALYZE and PRAGMA optimize on the live database")
+    commands.add_parser("list", help="List snapshots, oldest first")
+    restore_parser = commands.add_parser("restore", help="Replace the database with a snapshot (server stopped)")
+    restore_parser.add_argument("snapshot", type=Path, help="Snapshot file to restore")
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        path = take_snapshot(args.dir, db_path=args.db)
+        removed = rotate_snapshots(args.dir, "snapshot", args.keep)
+        print(f"Wrote {path} ({path.stat().st_size} bytes); removed {len(removed)} old snapshot(s)")
+    elif args.command == "compact":
+        path = compact_snapshot(args.dir, db_path=args.db)
+        removed = rotate_snapshots(args.dir, "compact", args.keep)
+        print(f"Wrote {path} ({path.stat().st_size} bytes); removed {len(removed)} old copy(ies)")
+    elif args.command == "optimize":
+        optimize(args.db)
+        print("Planner statistics refreshed")
+    elif args.command == "list":
+        for path in list_snapshots(args.dir):
+            print(f"{path}\t{path.stat().st_size}")
+    elif args.command == "restore":
+        saved = restore_snapshot(args.snapshot, db_path=args.db, backup_dir=args.dir)
+        if saved is not None:
+            print(f"Previous database saved to {saved}")
+        print(f"Restored {args.db} from {args.snapshot}")
@@ -0,0 +1,497 @@
+"""Load-testing harness: seeds a synthetic club database and replays mixed
+HTTP workloads against an in-process server.
+
+Example::
+
+    python bench.py --players 5000 --history 40 --concurrency 16 --duration 20 \\
+        --mix leaderboard=70,player=20,score=8,game=2 --output results/main.json
+    python bench.py ... --baseline results/main.json
+
+Every run writes a JSON report (environment, arguments, per-operation
+latency percentiles and throughput) so baselines from different commits can
+be compared with ``--baseline``.
+"""
+from __future__ import annotations
+
+import base64
+import http.client
+import json
+import math
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+
+import app
+import db
+from async_server import AsyncHTTPServer
+
+OPERATIONS = ("leaderboard", "player", "score", "game")
+WORKLOADS = {
+    "read-heavy": {"leaderboard": 70, "player": 28, "score": 2, "game": 0},
+    "mixed": {"leaderboard": 50, "player": 30, "score": 15, "game": 5},
+    "write-heavy": {"leaderboard": 20, "player": 20, "score": 45, "game": 15},
+}
+DEFAULT_RESULTS_DIR = app.ROOT_DIR / "bench-results"
+GAME_SIZE = 9
+SEED_BATCH_SIZE = 5000
+
+
+# --- synthetic data ----------------------------------------------------
+def nickname_for(index: int) -> str:
+    return f"bench{index:06d}"
+
+
+def seed_database(path: Path, players: int, history_per_player: int, seed: int = 0) -> None:
+    """Create ``path`` with ``players`` players and about ``history_per_player`` rows each.
+
+    History is written as whole games, the way ``record_game_results`` writes
+    them (one timestamp per game, ``"... – Rank N"`` reasons, games spread over
+    the past year), and the games tables are then rebuilt from it so game
+    listings and period and finals aggregates all have realistic shapes.
+    """
+    rng = random.Random(seed)
+    db.DB_PATH = path
+    db.configure_pool(size=1)
+    db.initialize_database()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    entrants = min(GAME_SIZE, players)
+    games = players * history_per_player // entrants if entrants else 0
+    with db.pooled_connection() as conn:
+        conn.executemany(
+            "INSERT INTO players (nickname, notes) VALUES (?, ?);",
+            ((nickname_for(index), "") for index in range(1, players + 1)),
+        )
+        rows: list[tuple[int, int, str, str]] = []
+        for _ in range(games):
+            created = (now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))).strftime("%Y-%m-%d %H:%M:%S")
+            for rank, player_id in enumerate(rng.sample(range(1, players + 1), entrants), start=1):
+                rows.append((player_id, db.DEFAULT_RANK_POINTS[rank], f"Game result – Rank {rank}", created))
+            if len(rows) >= SEED_BATCH_SIZE:
+                _insert_history(conn, rows)
+                rows.clear()
+        _insert_history(conn, rows)
+        conn.execute(
+            """
+            UPDATE players SET total_points = COALESCE(
+                (SELECT SUM(delta) FROM score_history WHERE score_history.player_id = players.id), 0
+            );
+            """
+        )
+        conn.commit()
+    db.backfill_finals_played()
+    db.rebuild_period_totals()
+    db.backfill_games()
+    db.close_pool()
+
+
+def _insert_history(conn: sqlite3.Connection, rows: list[tuple[int, int, str, str]]) -> None:
+    conn.executemany(
+        "INSERT INTO score_history (player_id, delta, reason, created_at) VALUES (?, ?, ?, ?);",
+        rows,
+    )
+
+
+def count_players(path: Path) -> int:
+    conn = db.connect(path)
+    try:
+        if not db._table_exists(conn, "players"):
+            return 0
+        return conn.execute("SELECT COUNT(*) FROM players;").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# --- in-process server ---------------------------------------------------
+class BenchServer:
+    """Runs ``LeaderboardHandler`` on an ephemeral port with either engine."""
+
+    def __init__(self, engine: str, workers: int, max_connections: int) -> None:
+        self.engine = engine
+        self.workers = workers
+        self.max_connections = max_connections
+        self.port = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Callable[[], None] = lambda: None
+
+    def start(self) -> None:
+        if self.engine == "asyncio":
+            self._start_asyncio()
+        else:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), app.LeaderboardHandler)
+            server.daemon_threads = True
+            self.port = server.server_address[1]
+            self._thread = threading.Thread(target=server.serve_forever, name="bench-server", daemon=True)
+            self._thread.start()
+
+            def stop() -> None:
+                server.shutdown()
+                server.server_close()
+
+            self._stop = stop
+
+    def _start_asyncio(self) -> None:
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        server = AsyncHTTPServer(
+            ("127.0.0.1", 0),
+            app.LeaderboardHandler,
+            max_connections=self.max_connections,
+            workers=self.workers,
+        )
+        loop.run_until_complete(server.start())
+        self.port = server.server_address[1]
+        self._thread = threading.Thread(target=loop.run_forever, name="bench-server", daemon=True)
+        self._thread.start()
+
+        async def shutdown() -> None:
+            # clients are done, so only idle keep-alive readers remain
+            server.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        def stop() -> None:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+        self._stop = stop
+
+    def stop(self) -> None:
+        self._stop()
+
+
+# --- load generation -------------------------------------------------------
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def merge(self, other: "OperationStats") -> None:
+        self.latencies.extend(other.latencies)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.errors += other.errors
+
+
+class Client:
+    """One simulated user: a keep-alive connection issuing a weighted op mix."""
+
+    def __init__(self, port: int, players: int, mix: dict[str, int], seed: int, auth: str) -> None:
+        self.port = port
+        self.players = players
+        self.rng = random.Random(seed)
+        self.auth = auth
+        self.operations = [name for name in OPERATIONS if mix.get(name)]
+        self.weights = [mix[name] for name in self.operations]
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        self.stats = {name: OperationStats() for name in OPERATIONS}
+
+    def run(self, warmup_until: float, deadline: float, max_requests: Optional[int]) -> None:
+        # every measured attempt counts, failed or not, so a --requests run without
+        # a duration still ends when the server refuses or drops connections
+        attempts = 0
+        try:
+            while time.perf_counter() < deadline and (max_requests is None or attempts < max_requests):
+                operation = self.rng.choices(self.operations, self.weights)[0]
+                method, path, body, headers = self.build(operation)
+                started = time.perf_counter()
+                status = self.send(method, path, body, headers)
+                elapsed = time.perf_counter() - started
+                if started < warmup_until:
+                    continue
+                attempts += 1
+                stats = self.stats[operation]
+                if status is None:
+                    stats.errors += 1
+                    continue
+                stats.latencies.append(elapsed)
+                stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+                if status >= 400:
+                    stats.errors += 1
+        finally:
+            self.conn.close()
+
+    def build(self, operation: str) -> tuple[str, str, Optional[dict], dict[str, str]]:
+        player_id = self.rng.randint(1, self.players)
+        if operation == "leaderboard":
+            return "GET", f"/api/leaderboard?limit={self.rng.choice((10, 50, 100))}", None, {}
+        if operation == "player":
+            return "GET", f"/api/players/{player_id}", None, {}
+        if operation == "score":
+            body = {"delta": self.rng.randint(-50, 200), "reason": "Benchmark adjustment"}
+            return "POST", f"/api/players/{player_id}/scores", body, {}
+        entrants = self.rng.sample(range(1, self.players + 1), min(GAME_SIZE, self.players))
+        body = {
+            "label": "Benchmark game",
+            "placements": [
+                {"nickname": nickname_for(entrant), "rank": rank} for rank, entrant in enumerate(entrants, start=1)
+            ],
+        }
+        return "POST", "/api/games", body, {"Authorization": self.auth}
+
+    def send(self, method: str, path: str, body: Optional[dict], headers: dict[str, str]) -> Optional[int]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        if payload is not None:
+            headers = {**headers, "Content-Type": "application/json"}
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            # server hung up (HTTP/1.0 engine, overload); reconnect on next request
+            self.conn.close()
+            return None
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sample."""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarise(stats: OperationStats, seconds: float) -> dict[str, object]:
+    ordered = sorted(stats.latencies)
+    to_ms = 1000.0
+    return {
+        "requests": len(ordered),
+        "errors": stats.errors,
+        "statuses": dict(sorted(stats.statuses.items())),
+        "throughput_rps": round(len(ordered) / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * to_ms, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * to_ms, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * to_ms, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * to_ms, 3),
+        "max_ms": round(ordered[-1] * to_ms, 3) if ordered else 0.0,
+    }
+
+
+def run_load(
+    port: int,
+    players: int,
+    mix: dict[str, int],
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    requests_per_client: Optional[int],
+    seed: int,
+    admin_password: str,
+) -> tuple[dict[str, OperationStats], float]:
+    credentials = f"{app.ADMIN_USERNAME}:{admin_password}".encode("utf-8")
+    auth = "Basic " + base64.b64encode(credentials).decode("ascii")
+    clients = [Client(port, players, mix, seed + index, auth) for index in range(concurrency)]
+    started = time.perf_counter()
+    warmup_until = started + warmup
+    deadline = warmup_until + duration if requests_per_client is None else float("inf")
+    threads = [
+        threading.Thread(target=client.run, args=(warmup_until, deadline, requests_per_client), daemon=True)
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    measured = time.perf_counter() - max(warmup_until, started)
+
+    totals = {name: OperationStats() for name in OPERATIONS}
+    for client in clients:
+        for name, stats in client.stats.items():
+            totals[name].merge(stats)
+    return totals, measured
+
+
+# --- reporting -------------------------------------------------------------
+def parse_mix(value: str) -> dict[str, int]:
+    if value in WORKLOADS:
+        return dict(WORKLOADS[value])
+    mix = {name: 0 for name in OPERATIONS}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in mix:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("workload mix needs at least one positive weight")
+    return mix
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=app.ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def build_report(args: dict[str, object], totals: dict[str, OperationStats], seconds: float) -> dict[str, object]:
+    overall = OperationStats()
+    for stats in totals.values():
+        overall.merge(stats)
+    return {
+        "environment": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "arguments": args,
+        "duration_s": round(seconds, 3),
+        "overall": summarise(overall, seconds),
+        "operations": {name: summarise(stats, seconds) for name, stats in totals.items() if stats.latencies},
+    }
+
+
+def print_report(report: dict[str, object], baseline: Optional[dict[str, object]] = None) -> None:
+    rows = [("overall", report["overall"])] + list(report["operations"].items())
+    header = f"{'operation':<12} {'requests':>9} {'errors':>7} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, summary in rows:
+        print(
+            f"{name:<12} {summary['requests']:>9} {summary['errors']:>7} {summary['throughput_rps']:>10.1f} "
+            f"{summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+        )
+        if baseline is None:
+            continue
+        previous = baseline["overall"] if name == "overall" else baseline["operations"].get(name)
+        if previous:
+            print(
+                f"{'  vs base':<12} {'':>9} {'':>7} {_change(summary, previous, 'throughput_rps'):>10} "
+                f"{_change(summary, previous, 'p50_ms'):>9} {_change(summary, previous, 'p95_ms'):>9} "
+                f"{_change(summary, previous, 'p99_ms'):>9}"
+            )
+
+
+def _change(current: dict[str, float], previous: dict[str, float], key: str) -> str:
+    if not previous.get(key):
+        return "n/a"
+    return f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}%"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard server with synthetic load")
+    parser.add_argument("--db", type=Path, help="Database file to benchmark (seeded if empty; default: temp file)")
+    parser.add_argument("--players", type=int, default=1000, help="Synthetic players to seed")
+    parser.add_argument("--history", type=int, default=20, help="Average score_history rows per seeded player")
+    parser.add_argument(
+        "--mix",
+        default="mixed",
+        help=f"Workload preset ({', '.join(WORKLOADS)}) or weights like 'leaderboard=70,player=20,score=10'",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous client connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of load discarded before measuring")
+    parser.add_argument(
+        "--requests", type=int, help="Stop after this many requests per client instead of after --duration"
+    )
+    parser.add_argument("--engine", choices=("threading", "asyncio"), default="threading")
+    parser.add_argument("--storage", choices=db.STORAGE_MODES, default="rollback")
+    parser.add_argument("--pool-size", type=int, default=db.DEFAULT_POOL_SIZE)
+    parser.add_argument("--reads", choices=db.READ_ROUTES, default="primary", help="Where GET handlers read from")
+    parser.add_argument("--workers", type=int, default=app.DEFAULT_WORKERS, help="asyncio engine handler threads")
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="Keep the server's per-client rate limits and concurrency cap on"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and request sequences")
+    parser.add_argument(
+        "--admin-password",
+        default=app.ADMIN_PASSWORD,
+        help="Plain-text admin password for game submissions (needed when only a hash is configured)",
+    )
+    parser.add_argument("--output", type=Path, help="Where to write the JSON report (default: bench-results/)")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+
+    workdir = None
+    path = args.db
+    if path is None:
+        workdir = tempfile.TemporaryDirectory(prefix="club-bench-")
+        path = Path(workdir.name) / "bench.db"
+    players = count_players(path)
+    if players == 0:
+        print(f"Seeding {args.players} players into {path} ...", file=sys.stderr)
+        seed_database(path, args.players, args.history, args.seed)
+        players = args.players
+
+    db.DB_PATH = path
+    app.ADMISSION.enabled = args.rate_limit
+    app.start_services(
+        pool_size=args.pool_size,
+        storage=args.storage,
+        metrics=False,
+        slow_query_ms=0,
+        seed=False,
+        reads=args.reads,
+    )
+    server = BenchServer(args.engine, args.workers, max_connections=max(args.concurrency * 2, 64))
+    server.start()
+    try:
+        totals, seconds = run_load(
+            server.port,
+            players,
+            mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            requests_per_client=args.requests,
+            seed=args.seed,
+            admin_password=args.admin_password,
+        )
+    finally:
+        server.stop()
+        app.stop_services()
+        if workdir is not None:
+            workdir.cleanup()
+
+    arguments = {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()}
+    del arguments["admin_password"]
+    arguments.update(mix=mix, players=players)
+    report = build_report(arguments, totals, seconds)
+    print_report(report, baseline)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = DEFAULT_RESULTS_DIR / f"bench-{report['environment']['git_revision'] or 'local'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Saved results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""In-process response cache keyed on the database write generation."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from db import read_version
+
+
+class GenerationCache:
+    """Small LRU of serialised responses that is invalidated by writes.
+
+    Each entry remembers the ``db.read_version()`` it was built at; a lookup
+    only hits when the stored generation matches the current one, so a write
+    committed through ``db.py`` makes every older entry unreachable without
+    any explicit purge. (Outside snapshot routing ``read_version()`` is just
+    ``data_version()``.)
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        generation = read_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        # read the generation before querying so a write racing with the build
+        # leaves the entry tagged with the older generation
+        generation = read_version()
+        payload = build()
+        with self._lock:
+            self._entries[key] = (generation, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -1,9 +1,25 @@
 """Lightweight SQLite helper functions for the Texas Hold'em club leaderboard."""
 from __future__ import annotations
 
+import csv
+import functools
+import json
+import os
+import queue
+import re
 import sqlite3
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, ContextManager, Iterable, Iterator, NamedTuple, Optional, TypeVar, Union
+
+T = TypeVar("T")
 
 # leaderboard points awarded per rank
 DEFAULT_RANK_POINTS = {
@@ -20,16 +36,860 @@ DEFAULT_RANK_POINTS = {
 
 DB_PATH = Path(__file__).resolve().parent / "club.db"
 
+# read routing: "primary" serves reads from the shared read-write pool,
+# "readonly" from a pool of read-only connections to the same file, and
+# "snapshot" lets GET handlers read a periodically refreshed copy instead
+READ_ROUTES = ("primary", "readonly", "snapshot")
+REPLICA_REFRESH_INTERVAL = 2.0
+REPLICA_MAX_STALENESS = 10.0
+# clients whose last seen/written version is remembered for snapshot reads (LRU)
+READ_SESSION_LIMIT = 10_000
+# how often a running server looks for commits made by other processes
+# (the import and backfill commands, backup.py restore, a sqlite3 shell)
+EXTERNAL_WRITE_POLL = 1.0
+
+# connection pool tuning; overridable via environment or configure_pool()
+DEFAULT_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+POOL_ACQUIRE_TIMEOUT = 10.0
+POOL_HEALTH_CHECK_INTERVAL = 30.0
+
+# storage modes: "rollback" writes from the calling thread under SQLite's
+# default journal, "wal" turns on write-ahead logging and funnels every write
+# through a single writer thread that group-commits queued jobs
+STORAGE_MODES = ("rollback", "wal")
+WRITER_BATCH_SIZE = 64
+# bound parameters per statement for bulk IN (...) / VALUES lists
+SQL_BATCH_SIZE = 900
+
+
+# instrumentation hooks: each observer is called as observer(function_name,
+# seconds, rows) after a public query/write; with none registered the wrapper
+# costs one tuple truth test
+QueryObserver = Callable[[str, float, int], None]
+_query_observers: tuple[QueryObserver, ...] = ()
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    global _query_observers
+    _query_observers = (*_query_observers, observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    global _query_observers
+    _query_observers = tuple(item for item in _query_observers if item is not observer)
+
+
+def _row_count(result: object) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if "applied" in result:
+            return len(result["applied"])
+        return sum(len(rows) for rows in result.values() if isinstance(rows, list))
+    return 1
+
+
+def _timed(fn: Callable[..., T]) -> Callable[..., T]:
+    """Report duration and rows of ``fn`` to the registered query observers."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: object, **kwargs: object) -> T:
+        if not _query_observers:
+            return fn(*args, **kwargs)
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        rows = _row_count(result)
+        for observer in _query_observers:
+            observer(name, elapsed, rows)
+        return result
 
-def connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
-    """Return a connection with row factory configured for name-based access."""
+    return wrapper
+
+
+def connect(db_path: Optional[Path] = None, *, read_only: bool = False) -> sqlite3.Connection:
+    """Return a connection with row factory configured for name-based access.
+
+    ``read_only`` opens the file with a ``mode=ro`` URI and sets
+    ``query_only``, so the connection can never take a write lock.
+    """
     path = db_path or DB_PATH
-    conn = sqlite3.connect(path)
+    if read_only:
+        conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON;")
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
 
+class ConnectionPool:
+    """Bounded pool of long-lived connections shared by the request threads.
+
+    Connections are opened lazily up to ``size`` and handed out LIFO so a warm
+    connection (with its parsed schema and page cache) is reused first.
+    Connections that sat idle longer than ``health_check_interval`` are probed
+    with ``SELECT 1`` before being handed out and replaced if the probe fails.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        size: int = DEFAULT_POOL_SIZE,
+        *,
+        timeout: float = POOL_ACQUIRE_TIMEOUT,
+        health_check_interval: float = POOL_HEALTH_CHECK_INTERVAL,
+        read_only: bool = False,
+    ) -> None:
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.db_path = db_path or DB_PATH
+        self.read_only = read_only
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle: queue.LifoQueue[tuple[sqlite3.Connection, float]] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open_if_capacity()
+            if conn is not None:
+                return conn
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise RuntimeError("Timed out waiting for a database connection") from None
+
+        if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self.acquire()
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            self._discard(conn)
+            return
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.Error:
+            # constraint violations leave the connection usable; anything worse
+            # (disk I/O, corruption) should not be handed out again
+            if self._is_healthy(conn):
+                self.release(conn)
+            else:
+                self._discard(conn)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections and reject further checkouts."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": self.size, "opened": self._opened, "idle": self._idle.qsize()}
+
+    def _open_if_capacity(self) -> Optional[sqlite3.Connection]:
+        with self._lock:
+            if self._opened >= self.size:
+                return None
+            self._opened += 1
+        try:
+            return connect(self.db_path, read_only=self.read_only)
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._opened -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1;").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(size: int = DEFAULT_POOL_SIZE, db_path: Optional[Path] = None, **options: float) -> ConnectionPool:
+    """Replace the shared connection pool, closing the previous one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(db_path, size, **options)
+        return _pool
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+
+def close_pool() -> None:
+    """Close the shared pool; called from run_server on shutdown."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def pooled_connection() -> ContextManager[sqlite3.Connection]:
+    """Borrow a connection from the shared pool for the duration of a ``with`` block."""
+    return get_pool().connection()
+
+
+_data_version = 0
+_data_version_lock = threading.Lock()
+
+
+def data_version() -> int:
+    """Return a counter that increases after every committed write.
+
+    Caches key their entries on this value so nothing written before the
+    latest commit is ever served. Commits made by other processes count too
+    once the external write watch has seen them (see
+    ``watch_external_writes``), within ``EXTERNAL_WRITE_POLL`` seconds.
+    """
+    return _data_version
+
+
+def _bump_data_version(player_ids: Optional[frozenset[int]] = None) -> None:
+    global _data_version
+    with _data_version_lock:
+        _data_version += 1
+        version = _data_version
+    for listener in list(_commit_listeners):
+        listener(version, player_ids)
+
+
+CommitListener = Callable[[int, Optional[frozenset[int]]], None]
+_commit_listeners: list[CommitListener] = []
+
+
+def add_commit_listener(listener: CommitListener) -> None:
+    """Call ``listener(data_version, player_ids)`` after every committed write.
+
+    ``player_ids`` holds the players whose rows the commit changed, or is None
+    when the commit may have touched any player (schema setup, seeding,
+    backfills). Listeners run on the committing thread (the writer thread in
+    WAL mode), so they must be quick and must not raise; hand real work off to
+    another thread.
+    """
+    _commit_listeners.append(listener)
+
+
+def remove_commit_listener(listener: CommitListener) -> None:
+    if listener in _commit_listeners:
+        _commit_listeners.remove(listener)
+
+
+class _ChangeSet:
+    """Players touched by the write job running on the current thread."""
+
+    __slots__ = ("players", "everything")
+
+    def __init__(self) -> None:
+        self.players: set[int] = set()
+        self.everything = False
+
+    def merge(self, other: "_ChangeSet") -> None:
+        self.players |= other.players
+        self.everything = self.everything or other.everything
+
+    def frozen(self) -> Optional[frozenset[int]]:
+        return None if self.everything else frozenset(self.players)
+
+
+_tracked = threading.local()
+
+
+@contextmanager
+def _track_changes() -> Iterator[_ChangeSet]:
+    changes = _ChangeSet()
+    _tracked.changes = changes
+    try:
+        yield changes
+    finally:
+        _tracked.changes = None
+
+
+def _note_players(player_ids: Iterable[int]) -> None:
+    changes = getattr(_tracked, "changes", None)
+    if changes is not None:
+        changes.players.update(player_ids)
+
+
+def _note_all_players() -> None:
+    changes = getattr(_tracked, "changes", None)
+    if changes is not None:
+        changes.everything = True
+
+
+# --- writes from other processes ----------------------------------------
+class ExternalWriteWatch:
+    """Notices commits made to the database file by other processes.
+
+    ``PRAGMA data_version`` on a connection changes whenever some other
+    connection has committed. The watch polls one read-only connection of its
+    own every ``interval`` seconds. Commits made in this process go through
+    ``_committing``, which checks for outside changes just before the COMMIT
+    and absorbs the commit itself just after it. So whatever change is left
+    came from another process, and it is reported as a commit that may have
+    touched every player: caches and ETags move on, and the rank index, live
+    hub and statistics reload.
+
+    A commit from another process that lands between one of our COMMITs and
+    the re-read just after it is taken for ours. It then shows up with the
+    next change the watch sees.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, interval: float = EXTERNAL_WRITE_POLL) -> None:
+        self.interval = interval
+        self.lock = threading.Lock()
+        self._conn = connect(db_path, read_only=True)
+        # never wait on a lock: a busy file is reported as a change instead
+        self._conn.execute("PRAGMA busy_timeout = 0;")
+        self._version = self._read()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="db-external-watch", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        with self.lock:
+            self._conn.close()
+
+    def changed(self) -> bool:
+        """True if another connection committed since the last call; call with ``lock`` held."""
+        version = self._read()
+        if version is not None and version == self._version:
+            return False
+        if version is not None:
+            self._version = version
+        return True
+
+    def poll(self) -> None:
+        with self.lock:
+            changed = self.changed()
+        if changed:
+            _external_commit()
+
+    def _read(self) -> Optional[int]:
+        try:
+            # fetchall so the statement finishes and releases its shared lock at once
+            return self._conn.execute("PRAGMA data_version;").fetchall()[0][0]
+        except sqlite3.OperationalError:
+            # a writer that spilled its cache to the file holds an exclusive lock
+            return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                print("External write check failed", file=sys.stderr)
+                traceback.print_exc()
+
+
+_watch: Optional[ExternalWriteWatch] = None
+
+
+def watch_external_writes(interval: float = EXTERNAL_WRITE_POLL) -> None:
+    """Start polling for commits by other processes; called from start_services."""
+    global _watch
+    stop_external_watch()
+    _watch = ExternalWriteWatch(interval=interval)
+
+
+def stop_external_watch() -> None:
+    global _watch
+    watch, _watch = _watch, None
+    if watch is not None:
+        watch.close()
+
+
+def _external_commit() -> None:
+    # a restore may have rolled idempotency keys back; forget the stored outcomes too
+    with _recent_outcomes_lock:
+        _recent_outcomes.clear()
+    _bump_data_version(None)
+
+
+@contextmanager
+def _committing(changes: _ChangeSet) -> Iterator[None]:
+    """Wrap an in-process COMMIT so the external write watch does not report it.
+
+    Call with the write lock held. A change seen just before the COMMIT came
+    from another process; it is folded into ``changes`` as touching everyone.
+    """
+    watch = _watch
+    if watch is None:
+        yield
+        return
+    with watch.lock:
+        if watch.changed():
+            changes.everything = True
+            with _recent_outcomes_lock:
+                _recent_outcomes.clear()
+        yield
+        watch.changed()
+
+
+# --- read routing -------------------------------------------------------
+class SnapshotReplica:
+    """A read-only copy of the database, refreshed from the primary.
+
+    ``refresh()`` copies the primary into a new file with the backup API and
+    swaps in a pool of read-only connections to it. The previous copy stays
+    open until the next refresh, so reads already running finish on it. A
+    commit listener records when the copy first fell behind. Once that is
+    more than ``max_staleness`` seconds ago the copy is no longer ``fresh()``
+    and routed reads fall back to the primary until it catches up.
+
+    The copy is taken in a single backup step. In WAL mode that runs
+    alongside writers. With the rollback journal it holds off writers while
+    it runs, so snapshot routing is meant for WAL storage.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        refresh_interval: float = REPLICA_REFRESH_INTERVAL,
+        max_staleness: float = REPLICA_MAX_STALENESS,
+    ) -> None:
+        self.directory = directory
+        self.size = size
+        self.max_staleness = max_staleness
+        self.version = -1
+        self.refreshes = 0
+        self._pool: Optional[ConnectionPool] = None
+        self._retired: Optional[ConnectionPool] = None
+        self._stale_since: Optional[float] = 0.0
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for leftover in self.directory.glob("replica-*.db"):
+            leftover.unlink(missing_ok=True)
+        add_commit_listener(self._on_commit)
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-replica", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        remove_commit_listener(self._on_commit)
+        for pool in (self._retired, self._pool):
+            if pool is not None:
+                pool.close()
+                pool.db_path.unlink(missing_ok=True)
+        self._pool = self._retired = None
+
+    def staleness(self) -> float:
+        """Seconds since the first commit the copy does not contain (0 when current)."""
+        stale_since = self._stale_since
+        return 0.0 if stale_since is None else time.monotonic() - stale_since
+
+    def fresh(self) -> bool:
+        return self._pool is not None and self.staleness() <= self.max_staleness
+
+    def connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.connection()
+
+    def refresh_if_stale(self) -> None:
+        if self._stale_since is not None:
+            self.refresh()
+
+    def refresh(self) -> None:
+        started = time.monotonic()
+        version = data_version()
+        self.refreshes += 1
+        path = self.directory / f"replica-{self.refreshes}.db"
+        source = connect()
+        try:
+            dest = sqlite3.connect(path)
+            try:
+                source.backup(dest)
+                # a rollback journal lets mode=ro connections open the copy without -wal/-shm files
+                dest.execute("PRAGMA journal_mode = DELETE;")
+            finally:
+                dest.close()
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        finally:
+            source.close()
+
+        retired = self._retired
+        self._retired = self._pool
+        with self._lock:
+            self._pool = ConnectionPool(path, self.size, read_only=True)
+            self.version = version
+            self._stale_since = None if data_version() == version else started
+        if retired is not None:
+            retired.close()
+            try:
+                retired.db_path.unlink(missing_ok=True)
+            except OSError:
+                # still open elsewhere (Windows); start() clears it next time
+                pass
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_if_stale()
+            except Exception:
+                # a locked database or a full disk; keep serving the old copy and retry next time
+                print("Replica refresh failed", file=sys.stderr)
+                traceback.print_exc()
+
+    def _on_commit(self, version: int, player_ids: Optional[frozenset[int]]) -> None:
+        with self._lock:
+            if self._stale_since is None:
+                self._stale_since = time.monotonic()
+
+
+_read_pool: Optional[ConnectionPool] = None
+_replica: Optional[SnapshotReplica] = None
+_routing = threading.local()
+
+
+def configure_reads(
+    route: str = "primary",
+    *,
+    size: int = DEFAULT_POOL_SIZE,
+    refresh_interval: float = REPLICA_REFRESH_INTERVAL,
+    max_staleness: float = REPLICA_MAX_STALENESS,
+    replica_dir: Optional[Path] = None,
+) -> None:
+    """Choose where routed reads go; see ``READ_ROUTES``.
+
+    Call after ``initialize_database`` and ``configure_storage``: read-only
+    connections cannot create the file or switch its journal mode.
+    """
+    global _read_pool, _replica
+    if route not in READ_ROUTES:
+        raise ValueError(f"Unknown read route {route!r}; expected one of {', '.join(READ_ROUTES)}")
+    close_reads()
+    if route == "primary":
+        return
+    _read_pool = ConnectionPool(size=size, read_only=True)
+    if route == "snapshot":
+        replica = SnapshotReplica(
+            replica_dir or DB_PATH.with_name(f"{DB_PATH.stem}-replica"),
+            size=size,
+            refresh_interval=refresh_interval,
+            max_staleness=max_staleness,
+        )
+        replica.start()
+        _replica = replica
+
+
+def close_reads() -> None:
+    global _read_pool, _replica
+    if _replica is not None:
+        _replica.stop()
+        _replica = None
+    if _read_pool is not None:
+        _read_pool.close()
+        _read_pool = None
+    with _session_versions_lock:
+        _session_versions.clear()
+
+
+@contextmanager
+def replica_reads(session: Optional[str] = None) -> Iterator[None]:
+    """Allow routed reads in this thread to be served from the snapshot replica.
+
+    Only request handlers opt in. Background services (live stream, rank
+    index, statistics) track commits themselves and keep reading current
+    data. Reads made for a ``session`` (app.py uses the client address) are
+    monotonic and see the session's own writes: the replica is passed over
+    while it is older than the newest version the session has been shown or
+    has written (see ``note_session_write``).
+    """
+    previous = (getattr(_routing, "replica", False), getattr(_routing, "floor", 0))
+    _routing.replica = True
+    _routing.floor = _session_version(session) if session is not None else 0
+    try:
+        yield
+        if session is not None:
+            _remember_session_version(session, read_version())
+    finally:
+        _routing.replica, _routing.floor = previous
+
+
+def note_session_write(session: str) -> None:
+    """Record that ``session`` has just committed a write, for ``replica_reads``."""
+    _remember_session_version(session, data_version())
+
+
+_session_versions: OrderedDict[str, int] = OrderedDict()
+_session_versions_lock = threading.Lock()
+
+
+def _session_version(session: str) -> int:
+    with _session_versions_lock:
+        return _session_versions.get(session, 0)
+
+
+def _remember_session_version(session: str, version: int) -> None:
+    # only the snapshot route can serve old data; skip the bookkeeping otherwise
+    if _replica is None:
+        return
+    with _session_versions_lock:
+        if version > _session_versions.get(session, 0):
+            _session_versions[session] = version
+        if session in _session_versions:
+            _session_versions.move_to_end(session)
+        while len(_session_versions) > READ_SESSION_LIMIT:
+            _session_versions.popitem(last=False)
+
+
+def _routed_replica() -> Optional[SnapshotReplica]:
+    replica = _replica
+    if replica is None or not getattr(_routing, "replica", False) or not replica.fresh():
+        return None
+    # behind what this session has already seen or written: read the primary instead
+    if replica.version < getattr(_routing, "floor", 0):
+        return None
+    return replica
+
+
+def read_connection() -> ContextManager[sqlite3.Connection]:
+    """Borrow a connection for a routed read (see ``configure_reads``)."""
+    replica = _routed_replica()
+    if replica is not None:
+        return replica.connection()
+    pool = _read_pool
+    return pool.connection() if pool is not None else pooled_connection()
+
+
+def read_version() -> int:
+    """The ``data_version()`` that routed reads in this thread reflect.
+
+    Equal to ``data_version()`` except while reads are served from a
+    snapshot replica, so caches and ETags never label old rows as current.
+    Within ``replica_reads(session)`` it never drops below a version that
+    session was already shown.
+    """
+    replica = _routed_replica()
+    return replica.version if replica is not None else data_version()
+
+
+class WriteQueue:
+    """Single writer thread that applies queued write jobs with group commit.
+
+    Callers submit ``fn(conn, *args)`` and block on the returned future. The
+    writer drains up to ``batch_size`` pending jobs, runs each one inside its
+    own savepoint so a failing job only rolls back its own statements, and
+    commits the whole batch with a single ``COMMIT``. In WAL mode readers keep
+    using pooled connections and never wait behind the writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: Optional[Path] = None, *, batch_size: int = WRITER_BATCH_SIZE) -> None:
+        self.db_path = db_path or DB_PATH
+        self.batch_size = batch_size
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._conn = connect(self.db_path)
+        # explicit BEGIN/COMMIT below; disable the sqlite3 module's implicit transactions
+        self._conn.isolation_level = None
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self.batches = 0
+        self.jobs = 0
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., T], *args: object, **kwargs: object) -> "Future[T]":
+        if not self._thread.is_alive():
+            raise RuntimeError("Writer thread is not running")
+        future: Future[T] = Future()
+        self._jobs.put((fn, args, kwargs, future))
+        return future
+
+    def close(self) -> None:
+        """Finish queued jobs, stop the thread and close the writer connection."""
+        if self._thread.is_alive():
+            self._jobs.put(self._STOP)
+            self._thread.join()
+        self._conn.close()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is self._STOP:
+                return
+            batch = [job]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is self._STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._apply(batch)
+            if stopping:
+                return
+
+    def _apply(self, batch: list[tuple]) -> None:
+        conn = self._conn
+        outcomes: list[tuple[Future, object, Optional[BaseException]]] = []
+        committed = _ChangeSet()
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for fn, args, kwargs, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT write_job;")
+                try:
+                    with _track_changes() as changes:
+                        result = fn(conn, *args, **kwargs)
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO write_job;")
+                    conn.execute("RELEASE write_job;")
+                    outcomes.append((future, None, exc))
+                else:
+                    conn.execute("RELEASE write_job;")
+                    committed.merge(changes)
+                    outcomes.append((future, result, None))
+            with _committing(committed):
+                conn.execute("COMMIT;")
+            # a batch whose jobs all failed (say, a lost idempotency-key claim) changed nothing
+            if committed.everything or any(error is None for _, _, error in outcomes):
+                _bump_data_version(committed.frozen())
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK;")
+            for fn, args, kwargs, future in batch:
+                if not future.done():
+                    if not future.running():
+                        future.set_running_or_notify_cancel()
+                    future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.jobs += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_writer: Optional[WriteQueue] = None
+_writer_lock = threading.Lock()
+
+
+def configure_storage(mode: str = "rollback", db_path: Optional[Path] = None) -> None:
+    """Select the storage mode; ``"wal"`` starts the dedicated writer thread."""
+    global _writer
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode {mode!r}; expected one of {', '.join(STORAGE_MODES)}")
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+        if mode == "wal":
+            _writer = WriteQueue(db_path)
+
+
+def stop_writer() -> None:
+    """Drain and stop the writer thread if one is running."""
+    configure_storage("rollback")
+
+
+def run_write(fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+    """Run ``fn(conn, *args, **kwargs)`` as a committed write transaction.
+
+    With the WAL writer running the job is queued and group-committed by the
+    writer thread; otherwise it runs on a pooled connection and commits
+    immediately. Exceptions raised by ``fn`` propagate to the caller and roll
+    back only that job's changes.
+    """
+    writer = _writer
+    if writer is not None:
+        return writer.submit(fn, *args, **kwargs).result()
+
+    with pooled_connection() as conn, _track_changes() as changes:
+        try:
+            # take the write lock up front: jobs read high-water marks (MAX(id))
+            # before their first INSERT, and a deferred transaction would let
+            # another connection commit in between
+            conn.execute("BEGIN IMMEDIATE;")
+            result = fn(conn, *args, **kwargs)
+        except BaseException:
+            conn.rollback()
+            raise
+        with _committing(changes):
+            conn.commit()
+    _bump_data_version(changes.frozen())
+    return result
+
+
 def initialize_database(force: bool = False) -> None:
     """Create tables if they do not exist. Optionally drop existing data."""
     ddl_statements = [
@@ -38,6 +898,7 @@ def initialize_database(force: bool = False) -> None:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nickname TEXT NOT NULL UNIQUE,
             total_points INTEGER NOT NULL DEFAULT 0,
+            finals_played INTEGER NOT NULL DEFAULT 0,
             avatar_url TEXT,
             notes TEXT,
             created_at TEXT NOT NULL DEFAULT (datetime('now')),
@@ -54,15 +915,232 @@ def initialize_database(force: bool = False) -> None:
             FOREIGN KEY(player_id) REFERENCES players(id) ON DELETE CASCADE
         );
         """,
+        """
+        CREATE TABLE IF NOT EXISTS period_totals (
+            period TEXT NOT NULL,
+            player_id INTEGER NOT NULL,
+            points INTEGER NOT NULL DEFAULT 0,
+            finals INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, player_id),
+            FOREIGN KEY(player_id) REFERENCES players(id) ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            rows_done INTEGER NOT NULL,
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT NOT NULL,
+            played_at TEXT NOT NULL DEFAULT (datetime('now')),
+            entrants INTEGER NOT NULL DEFAULT 0,
+            source TEXT
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS game_placements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            points INTEGER NOT NULL,
+            history_id INTEGER,
+            FOREIGN KEY(game_id) REFERENCES games(id) ON DELETE CASCADE,
+            FOREIGN KEY(player_id) REFERENCES players(id) ON DELETE CASCADE,
+            FOREIGN KEY(history_id) REFERENCES score_history(id) ON DELETE SET NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            result TEXT,
+            created_at TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+        """,
     ]
 
-    with connect() as conn:
+    with pooled_connection() as conn:
+        had_periods = _table_exists(conn, "period_totals")
+        had_games = _table_exists(conn, "games")
         if force:
+            conn.execute("DROP TABLE IF EXISTS idempotency_keys;")
+            with _recent_outcomes_lock:
+                _recent_outcomes.clear()
+            conn.execute("DROP TABLE IF EXISTS import_checkpoints;")
+            conn.execute("DROP TABLE IF EXISTS game_placements;")
+            conn.execute("DROP TABLE IF EXISTS games;")
+            conn.execute("DROP TABLE IF EXISTS period_totals;")
             conn.execute("DROP TABLE IF EXISTS score_history;")
             conn.execute("DROP TABLE IF EXISTS players;")
         for ddl in ddl_statements:
             conn.execute(ddl)
+        _migrate_schema(conn)
+        if not had_periods and not force:
+            _rebuild_period_totals(conn)
+        if not had_games and not force:
+            _backfill_games(conn)
         conn.commit()
+    _bump_data_version()
+
+
+def _migrate_schema(conn: sqlite3.Connection) -> None:
+    """Bring databases created by older versions up to the current schema."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(players);")}
+    if "finals_played" not in columns:
+        conn.execute("ALTER TABLE players ADD COLUMN finals_played INTEGER NOT NULL DEFAULT 0;")
+        _backfill_finals_played(conn)
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_score_history_player_created ON score_history (player_id, created_at);"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_players_points_nickname ON players (total_points DESC, nickname);"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_period_totals_points ON period_totals (period, points DESC);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys (created_at);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_played_at ON games (played_at, id);")
+    # an import may repeat a label on different dates ("Weekly final"), one game per date
+    conn.execute("DROP INDEX IF EXISTS idx_games_source_label;")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_games_source_label_played "
+        "ON games (source, label, played_at) WHERE source IS NOT NULL;"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_game_placements_game ON game_placements (game_id, rank);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_game_placements_player ON game_placements (player_id, game_id);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_game_placements_rank ON game_placements (rank, player_id);")
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (name,)).fetchone()
+    return row is not None
+
+
+# --- period leaderboards -------------------------------------------------
+# Every score event counts towards three periods derived from its UTC
+# timestamp: the year ("2026"), the university semester ("2026-S1" for
+# January-June, "2026-S2" for July-December) and the month ("2026-10").
+PERIOD_PATTERN = re.compile(r"^\d{4}(?:-S[12]|-(?:0[1-9]|1[0-2]))?$")
+_PERIOD_EXPRESSIONS = (
+    "strftime('%Y', created_at)",
+    "strftime('%Y', created_at) || '-S' || "
+    "(CASE WHEN CAST(strftime('%m', created_at) AS INTEGER) <= 6 THEN 1 ELSE 2 END)",
+    "strftime('%Y-%m', created_at)",
+)
+
+
+def _history_high_water(conn: sqlite3.Connection) -> int:
+    """Largest score_history id so far; rows inserted afterwards have larger ids."""
+    return conn.execute("SELECT COALESCE(MAX(id), 0) AS id FROM score_history;").fetchone()["id"]
+
+
+def _accumulate_periods(conn: sqlite3.Connection, after_history_id: int) -> None:
+    """Fold score_history rows with ``id > after_history_id`` into period_totals."""
+    selects = " UNION ALL ".join(
+        f"SELECT {expression} AS period, player_id, delta FROM score_history WHERE id > :after"
+        for expression in _PERIOD_EXPRESSIONS
+    )
+    conn.execute(
+        f"""
+        INSERT INTO period_totals (period, player_id, points, finals)
+        SELECT period, player_id, SUM(delta), COUNT(*)
+        FROM ({selects})
+        WHERE true
+        GROUP BY period, player_id
+        ON CONFLICT(period, player_id) DO UPDATE SET
+            points = points + excluded.points,
+            finals = finals + excluded.finals;
+        """,
+        {"after": after_history_id},
+    )
+
+
+def _rebuild_period_totals(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM period_totals;")
+    _accumulate_periods(conn, 0)
+
+
+@_timed
+def rebuild_period_totals() -> None:
+    """Recompute every period summary from score_history."""
+    run_write(_rebuild_period_totals)
+
+
+@_timed
+def list_period_leaderboard(
+    period: str, limit: int = 50, after: Optional[tuple[int, str]] = None
+) -> list[sqlite3.Row]:
+    """Leaderboard for one period read from the period_totals summary.
+
+    Rows carry the same columns as ``list_leaderboard`` with ``total_points``
+    and ``finals_played`` restricted to the period.
+    """
+    where, params = "", ()
+    if after is not None:
+        where = "AND t.points <= ? AND (t.points < ? OR p.nickname > ?)"
+        params = (after[0], after[0], after[1])
+    with read_connection() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT
+                p.id,
+                p.nickname,
+                t.points AS total_points,
+                p.notes AS slogan,
+                p.avatar_url,
+                t.finals AS finals_played
+            FROM period_totals t
+            JOIN players p ON p.id = t.player_id
+            WHERE t.period = ? {where}
+            ORDER BY t.points DESC, p.nickname ASC
+            LIMIT ?;
+            """,
+            (period, *params, limit),
+        )
+        return cursor.fetchall()
+
+
+def _backfill_finals_played(conn: sqlite3.Connection) -> int:
+    _note_all_players()
+    cursor = conn.execute(
+        """
+        UPDATE players
+        SET finals_played = (
+            SELECT COUNT(*) FROM score_history h WHERE h.player_id = players.id
+        );
+        """
+    )
+    return cursor.rowcount
+
+
+@_timed
+def backfill_finals_played() -> int:
+    """Recompute every player's ``finals_played`` counter from score_history.
+
+    Returns the number of player rows rewritten.
+    """
+    return run_write(_backfill_finals_played)
+
+
+@_timed
+def check_finals_played() -> list[dict[str, int]]:
+    """Return players whose stored ``finals_played`` disagrees with score_history."""
+    with pooled_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT p.id, p.finals_played AS stored, COUNT(h.id) AS actual
+            FROM players p
+            LEFT JOIN score_history h ON h.player_id = p.id
+            GROUP BY p.id
+            HAVING stored != actual
+            ORDER BY p.id;
+            """
+        ).fetchall()
+    return [{"player_id": row["id"], "stored": row["stored"], "actual": row["actual"]} for row in rows]
 
 
 DEFAULT_AVATARS = {
@@ -121,7 +1199,7 @@ def seed_sample_data() -> None:
         },
     ]
 
-    with connect() as conn:
+    with pooled_connection() as conn:
         existing = conn.execute("SELECT COUNT(*) AS c FROM players;").fetchone()["c"]
         if existing:
             return
@@ -138,40 +1216,52 @@ def seed_sample_data() -> None:
                     (player_id, delta, reason),
                 )
                 conn.execute(
-                    "UPDATE players SET total_points = total_points + ?, updated_at = datetime('now') WHERE id = ?;",
+                    "UPDATE players SET total_points = total_points + ?, finals_played = finals_played + 1, "
+                    "updated_at = datetime('now') WHERE id = ?;",
                     (delta, player_id),
                 )
+        _rebuild_period_totals(conn)
         conn.commit()
+    _bump_data_version()
+
 
+@_timed
+def list_leaderboard(limit: int = 50, after: Optional[tuple[int, str]] = None) -> list[sqlite3.Row]:
+    """Return top players sorted by score descending.
 
-def list_leaderboard(limit: int = 50) -> list[sqlite3.Row]:
-    """Return top players sorted by score descending."""
-    with connect() as conn:
+    ``after`` is the ``(total_points, nickname)`` of the last row of the
+    previous page; the next page is read by seeking the leaderboard index
+    from that key, so deep pages cost the same as the first one.
+    """
+    where, params = "", ()
+    if after is not None:
+        # the leading range term lets SQLite seek the index instead of scanning it
+        where = "WHERE p.total_points <= ? AND (p.total_points < ? OR p.nickname > ?)"
+        params = (after[0], after[0], after[1])
+    with read_connection() as conn:
         cursor = conn.execute(
-            """
+            f"""
             SELECT
                 p.id,
                 p.nickname,
                 p.total_points,
                 p.notes AS slogan,
                 p.avatar_url,
-                (
-                    SELECT COUNT(*)
-                    FROM score_history h
-                    WHERE h.player_id = p.id
-                ) AS finals_played
+                p.finals_played
             FROM players p
+            {where}
             ORDER BY total_points DESC, nickname ASC
             LIMIT ?;
             """,
-            (limit,),
+            (*params, limit),
         )
         return cursor.fetchall()
 
 
+@_timed
 def get_player(player_id: int) -> Optional[sqlite3.Row]:
     """Fetch a single player row by id."""
-    with connect() as conn:
+    with read_connection() as conn:
         row = conn.execute(
             """
             SELECT
@@ -182,11 +1272,7 @@ def get_player(player_id: int) -> Optional[sqlite3.Row]:
                 p.avatar_url,
                 p.created_at,
                 p.updated_at,
-                (
-                    SELECT COUNT(*)
-                    FROM score_history h
-                    WHERE h.player_id = p.id
-                ) AS finals_played
+                p.finals_played
             FROM players p
             WHERE p.id = ?;
             """,
@@ -195,46 +1281,338 @@ def get_player(player_id: int) -> Optional[sqlite3.Row]:
         return row
 
 
-def get_player_history(player_id: int, limit: int = 20) -> list[sqlite3.Row]:
-    with connect() as conn:
+@_timed
+def get_player_history(
+    player_id: int, limit: int = 20, before: Optional[tuple[str, int]] = None
+) -> list[sqlite3.Row]:
+    """Return a player's score events, newest first.
+
+    ``before`` is the ``(created_at, id)`` of the last event already shown.
+    """
+    where, params = "", ()
+    if before is not None:
+        where = "AND created_at <= ? AND (created_at < ? OR id < ?)"
+        params = (before[0], before[0], before[1])
+    with read_connection() as conn:
         cursor = conn.execute(
-            """
-            SELECT delta, reason, created_at
+            f"""
+            SELECT id, delta, reason, created_at
             FROM score_history
-            WHERE player_id = ?
-            ORDER BY created_at DESC
+            WHERE player_id = ? {where}
+            ORDER BY created_at DESC, id DESC
             LIMIT ?;
             """,
-            (player_id, limit),
+            (player_id, *params, limit),
         )
         return cursor.fetchall()
 
 
-def add_player(nickname: str, slogan: str = "", avatar_url: Optional[str] = None) -> int:
-    with connect() as conn:
+@_timed
+def get_players(player_ids: Iterable[int]) -> list[sqlite3.Row]:
+    """Fetch several player rows with one ``IN`` query per ``SQL_BATCH_SIZE`` ids."""
+    ids = list(dict.fromkeys(player_ids))
+    rows: list[sqlite3.Row] = []
+    with read_connection() as conn:
+        for start in range(0, len(ids), SQL_BATCH_SIZE):
+            chunk = ids[start : start + SQL_BATCH_SIZE]
+            rows.extend(
+                conn.execute(
+                    f"""
+                    SELECT
+                        p.id,
+                        p.nickname,
+                        p.total_points,
+                        p.notes AS slogan,
+                        p.avatar_url,
+                        p.created_at,
+                        p.updated_at,
+                        p.finals_played
+                    FROM players p
+                    WHERE p.id IN ({', '.join('?' * len(chunk))});
+                    """,
+                    chunk,
+                )
+            )
+    return rows
+
+
+@_timed
+def get_recent_history(player_ids: Iterable[int], limit: int = 5) -> dict[int, list[sqlite3.Row]]:
+    """Return each player's ``limit`` newest score events, newest first.
+
+    One windowed query per ``SQL_BATCH_SIZE`` ids ranks every player's rows
+    by ``(created_at, id)`` and keeps the top ``limit`` of each.
+    """
+    ids = list(dict.fromkeys(player_ids))
+    history: dict[int, list[sqlite3.Row]] = {player_id: [] for player_id in ids}
+    if limit <= 0:
+        return history
+    with read_connection() as conn:
+        for start in range(0, len(ids), SQL_BATCH_SIZE):
+            chunk = ids[start : start + SQL_BATCH_SIZE]
+            rows = conn.execute(
+                f"""
+                SELECT player_id, id, delta, reason, created_at
+                FROM (
+                    SELECT
+                        player_id,
+                        id,
+                        delta,
+                        reason,
+                        created_at,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY player_id ORDER BY created_at DESC, id DESC
+                        ) AS position
+                    FROM score_history
+                    WHERE player_id IN ({', '.join('?' * len(chunk))})
+                )
+                WHERE position <= ?
+                ORDER BY player_id, position;
+                """,
+                (*chunk, limit),
+            )
+            for row in rows:
+                history[row["player_id"]].append(row)
+    return history
+
+
+EXPORT_PAGE_SIZE = 500
+
+
+def iter_leaderboard(page_size: int = EXPORT_PAGE_SIZE) -> Iterator[sqlite3.Row]:
+    """Yield every player in leaderboard order, one keyset page at a time.
+
+    Each page is a short query on a pooled connection, so a slow consumer
+    never pins a connection or holds a read lock. Pages are not a single
+    snapshot: a write between pages can move a player across the boundary.
+    """
+    after: Optional[tuple[int, str]] = None
+    while True:
+        rows = list_leaderboard(limit=page_size, after=after)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]["total_points"], rows[-1]["nickname"])
+
+
+def iter_player_history(player_id: int, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[sqlite3.Row]:
+    """Yield a player's whole score history, newest first, page by page."""
+    before: Optional[tuple[str, int]] = None
+    while True:
+        rows = get_player_history(player_id, limit=page_size, before=before)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        before = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+# record_game_results labels each placement "{game_label} – Rank {rank}"
+GAME_REASON_SEPARATOR = " – Rank "
+GAME_REASON_PATTERN = re.compile(r"^(?P<label>.*) – Rank (?P<rank>\d+)$", re.DOTALL)
+
+
+def parse_game_reason(reason: Optional[str]) -> Optional[tuple[str, int]]:
+    """Split a game placement reason into ``(game_label, rank)``."""
+    match = GAME_REASON_PATTERN.match(reason or "")
+    if match is None:
+        return None
+    return match.group("label"), int(match.group("rank"))
+
+
+@_timed
+def list_game_placements(after_id: int = 0, limit: int = EXPORT_PAGE_SIZE) -> list[sqlite3.Row]:
+    """Rows of game_placements with ``id > after_id``, oldest first, with their game's ``played_at``."""
+    with pooled_connection() as conn:
         cursor = conn.execute(
-            "INSERT INTO players (nickname, notes, avatar_url) VALUES (?, ?, ?);",
-            (nickname, slogan, avatar_url),
+            """
+            SELECT gp.id, gp.game_id, gp.player_id, gp.rank, gp.points, g.played_at
+            FROM game_placements gp
+            JOIN games g ON g.id = gp.game_id
+            WHERE gp.id > ?
+            ORDER BY gp.id
+            LIMIT ?;
+            """,
+            (after_id, limit),
         )
-        conn.commit()
-        return cursor.lastrowid
+        return cursor.fetchall()
 
 
-def record_score_change(player_id: int, delta: int, reason: str = "") -> None:
-    with connect() as conn:
-        conn.execute(
-            "INSERT INTO score_history (player_id, delta, reason) VALUES (?, ?, ?);",
-            (player_id, delta, reason),
+def iter_game_placements(after_id: int = 0, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[sqlite3.Row]:
+    """Yield every game placement after ``after_id`` in insertion order."""
+    while True:
+        rows = list_game_placements(after_id, limit=page_size)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after_id = rows[-1]["id"]
+
+
+@_timed
+def get_game(game_id: int) -> Optional[tuple[sqlite3.Row, list[sqlite3.Row]]]:
+    """Return ``(game, placements)`` with placements in finishing order."""
+    with read_connection() as conn:
+        game = conn.execute(
+            "SELECT id, label, played_at, entrants FROM games WHERE id = ?;", (game_id,)
+        ).fetchone()
+        if game is None:
+            return None
+        placements = conn.execute(
+            """
+            SELECT gp.rank, gp.player_id, p.nickname, gp.points
+            FROM game_placements gp
+            JOIN players p ON p.id = gp.player_id
+            WHERE gp.game_id = ?
+            ORDER BY gp.rank, gp.id;
+            """,
+            (game_id,),
+        ).fetchall()
+    return game, placements
+
+
+@_timed
+def list_games(
+    since: Optional[str] = None,
+    limit: int = 50,
+    after: Optional[tuple[str, int]] = None,
+    player_id: Optional[int] = None,
+) -> list[sqlite3.Row]:
+    """Games played at or after ``since``, oldest first, one keyset page at a time.
+
+    ``after`` is the ``(played_at, id)`` of the last game already shown. With
+    ``player_id`` only that player's games are listed, with their rank and
+    points.
+    """
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("g.played_at >= ?")
+        params.append(since)
+    if after is not None:
+        clauses.append("g.played_at >= ? AND (g.played_at > ? OR g.id > ?)")
+        params.extend((after[0], after[0], after[1]))
+    columns, source = "NULL AS rank, NULL AS points", "games g"
+    if player_id is not None:
+        columns, source = "gp.rank, gp.points", "game_placements gp JOIN games g ON g.id = gp.game_id"
+        clauses.append("gp.player_id = ?")
+        params.append(player_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with read_connection() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT
+                g.id,
+                g.label,
+                g.played_at,
+                g.entrants,
+                (
+                    SELECT p.nickname
+                    FROM game_placements w
+                    JOIN players p ON p.id = w.player_id
+                    WHERE w.game_id = g.id
+                    ORDER BY w.rank, w.id
+                    LIMIT 1
+                ) AS winner,
+                {columns}
+            FROM {source}
+            {where}
+            ORDER BY g.played_at, g.id
+            LIMIT ?;
+            """,
+            (*params, limit),
         )
-        conn.execute(
-            "UPDATE players SET total_points = total_points + ?, updated_at = datetime('now') WHERE id = ?;",
-            (delta, player_id),
+        return cursor.fetchall()
+
+
+def _group_game_rows(rows: Iterable[sqlite3.Row]) -> Iterator[tuple[str, str, list[tuple[int, int, int, int]]]]:
+    """Recover games from score_history rows written by ``record_game_results``.
+
+    Yields ``(label, played_at, [(player_id, rank, points, history_id)])``. A
+    submission's rows are consecutive and share their label and timestamp;
+    two submissions within the same second are told apart because a player
+    or a finishing position never repeats inside one game.
+    """
+    key: Optional[tuple[str, str]] = None
+    placements: list[tuple[int, int, int, int]] = []
+    for row in rows:
+        parsed = parse_game_reason(row["reason"])
+        if parsed is None:
+            continue
+        label, rank = parsed
+        row_key = (label, row["created_at"])
+        if placements and (
+            row_key != key
+            or any(player_id == row["player_id"] or seen_rank == rank for player_id, seen_rank, _, _ in placements)
+        ):
+            yield key[0], key[1], placements
+            placements = []
+        key = row_key
+        placements.append((row["player_id"], rank, row["delta"], row["id"]))
+    if placements:
+        yield key[0], key[1], placements
+
+
+def _backfill_games(conn: sqlite3.Connection) -> int:
+    conn.execute("DELETE FROM game_placements;")
+    conn.execute("DELETE FROM games;")
+    rows = conn.execute(
+        "SELECT id, player_id, delta, reason, created_at FROM score_history WHERE reason LIKE ? ORDER BY id;",
+        (f"%{GAME_REASON_SEPARATOR}%",),
+    ).fetchall()
+    games = 0
+    for label, played_at, placements in _group_game_rows(rows):
+        game_id = conn.execute(
+            "INSERT INTO games (label, played_at, entrants) VALUES (?, ?, ?);", (label, played_at, len(placements))
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO game_placements (game_id, player_id, rank, points, history_id) VALUES (?, ?, ?, ?, ?);",
+            [(game_id, *placement) for placement in placements],
         )
-        conn.commit()
+        games += 1
+    _note_all_players()
+    return games
+
+
+@_timed
+def backfill_games() -> int:
+    """Rebuild the games tables from score_history reasons; returns the number of games."""
+    return run_write(_backfill_games)
+
+
+@_timed
+def add_player(nickname: str, slogan: str = "", avatar_url: Optional[str] = None) -> int:
+    return run_write(_add_player, nickname, slogan, avatar_url)
+
+
+def _add_player(conn: sqlite3.Connection, nickname: str, slogan: str, avatar_url: Optional[str]) -> int:
+    cursor = conn.execute(
+        "INSERT INTO players (nickname, notes, avatar_url) VALUES (?, ?, ?);",
+        (nickname, slogan, avatar_url),
+    )
+    _note_players((cursor.lastrowid,))
+    return cursor.lastrowid
+
+
+@_timed
+def record_score_change(player_id: int, delta: int, reason: str = "") -> None:
+    run_write(_record_score_change, player_id, delta, reason)
+
 
+def _record_score_change(conn: sqlite3.Connection, player_id: int, delta: int, reason: str) -> None:
+    cursor = conn.execute(
+        "INSERT INTO score_history (player_id, delta, reason) VALUES (?, ?, ?);",
+        (player_id, delta, reason),
+    )
+    _accumulate_periods(conn, cursor.lastrowid - 1)
+    conn.execute(
+        "UPDATE players SET total_points = total_points + ?, finals_played = finals_played + 1, "
+        "updated_at = datetime('now') WHERE id = ?;",
+        (delta, player_id),
+    )
+    _note_players((player_id,))
 
+
+@_timed
 def get_player_by_nickname(nickname: str) -> Optional[sqlite3.Row]:
-    with connect() as conn:
+    with pooled_connection() as conn:
         row = conn.execute(
             "SELECT id, nickname, total_points, notes, created_at, updated_at FROM players WHERE nickname = ?;",
             (nickname,),
@@ -242,77 +1620,261 @@ def get_player_by_nickname(nickname: str) -> Optional[sqlite3.Row]:
         return row
 
 
+@_timed
+def list_player_scores(player_ids: Optional[Iterable[int]] = None) -> list[sqlite3.Row]:
+    """Return ``(id, nickname, total_points)`` for the given players, or for everyone."""
+    with pooled_connection() as conn:
+        if player_ids is None:
+            return conn.execute("SELECT id, nickname, total_points FROM players;").fetchall()
+        ids = list(player_ids)
+        rows: list[sqlite3.Row] = []
+        for start in range(0, len(ids), SQL_BATCH_SIZE):
+            chunk = ids[start : start + SQL_BATCH_SIZE]
+            rows.extend(
+                conn.execute(
+                    f"SELECT id, nickname, total_points FROM players WHERE id IN ({', '.join('?' * len(chunk))});",
+                    chunk,
+                )
+            )
+        return rows
+
+
+@_timed
 def record_game_results(
     placements: Iterable[dict[str, object]],
     *,
     rank_points: Optional[dict[int, int]] = None,
     game_label: str = "Game result",
-) -> dict[str, list[str]]:
+) -> dict[str, object]:
     """Apply a batch of ranking results and return summary log.
 
     Each placement item should include at minimum ``nickname`` and ``rank``.
-    Optionally it can specify ``points`` to override the default award and
-    ``slogan``/``avatar_url`` to build new player profiles on the fly.
+    Optionally it can specify ``points`` to override the default award,
+    ``played_at`` to date a result entered after the fact, and
+    ``slogan``/``avatar_url`` to build new player profiles on the fly. The
+    summary's ``game_ids`` lists every game written: one per distinct date.
     """
 
     points_map = rank_points or DEFAULT_RANK_POINTS
+    return run_write(_record_game_results, list(placements), points_map, game_label)
+
+
+def _record_game_results(
+    conn: sqlite3.Connection,
+    placements: list[dict[str, object]],
+    points_map: dict[int, int],
+    game_label: str,
+) -> dict[str, object]:
     applied, errors = [], []
+    entries: list[PlacementEntry] = []
+    for item in placements:
+        entry = validate_placement(item, points_map, game_label)
+        if isinstance(entry, str):
+            errors.append(entry)
+        else:
+            entries.append(entry)
 
-    with connect() as conn:
-        for item in placements:
-            nickname = (str(item.get("nickname")) if item.get("nickname") is not None else "").strip()
-            if not nickname:
-                errors.append("Missing nickname in placement entry")
-                continue
+    game_ids: list[int] = []
+    if entries:
+        # placements dated differently are recorded as one game per date
+        applied, game_ids = _apply_placements(conn, entries)
 
-            try:
-                rank = int(item.get("rank"))
-            except (TypeError, ValueError):
-                errors.append(f"Invalid rank for {nickname}")
-                continue
+    return {"applied": applied, "errors": errors, "game_ids": game_ids}
 
-            try:
-                delta = int(item.get("points")) if item.get("points") is not None else points_map[rank]
-            except (KeyError, TypeError, ValueError):
-                errors.append(f"No point mapping for rank {rank} ({nickname})")
-                continue
 
-            row = conn.execute(
-                "SELECT id FROM players WHERE nickname = ?;",
-                (nickname,),
-            ).fetchone()
-            if row:
-                player_id = row["id"]
-            else:
-                cursor = conn.execute(
-                    "INSERT INTO players (nickname, notes, avatar_url) VALUES (?, ?, ?);",
-                    (
-                        nickname,
-                        str(item.get("slogan") or item.get("notes") or "").strip(),
-                        item.get("avatar_url"),
-                    ),
-                )
-                player_id = cursor.lastrowid
+def _apply_placements(
+    conn: sqlite3.Connection, entries: list["PlacementEntry"], source: Optional[str] = None
+) -> tuple[list[str], list[int]]:
+    """Write placements to score_history, games and the aggregates.
 
-            reason = item.get("reason")
-            if not reason:
-                reason = f"{game_label} – Rank {rank}"
+    Returns the applied summaries and the ids of the games written to. With
+    a ``source`` (an import), placements join the game already recorded for
+    that source, label and date, so a game split across import chunks stays
+    whole.
+    """
+    player_ids = _resolve_players(conn, entries)
+    high_water = _history_high_water(conn)
+    conn.executemany(
+        "INSERT INTO score_history (player_id, delta, reason, created_at) "
+        "VALUES (?, ?, ?, COALESCE(?, datetime('now')));",
+        [(player_ids[entry.nickname], entry.delta, entry.reason, entry.played_at) for entry in entries],
+    )
+    # writes are serialised (BEGIN IMMEDIATE, or the single WAL writer), so every
+    # id above the high-water mark is one of ours, in insertion order
+    history_ids = [
+        row["id"] for row in conn.execute("SELECT id FROM score_history WHERE id > ? ORDER BY id;", (high_water,))
+    ]
+    game_ids = _record_games(conn, entries, [player_ids[entry.nickname] for entry in entries], history_ids, source)
+    _accumulate_periods(conn, high_water)
+    totals: dict[int, list[int]] = {}
+    for entry in entries:
+        total = totals.setdefault(player_ids[entry.nickname], [0, 0])
+        total[0] += entry.delta
+        total[1] += 1
+    _apply_player_totals(conn, [(player_id, delta, count) for player_id, (delta, count) in totals.items()])
+    _note_players(totals)
+    return [f"{entry.nickname} (+{entry.delta})" for entry in entries], game_ids
 
-            conn.execute(
-                "INSERT INTO score_history (player_id, delta, reason) VALUES (?, ?, ?);",
-                (player_id, delta, reason),
-            )
-            conn.execute(
-                "UPDATE players SET total_points = total_points + ?, updated_at = datetime('now') WHERE id = ?;",
-                (delta, player_id),
-            )
-            applied.append(f"{nickname} (+{delta})")
 
-        conn.commit()
+def _record_games(
+    conn: sqlite3.Connection,
+    entries: list["PlacementEntry"],
+    player_ids: list[int],
+    history_ids: list[int],
+    source: Optional[str],
+) -> list[int]:
+    games: dict[tuple[str, Optional[str]], int] = {}
+    placements = []
+    for entry, player_id, history_id in zip(entries, player_ids, history_ids):
+        game_id = games.get((entry.game, entry.played_at))
+        if game_id is None:
+            game_id = games[entry.game, entry.played_at] = _game_for(conn, entry.game, entry.played_at, source)
+        placements.append((game_id, player_id, entry.rank, entry.delta, history_id))
+    conn.executemany(
+        "INSERT INTO game_placements (game_id, player_id, rank, points, history_id) VALUES (?, ?, ?, ?, ?);",
+        placements,
+    )
+    entrants: dict[int, int] = {}
+    for placement in placements:
+        entrants[placement[0]] = entrants.get(placement[0], 0) + 1
+    conn.executemany(
+        "UPDATE games SET entrants = entrants + ? WHERE id = ?;", [(count, game) for game, count in entrants.items()]
+    )
+    return list(games.values())
+
+
+def _game_for(conn: sqlite3.Connection, label: str, played_at: Optional[str], source: Optional[str]) -> int:
+    if source is not None:
+        # a dated label ("Weekly final", 2026-03-04) names one game; an undated one spans the whole source
+        row = conn.execute(
+            "SELECT id FROM games WHERE source = ? AND label = ? AND (? IS NULL OR played_at = ?);",
+            (source, label, played_at, played_at),
+        ).fetchone()
+        if row is not None:
+            return row["id"]
+    return conn.execute(
+        "INSERT INTO games (label, source, played_at) VALUES (?, ?, COALESCE(?, datetime('now')));",
+        (label, source, played_at),
+    ).lastrowid
+
+
+class PlacementEntry(NamedTuple):
+    nickname: str
+    rank: int
+    delta: int
+    reason: str
+    slogan: str
+    avatar_url: Optional[str]
+    game: str
+    # "YYYY-MM-DD HH:MM:SS" UTC, or None for "now"
+    played_at: Optional[str] = None
+
 
-    return {"applied": applied, "errors": errors}
+def parse_played_at(value: object) -> str:
+    """Normalise an ISO date or datetime to SQLite's UTC ``YYYY-MM-DD HH:MM:SS`` text.
 
+    Naive values are taken as UTC, like the timestamps SQLite writes itself.
+    Raises ValueError for anything else.
+    """
+    moment = datetime.fromisoformat(str(value).strip())
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def validate_placement(
+    item: dict[str, object],
+    points_map: dict[int, int],
+    game_label: str,
+) -> Union[PlacementEntry, str]:
+    """Normalise one placement, or return the error message explaining why not."""
+    nickname = (str(item.get("nickname")) if item.get("nickname") is not None else "").strip()
+    if not nickname:
+        return "Missing nickname in placement entry"
+
+    try:
+        rank = int(item.get("rank"))
+    except (TypeError, ValueError):
+        return f"Invalid rank for {nickname}"
+
+    try:
+        delta = int(item.get("points")) if item.get("points") is not None else points_map[rank]
+    except (KeyError, TypeError, ValueError):
+        return f"No point mapping for rank {rank} ({nickname})"
+
+    reason = item.get("reason")
+    if not reason:
+        reason = f"{game_label}{GAME_REASON_SEPARATOR}{rank}"
+
+    played_at = item.get("played_at") or item.get("date")
+    if played_at is not None:
+        try:
+            played_at = parse_played_at(played_at)
+        except ValueError:
+            return f"Invalid date {played_at!r} for {nickname}"
 
+    return PlacementEntry(
+        nickname=nickname,
+        rank=rank,
+        delta=delta,
+        reason=str(reason),
+        slogan=str(item.get("slogan") or item.get("notes") or "").strip(),
+        avatar_url=item.get("avatar_url"),
+        game=game_label,
+        played_at=played_at,
+    )
+
+
+def _lookup_player_ids(conn: sqlite3.Connection, nicknames: list[str]) -> dict[str, int]:
+    found: dict[str, int] = {}
+    for start in range(0, len(nicknames), SQL_BATCH_SIZE):
+        chunk = nicknames[start : start + SQL_BATCH_SIZE]
+        rows = conn.execute(
+            f"SELECT id, nickname FROM players WHERE nickname IN ({', '.join('?' * len(chunk))});",
+            chunk,
+        )
+        found.update((row["nickname"], row["id"]) for row in rows)
+    return found
+
+
+def _resolve_players(conn: sqlite3.Connection, entries: list[PlacementEntry]) -> dict[str, int]:
+    """Map every nickname to a player id, creating missing players in bulk."""
+    nicknames = list(dict.fromkeys(entry.nickname for entry in entries))
+    player_ids = _lookup_player_ids(conn, nicknames)
+
+    missing: dict[str, PlacementEntry] = {}
+    for entry in entries:
+        if entry.nickname not in player_ids:
+            missing.setdefault(entry.nickname, entry)
+    if missing:
+        conn.executemany(
+            "INSERT INTO players (nickname, notes, avatar_url) VALUES (?, ?, ?);",
+            [(entry.nickname, entry.slogan, entry.avatar_url) for entry in missing.values()],
+        )
+        player_ids.update(_lookup_player_ids(conn, list(missing)))
+    return player_ids
+
+
+def _apply_player_totals(conn: sqlite3.Connection, totals: list[tuple[int, int, int]]) -> None:
+    """Add ``(player_id, points, finals)`` deltas with one UPDATE ... FROM per chunk."""
+    rows_per_chunk = SQL_BATCH_SIZE // 3
+    for start in range(0, len(totals), rows_per_chunk):
+        chunk = totals[start : start + rows_per_chunk]
+        conn.execute(
+            f"""
+            WITH totals (player_id, delta, finals) AS (VALUES {', '.join(['(?, ?, ?)'] * len(chunk))})
+            UPDATE players
+            SET total_points = players.total_points + totals.delta,
+                finals_played = players.finals_played + totals.finals,
+                updated_at = datetime('now')
+            FROM totals
+            WHERE players.id = totals.player_id;
+            """,
+            [value for row in chunk for value in row],
+        )
+
+
+@_timed
 def update_player_profile(
     player_id: int,
     *,
@@ -342,12 +1904,336 @@ def update_player_profile(
         return False
 
     values.append(player_id)
+    run_write(_update_player_profile, fields, values)
+    return True
 
-    with connect() as conn:
-        conn.execute(
-            f"UPDATE players SET {', '.join(fields)}, updated_at = datetime('now') WHERE id = ?;",
-            tuple(values),
-        )
-        conn.commit()
 
-    return True
+def _update_player_profile(conn: sqlite3.Connection, fields: list[str], values: list[object]) -> None:
+    conn.execute(
+        f"UPDATE players SET {', '.join(fields)}, updated_at = datetime('now') WHERE id = ?;",
+        tuple(values),
+    )
+    _note_players((values[-1],))
+
+
+# stored results of writes submitted with an Idempotency-Key
+IDEMPOTENCY_TTL = 24 * 3600.0
+IDEMPOTENCY_CACHE_SIZE = 1024
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was reused for a different request."""
+
+
+class IdempotentOutcome(NamedTuple):
+    result: object
+    # True when ``result`` is the stored outcome of an earlier request
+    replayed: bool
+
+
+class _KeyClaimed(Exception):
+    """Another transaction stored the key between our lookup and insert."""
+
+
+# key -> (fingerprint, result, stored at); the newest keys, in LRU order
+_recent_outcomes: OrderedDict[str, tuple[str, object, float]] = OrderedDict()
+_recent_outcomes_lock = threading.Lock()
+
+
+def record_score_change_once(
+    key: str, fingerprint: str, player_id: int, delta: int, reason: str = ""
+) -> IdempotentOutcome:
+    """``record_score_change`` that applies at most once per idempotency key."""
+    return run_once(key, fingerprint, _record_score_change, player_id, delta, reason)
+
+
+def record_game_results_once(
+    key: str,
+    fingerprint: str,
+    placements: Iterable[dict[str, object]],
+    *,
+    rank_points: Optional[dict[int, int]] = None,
+    game_label: str = "Game result",
+) -> IdempotentOutcome:
+    """``record_game_results`` that applies at most once per idempotency key."""
+    points_map = rank_points or DEFAULT_RANK_POINTS
+    return run_once(key, fingerprint, _record_game_results, list(placements), points_map, game_label)
+
+
+@_timed
+def run_once(key: str, fingerprint: str, fn: Callable[..., object], *args: object) -> IdempotentOutcome:
+    """Run the write ``fn(conn, *args)`` unless ``key`` already has a stored result.
+
+    ``fingerprint`` identifies the request the key was first used for; a
+    repeat with another fingerprint raises ``IdempotencyConflict``. The key
+    and the result are committed in the same transaction as the write.
+    Recently used keys are answered from memory and older ones from a read
+    connection, so a replay never takes the write lock or moves
+    ``data_version()``; only a new key goes through ``run_write``.
+    """
+    outcome = _recent_outcome(key, fingerprint) or _stored_outcome(key, fingerprint)
+    if outcome is None:
+        try:
+            outcome = run_write(_run_once, key, fingerprint, fn, args)
+        except _KeyClaimed:
+            # a concurrent request with the same key committed first
+            outcome = _stored_outcome(key, fingerprint)
+            if outcome is None:
+                raise RuntimeError(f"Idempotency key {key!r} vanished while being claimed")
+    _remember_outcome(key, fingerprint, outcome.result)
+    return outcome
+
+
+def _run_once(
+    conn: sqlite3.Connection, key: str, fingerprint: str, fn: Callable[..., object], args: tuple
+) -> IdempotentOutcome:
+    try:
+        # claim the key first: a concurrent request with the same key blocks
+        # here until we commit, then rolls back and replays our result
+        conn.execute("INSERT INTO idempotency_keys (key, fingerprint) VALUES (?, ?);", (key, fingerprint))
+    except sqlite3.IntegrityError as exc:
+        raise _KeyClaimed(key) from exc
+    result = fn(conn, *args)
+    conn.execute("UPDATE idempotency_keys SET result = ? WHERE key = ?;", (json.dumps(result), key))
+    return IdempotentOutcome(result, False)
+
+
+def _replay(row: sqlite3.Row, fingerprint: str) -> IdempotentOutcome:
+    if row["fingerprint"] != fingerprint:
+        raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+    return IdempotentOutcome(json.loads(row["result"]), True)
+
+
+def _stored_outcome(key: str, fingerprint: str) -> Optional[IdempotentOutcome]:
+    with pooled_connection() as conn:
+        row = conn.execute("SELECT fingerprint, result FROM idempotency_keys WHERE key = ?;", (key,)).fetchone()
+    return None if row is None else _replay(row, fingerprint)
+
+
+def _recent_outcome(key: str, fingerprint: str) -> Optional[IdempotentOutcome]:
+    with _recent_outcomes_lock:
+        entry = _recent_outcomes.get(key)
+        if entry is None:
+            return None
+        stored_fingerprint, result, stored_at = entry
+        if time.time() - stored_at > IDEMPOTENCY_TTL:
+            del _recent_outcomes[key]
+            return None
+        _recent_outcomes.move_to_end(key)
+    if stored_fingerprint != fingerprint:
+        raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+    return IdempotentOutcome(result, True)
+
+
+def _remember_outcome(key: str, fingerprint: str, result: object) -> None:
+    with _recent_outcomes_lock:
+        if key not in _recent_outcomes:
+            _recent_outcomes[key] = (fingerprint, result, time.time())
+        _recent_outcomes.move_to_end(key)
+        while len(_recent_outcomes) > IDEMPOTENCY_CACHE_SIZE:
+            _recent_outcomes.popitem(last=False)
+
+
+@_timed
+def purge_idempotency_keys(max_age: float = IDEMPOTENCY_TTL) -> int:
+    """Forget idempotency keys older than ``max_age`` seconds; returns how many."""
+    with _recent_outcomes_lock:
+        cutoff = time.time() - max_age
+        for key in [key for key, (_, _, stored_at) in _recent_outcomes.items() if stored_at < cutoff]:
+            del _recent_outcomes[key]
+    return run_write(_purge_idempotency_keys, max_age)
+
+
+def _purge_idempotency_keys(conn: sqlite3.Connection, max_age: float) -> int:
+    cursor = conn.execute(
+        "DELETE FROM idempotency_keys WHERE created_at < datetime('now', ?);",
+        (f"-{int(max_age)} seconds",),
+    )
+    return cursor.rowcount
+
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 500
+
+
+def iter_import_rows(path: Path, fmt: Optional[str] = None) -> Iterator[dict[str, object]]:
+    """Yield placement rows from a CSV (with header) or JSONL file one at a time."""
+    fmt = fmt or ("jsonl" if path.suffix.lower() in {".jsonl", ".ndjson"} else "csv")
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format {fmt!r}; expected one of {', '.join(IMPORT_FORMATS)}")
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            # blank cells mean "not provided", matching absent keys in JSON payloads
+            for row in csv.DictReader(handle):
+                yield {key: value for key, value in row.items() if value not in ("", None)}
+            return
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                row = {"__error__": f"Invalid JSON: {exc.msg}"}
+            yield row if isinstance(row, dict) else {"__error__": "Expected a JSON object"}
+
+
+@_timed
+def get_import_checkpoint(source: str) -> int:
+    with pooled_connection() as conn:
+        row = conn.execute("SELECT rows_done FROM import_checkpoints WHERE source = ?;", (source,)).fetchone()
+    return row["rows_done"] if row else 0
+
+
+def _commit_import_chunk(
+    conn: sqlite3.Connection, entries: list[PlacementEntry], source: str, rows_done: int
+) -> int:
+    if entries:
+        _apply_placements(conn, entries, source)
+    # the checkpoint moves in the same transaction as the rows it covers
+    conn.execute(
+        """
+        INSERT INTO import_checkpoints (source, rows_done) VALUES (?, ?)
+        ON CONFLICT(source) DO UPDATE SET rows_done = excluded.rows_done, updated_at = datetime('now');
+        """,
+        (source, rows_done),
+    )
+    return len(entries)
+
+
+def import_results(
+    path: Path,
+    *,
+    fmt: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    source: Optional[str] = None,
+    rank_points: Optional[dict[int, int]] = None,
+    on_error: Optional[Callable[[int, str], None]] = None,
+    on_progress: Optional[Callable[[dict[str, float]], None]] = None,
+) -> dict[str, float]:
+    """Stream game results from ``path`` into the database in chunks.
+
+    Each row is one placement with the columns accepted by
+    ``record_game_results`` plus optional ``game``/``label`` and
+    ``played_at``/``date`` columns. A dated row is written with that date, so
+    its points land in the right period and the game sorts where it was
+    played; undated rows are stamped with the time of the import. Rows
+    are validated with ``validate_placement``; invalid rows are reported via
+    ``on_error(row_number, message)`` and skipped. Every ``chunk_size`` rows
+    are committed together with a checkpoint keyed on ``source``, so re-running
+    the same import resumes after the last committed chunk. Only one chunk is
+    held in memory at a time.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    points_map = rank_points or DEFAULT_RANK_POINTS
+    source = source or str(path.resolve())
+    resume_from = get_import_checkpoint(source)
+    stats = {"rows": 0, "skipped": resume_from, "applied": 0, "errors": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+    started = time.perf_counter()
+
+    def flush(entries: list[PlacementEntry], rows_done: int) -> None:
+        stats["applied"] += run_write(_commit_import_chunk, entries, source, rows_done)
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        if on_progress is not None:
+            on_progress(dict(stats))
+
+    pending: list[PlacementEntry] = []
+    row_number = 0
+    for row_number, row in enumerate(iter_import_rows(path, fmt), start=1):
+        if row_number <= resume_from:
+            continue
+        stats["rows"] += 1
+        if "__error__" in row:
+            entry: Union[PlacementEntry, str] = str(row["__error__"])
+        else:
+            label = str(row.get("game") or row.get("label") or "").strip() or "Game result"
+            entry = validate_placement(row, points_map, label)
+        if isinstance(entry, str):
+            stats["errors"] += 1
+            if on_error is not None:
+                on_error(row_number, entry)
+        else:
+            pending.append(entry)
+        if row_number % chunk_size == 0:
+            flush(pending, row_number)
+            pending = []
+
+    if row_number > resume_from and (pending or row_number % chunk_size):
+        flush(pending, row_number)
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def chunk_size_arg(value: str) -> int:
+        try:
+            size = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{value!r} is not a whole number") from None
+        if size < 1:
+            raise argparse.ArgumentTypeError("must be at least 1")
+        return size
+
+    parser = argparse.ArgumentParser(description="Leaderboard database maintenance")
+    parser.add_argument("--db", type=Path, default=None, help="Database file (defaults to backend/club.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init", help="Create tables and apply schema migrations")
+    commands.add_parser("backfill-finals", help="Recompute finals_played counters from score_history")
+    commands.add_parser("check-finals", help="Report players whose finals_played counter is out of sync")
+    commands.add_parser("rebuild-periods", help="Recompute the period leaderboard summaries from score_history")
+    commands.add_parser("backfill-games", help="Rebuild games and game_placements from score_history reasons")
+    import_parser = commands.add_parser("import", help="Stream historical game results from CSV or JSONL")
+    import_parser.add_argument(
+        "path", type=Path, help="CSV file with a header row, or JSONL with one placement per line"
+    )
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Defaults to the file extension")
+    import_parser.add_argument("--chunk-size", type=chunk_size_arg, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+    import_parser.add_argument("--source", default=None, help="Checkpoint key (defaults to the file path)")
+    import_parser.add_argument(
+        "--storage", choices=STORAGE_MODES, default="rollback", help="Storage mode used for the import"
+    )
+    args = parser.parse_args()
+
+    if args.db is not None:
+        DB_PATH = args.db
+    initialize_database()
+
+    if args.command == "backfill-finals":
+        print(f"Recomputed finals_played for {backfill_finals_played()} players")
+    elif args.command == "rebuild-periods":
+        rebuild_period_totals()
+        print("Rebuilt period leaderboards")
+    elif args.command == "backfill-games":
+        print(f"Rebuilt {backfill_games()} games from score_history")
+    elif args.command == "import":
+        configure_storage(args.storage)
+        result = import_results(
+            args.path,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            source=args.source,
+            on_error=lambda line, message: print(f"row {line}: {message}", file=sys.stderr),
+            on_progress=lambda progress: print(
+                f"{int(progress['rows'])} rows, {progress['rows_per_sec']:.0f} rows/sec", file=sys.stderr
+            ),
+        )
+        stop_writer()
+        print(
+            f"Imported {int(result['applied'])} placements from {int(result['rows'])} rows "
+            f"({int(result['errors'])} invalid, {int(result['skipped'])} already imported) "
+            f"in {result['seconds']:.2f}s, {result['rows_per_sec']:.0f} rows/sec"
+        )
+    elif args.command == "check-finals":
+        mismatches = check_finals_played()
+        for item in mismatches:
+            print(f"player {item['player_id']}: stored {item['stored']}, actual {item['actual']}")
+        print(f"{len(mismatches)} inconsistent players")
+        close_pool()
+        sys.exit(1 if mismatches else 0)
+    close_pool()
@@ -0,0 +1,241 @@
+"""Broadcast hub that pushes leaderboard diffs to Server-Sent Events clients."""
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+from typing import AsyncGenerator, Optional
+
+from db import add_commit_listener, data_version, list_leaderboard, remove_commit_listener
+
+# how many leaderboard rows the live stream tracks
+STREAM_DEPTH = 200
+CLIENT_QUEUE_SIZE = 32
+MAX_SUBSCRIBERS = 1000
+HEARTBEAT_SECONDS = 15.0
+# how often a streaming thread checks whether an idle client has hung up
+DISCONNECT_CHECK_SECONDS = 1.0
+
+
+class Subscription:
+    """One client's bounded mailbox of pre-encoded SSE frames.
+
+    A thread reads it with ``next_frame``; an event loop task reads it with
+    ``next_frame_async``, which is woken through the loop rather than by
+    blocking a thread.
+    """
+
+    def __init__(self, max_pending: int = CLIENT_QUEUE_SIZE) -> None:
+        self._frames: queue.Queue[Optional[bytes]] = queue.Queue(maxsize=max_pending)
+        self._waker: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+        self.closed = False
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame; returns False if the client is too far behind."""
+        if self.closed:
+            return False
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            return False
+        self._wake()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        # make room for the wake-up marker so a blocked reader notices promptly
+        while True:
+            try:
+                self._frames.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+        self._wake()
+
+    def _wake(self) -> None:
+        waker = self._waker
+        if waker is None:
+            return
+        loop, event = waker
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # the loop has already shut down
+            pass
+
+    async def next_frame_async(self, timeout: float) -> Optional[bytes]:
+        """Awaitable ``next_frame`` for a reader on an event loop."""
+        if self._waker is None:
+            self._waker = (asyncio.get_running_loop(), asyncio.Event())
+        event = self._waker[1]
+        while True:
+            if self.closed and self._frames.empty():
+                return None
+            try:
+                return self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            event.clear()
+            # a frame offered between the get and the clear would not wake us
+            if not self._frames.empty():
+                continue
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return b""
+
+    def next_frame(self, timeout: float) -> Optional[bytes]:
+        """Return the next frame, ``b""`` on timeout, or None once closed."""
+        if self.closed and self._frames.empty():
+            return None
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return b""
+
+
+def sse_frame(event: str, data: object, event_id: Optional[int] = None) -> bytes:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+def leaderboard_state(rows: list) -> dict[int, dict[str, object]]:
+    return {
+        row["id"]: {
+            "id": row["id"],
+            "rank": rank,
+            "nickname": row["nickname"],
+            "total_points": row["total_points"],
+            "finals_played": row["finals_played"],
+        }
+        for rank, row in enumerate(rows, start=1)
+    }
+
+
+class LeaderboardHub:
+    """Turns database commits into rank/score diff events for all subscribers.
+
+    Commits only set a flag; a single publisher thread re-reads the top of the
+    leaderboard once per burst of writes, diffs it against the last snapshot
+    and fans the encoded frame out to every subscriber. A subscriber whose
+    queue is full is evicted rather than allowed to hold memory or slow the
+    others down; its client reconnects and receives a fresh snapshot.
+    """
+
+    def __init__(self, depth: int = STREAM_DEPTH, max_subscribers: int = MAX_SUBSCRIBERS) -> None:
+        self.depth = depth
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._state: dict[int, dict[str, object]] = {}
+        self._version = 0
+        self.evicted = 0
+
+    def start(self) -> None:
+        self._stopping = False
+        self._state = leaderboard_state(list_leaderboard(limit=self.depth))
+        self._version = data_version()
+        add_commit_listener(self._on_commit)
+        self._thread = threading.Thread(target=self._publish_loop, name="leaderboard-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        remove_commit_listener(self._on_commit)
+        self._stopping = True
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscription in subscribers:
+            subscription.close()
+
+    def subscribe(self) -> Optional[Subscription]:
+        """Register a client and queue its initial snapshot; None when full."""
+        subscription = Subscription()
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            snapshot = sorted(self._state.values(), key=lambda entry: entry["rank"])
+            subscription.offer(sse_frame("snapshot", {"players": snapshot}, self._version))
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    async def stream(self, subscription: Subscription, heartbeat: float = HEARTBEAT_SECONDS) -> AsyncGenerator[bytes, None]:
+        """Yield ``subscription``'s frames from an event loop until it closes.
+
+        Idle periods yield an SSE comment line that doubles as a keep-alive
+        probe. The subscription is released however the stream ends.
+        """
+        try:
+            while True:
+                frame = await subscription.next_frame_async(heartbeat)
+                if frame is None:
+                    return
+                yield frame or b": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _on_commit(self, version: int, player_ids: Optional[frozenset[int]]) -> None:
+        if player_ids is None or player_ids:
+            self._dirty.set()
+
+    def _publish_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            if self._stopping:
+                return
+            self._dirty.clear()
+            version = data_version()
+            try:
+                state = leaderboard_state(list_leaderboard(limit=self.depth))
+            except sqlite3.Error:
+                # keep the old snapshot; the next commit triggers another attempt
+                continue
+            changed = [entry for player_id, entry in state.items() if self._state.get(player_id) != entry]
+            removed = [player_id for player_id in self._state if player_id not in state]
+            frame = None
+            if changed or removed:
+                frame = sse_frame(
+                    "diff",
+                    {"changed": sorted(changed, key=lambda entry: entry["rank"]), "removed": removed},
+                    version,
+                )
+            self._publish(frame, state, version)
+
+    def _publish(self, frame: Optional[bytes], state: dict[int, dict[str, object]], version: int) -> None:
+        # fan out and swap the snapshot under one lock so a client subscribing
+        # concurrently sees either the old snapshot plus this diff or the new one
+        evicted = []
+        with self._lock:
+            if frame is not None:
+                for subscription in self._subscribers:
+                    if not subscription.offer(frame):
+                        evicted.append(subscription)
+                self._subscribers.difference_update(evicted)
+            self._state = state
+            self._version = version
+        self.evicted += len(evicted)
+        for subscription in evicted:
+            subscription.close()
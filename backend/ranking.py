@@ -0,0 +1,200 @@
+"""In-memory order-statistics index answering rank and neighbourhood queries."""
+from __future__ import annotations
+
+import random
+import threading
+from typing import Iterator, Optional
+
+from db import add_commit_listener, list_player_scores, remove_commit_listener
+
+MAX_LEVEL = 24
+
+# leaderboard order: points descending, then nickname ascending
+RankKey = tuple[int, str, int]
+
+
+def rank_key(player_id: int, nickname: str, total_points: int) -> RankKey:
+    return (-total_points, nickname, player_id)
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[RankKey], level: int) -> None:
+        self.key = key
+        self.next: list[Optional[_Node]] = [None] * level
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """Sorted collection with O(log n) insert, remove, rank and index lookups.
+
+    Each forward link records how many bottom-level nodes it skips, so the
+    position of a key is the sum of the widths crossed while searching for it.
+    """
+
+    def __init__(self) -> None:
+        self._head = _Node(None, MAX_LEVEL)
+        self._head.width = [1] * MAX_LEVEL
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: RankKey) -> None:
+        level = 1
+        while level < MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        self._level = max(self._level, level)
+
+        update: list[_Node] = [self._head] * MAX_LEVEL
+        positions = [0] * MAX_LEVEL
+        node, position = self._head, 0
+        for depth in range(self._level - 1, -1, -1):
+            while node.next[depth] is not None and node.next[depth].key < key:
+                position += node.width[depth]
+                node = node.next[depth]
+            update[depth], positions[depth] = node, position
+
+        new = _Node(key, level)
+        for depth in range(self._level):
+            previous = update[depth]
+            if depth < level:
+                skipped = position - positions[depth]
+                new.next[depth] = previous.next[depth]
+                new.width[depth] = previous.width[depth] - skipped
+                previous.next[depth] = new
+                previous.width[depth] = skipped + 1
+            else:
+                previous.width[depth] += 1
+        self._size += 1
+
+    def remove(self, key: RankKey) -> bool:
+        update: list[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for depth in range(self._level - 1, -1, -1):
+            while node.next[depth] is not None and node.next[depth].key < key:
+                node = node.next[depth]
+            update[depth] = node
+        target = node.next[0]
+        if target is None or target.key != key:
+            return False
+        for depth in range(self._level):
+            previous = update[depth]
+            if previous.next[depth] is target:
+                previous.width[depth] += target.width[depth] - 1
+                previous.next[depth] = target.next[depth]
+            else:
+                previous.width[depth] -= 1
+        self._size -= 1
+        return True
+
+    def index(self, key: RankKey) -> Optional[int]:
+        """Zero-based position of ``key``, or None if absent."""
+        node, position = self._head, 0
+        for depth in range(self._level - 1, -1, -1):
+            while node.next[depth] is not None and node.next[depth].key <= key:
+                position += node.width[depth]
+                node = node.next[depth]
+        if node is self._head or node.key != key:
+            return None
+        return position - 1
+
+    def slice(self, start: int, stop: int) -> Iterator[RankKey]:
+        """Yield keys at positions ``start`` up to (not including) ``stop``."""
+        start = max(start, 0)
+        if start >= min(stop, self._size):
+            return
+        node, position = self._head, -1
+        for depth in range(self._level - 1, -1, -1):
+            while node.next[depth] is not None and position + node.width[depth] <= start:
+                position += node.width[depth]
+                node = node.next[depth]
+        while node is not None and position < stop:
+            yield node.key
+            node = node.next[0]
+            position += 1
+
+
+class RankIndex:
+    """Leaderboard positions kept in step with ``players.total_points``.
+
+    Built once from the players table, then refreshed from commit
+    notifications: the commit hook only records which players changed, and
+    the next query re-reads just those rows before answering.
+    """
+
+    def __init__(self) -> None:
+        self._ranks = IndexableSkipList()
+        self._keys: dict[int, RankKey] = {}
+        self._lock = threading.Lock()
+        # serialises read-then-apply so an older row never overwrites a newer one
+        self._refresh_lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._reload = True
+
+    def start(self) -> None:
+        add_commit_listener(self._on_commit)
+        self._reload = True
+        self._refresh()
+
+    def stop(self) -> None:
+        remove_commit_listener(self._on_commit)
+
+    def rank(self, player_id: int) -> Optional[int]:
+        """One-based leaderboard position of a player."""
+        self._refresh()
+        with self._lock:
+            key = self._keys.get(player_id)
+            if key is None:
+                return None
+            position = self._ranks.index(key)
+        return None if position is None else position + 1
+
+    def neighbours(self, player_id: int, k: int) -> list[dict[str, object]]:
+        """The ``k`` players either side of ``player_id`` (and the player itself)."""
+        self._refresh()
+        with self._lock:
+            key = self._keys.get(player_id)
+            position = self._ranks.index(key) if key is not None else None
+            if position is None:
+                return []
+            first = max(position - k, 0)
+            return [
+                {"id": key[2], "nickname": key[1], "total_points": -key[0], "rank": rank}
+                for rank, key in enumerate(self._ranks.slice(first, position + k + 1), start=first + 1)
+            ]
+
+    def _on_commit(self, version: int, player_ids: Optional[frozenset[int]]) -> None:
+        with self._lock:
+            if player_ids is None:
+                self._reload = True
+            else:
+                self._pending |= player_ids
+
+    def _refresh(self) -> None:
+        if not self._reload and not self._pending:
+            return
+        with self._refresh_lock:
+            with self._lock:
+                reload, pending = self._reload, self._pending
+                self._reload, self._pending = False, set()
+            if not reload and not pending:
+                return
+
+            rows = list_player_scores(None if reload else pending)
+            with self._lock:
+                if reload:
+                    self._ranks = IndexableSkipList()
+                    self._keys = {}
+                else:
+                    # players that no longer exist simply drop out
+                    for player_id in pending:
+                        old = self._keys.pop(player_id, None)
+                        if old is not None:
+                            self._ranks.remove(old)
+                for row in rows:
+                    key = rank_key(row["id"], row["nickname"], row["total_points"])
+                    self._keys[row["id"]] = key
+                    self._ranks.insert(key)
@@ -0,0 +1,151 @@
+"""Token buckets keyed by client, with bounded memory, and request admission control."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TokenBucket:
+    """Holds up to ``capacity`` tokens, refilled at ``rate`` tokens per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens; returns 0 on success or seconds until they are available."""
+        self._refill(now)
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return self.wait_time(cost)
+
+    def peek(self, now: float, cost: float = 1.0) -> float:
+        """Like ``take`` but never spends tokens."""
+        self._refill(now)
+        return 0.0 if self.tokens >= cost else self.wait_time(cost)
+
+    def wait_time(self, cost: float) -> float:
+        return (cost - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class BucketTable:
+    """Per-key token buckets that never hold more than ``max_keys`` entries.
+
+    Buckets are kept in least-recently-used order. When the table is full the
+    stalest bucket is dropped; a key seen again later simply starts with a
+    full bucket, which is the state an idle bucket would have refilled to.
+    """
+
+    def __init__(self, capacity: float, rate: float, max_keys: int = 4096) -> None:
+        # a zero rate would never refill, leaving no finite Retry-After to send
+        if capacity <= 0 or rate <= 0:
+            raise ValueError(f"bucket capacity and rate must be positive, got ({capacity}, {rate})")
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: Hashable, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens from ``key``'s bucket; see ``TokenBucket.take``."""
+        now = time.monotonic()
+        with self._lock:
+            return self._bucket(key, now).take(now, cost)
+
+    def peek(self, key: Hashable, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return 0.0 if bucket is None else bucket.peek(now, cost)
+
+    def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+    def _bucket(self, key: Hashable, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+        bucket = self._buckets[key] = TokenBucket(self.capacity, self.rate, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return bucket
+
+
+class AdmissionController:
+    """Rate limits per client and per route, plus a ceiling on concurrent work.
+
+    ``client_limit`` applies one bucket per client across every limited
+    request; ``route_limits`` adds a bucket per ``(client, route)`` for the
+    named routes. Limits are ``(burst, tokens_per_second)`` pairs.
+    """
+
+    def __init__(
+        self,
+        client_limit: Optional[tuple[float, float]],
+        route_limits: dict[str, tuple[float, float]],
+        max_concurrent: int,
+        *,
+        max_keys: int = 4096,
+    ) -> None:
+        self.enabled = True
+        self.max_concurrent = max_concurrent
+        self.clients = BucketTable(*client_limit, max_keys) if client_limit else None
+        self.routes = {route: BucketTable(burst, rate, max_keys) for route, (burst, rate) in route_limits.items()}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._charge_lock = threading.Lock()
+
+    def check(self, client: str, route: str) -> float:
+        """Charge one request; returns 0 if allowed or the Retry-After in seconds.
+
+        Tokens are only spent when every applicable bucket has one, so a
+        refused request costs the client nothing.
+        """
+        if not self.enabled:
+            return 0.0
+        tables = [table for table in (self.routes.get(route), self.clients) if table is not None]
+        with self._charge_lock:
+            wait = max((table.peek(client) for table in tables), default=0.0)
+            if wait:
+                return wait
+            for table in tables:
+                table.take(client)
+        return 0.0
+
+    def enter(self) -> bool:
+        """Claim a concurrency slot; False when the server is saturated."""
+        with self._lock:
+            if self.enabled and self._active >= self.max_concurrent:
+                return False
+            self._active += 1
+            return True
+
+    def leave(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    @property
+    def active(self) -> int:
+        return self._active
@@ -0,0 +1,113 @@
+"""Precompiled route table for the leaderboard HTTP handlers."""
+from __future__ import annotations
+
+import re
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional
+
+# converters available in path templates, e.g. ``/api/players/{id:int}``
+CONVERTERS: dict[str, tuple[str, Callable[[str], object]]] = {
+    "int": (r"\d+", int),
+    "str": (r"[^/]+", urllib.parse.unquote),
+}
+_PARAM = re.compile(r"{(?P<name>[A-Za-z_][A-Za-z0-9_]*)(?::(?P<kind>[a-z]+))?}")
+
+
+@dataclass(frozen=True)
+class Route:
+    method: str
+    template: str
+    handler: str
+    admin: bool = False
+    cors: bool = True
+    params: tuple[tuple[str, Callable[[str], object]], ...] = field(default=(), compare=False)
+
+
+class RouteMatch(NamedTuple):
+    route: Route
+    params: dict[str, object]
+    query: dict[str, list[str]]
+
+
+class Router:
+    """Maps ``(method, path)`` to a named handler with typed parameters.
+
+    Templates without parameters live in a dictionary. Templates with
+    parameters are folded into one alternation regex per method when
+    ``compile()`` runs, so dispatch is one dict lookup or one regex match no
+    matter how many routes are registered.
+    """
+
+    def __init__(self) -> None:
+        self._routes: list[Route] = []
+        self._static: dict[tuple[str, str], Route] = {}
+        self._dynamic: dict[str, tuple[re.Pattern[str], dict[str, Route]]] = {}
+
+    def add(self, method: str, template: str, handler: str, *, admin: bool = False, cors: bool = True) -> None:
+        params = []
+        for match in _PARAM.finditer(template):
+            kind = match.group("kind") or "str"
+            if kind not in CONVERTERS:
+                raise ValueError(f"Unknown converter {kind!r} in route {template}")
+            params.append((match.group("name"), CONVERTERS[kind][1]))
+        self._routes.append(Route(method, template, handler, admin, cors, tuple(params)))
+
+    def compile(self) -> "Router":
+        self._static.clear()
+        self._dynamic.clear()
+        alternatives: dict[str, list[str]] = {}
+        groups: dict[str, dict[str, Route]] = {}
+        for index, route in enumerate(self._routes):
+            if not route.params:
+                self._static.setdefault((route.method, route.template), route)
+                continue
+            group = f"r{index}"
+            pattern = self._template_pattern(route.template, group)
+            alternatives.setdefault(route.method, []).append(f"(?P<{group}>{pattern})")
+            groups.setdefault(route.method, {})[group] = route
+        for method, patterns in alternatives.items():
+            self._dynamic[method] = (re.compile("|".join(patterns)), groups[method])
+        return self
+
+    def match(self, method: str, target: str) -> Optional[RouteMatch]:
+        parsed = urllib.parse.urlsplit(target)
+        path = parsed.path or "/"
+        query = urllib.parse.parse_qs(parsed.query)
+
+        route = self._static.get((method, path))
+        if route is not None:
+            return RouteMatch(route, {}, query)
+
+        compiled = self._dynamic.get(method)
+        if compiled is None:
+            return None
+        pattern, routes = compiled
+        found = pattern.fullmatch(path)
+        if found is None:
+            return None
+        group = found.lastgroup
+        route = routes[group]
+        params = {name: convert(found.group(f"{group}_{name}")) for name, convert in route.params}
+        return RouteMatch(route, params, query)
+
+    def allowed_methods(self, target: str) -> list[str]:
+        """Methods with a route for ``target``'s path; tells a 405 from a 404 after ``match`` fails."""
+        path = urllib.parse.urlsplit(target).path or "/"
+        allowed = {method for method, template in self._static if template == path}
+        allowed.update(method for method, (pattern, _) in self._dynamic.items() if pattern.fullmatch(path))
+        return sorted(allowed)
+
+    def methods(self) -> list[str]:
+        return sorted({route.method for route in self._routes})
+
+    @staticmethod
+    def _template_pattern(template: str, group: str) -> str:
+        pattern, position = [], 0
+        for match in _PARAM.finditer(template):
+            pattern.append(re.escape(template[position : match.start()]))
+            regex = CONVERTERS[match.group("kind") or "str"][0]
+            pattern.append(f"(?P<{group}_{match.group('name')}>{regex})")
+            position = match.end()
+        pattern.append(re.escape(template[position:]))
+        return "".join(pattern)
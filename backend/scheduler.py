@@ -0,0 +1,49 @@
+"""Background jobs that run on a fixed interval."""
+from __future__ import annotations
+
+import sys
+import threading
+import traceback
+from typing import Callable, Optional
+
+
+class PeriodicTask:
+    """Calls ``fn()`` every ``interval`` seconds on a daemon thread.
+
+    A failing run is reported on stderr and retried at the next interval, so
+    a transient error (a locked database, a full disk) never stops the job.
+    """
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], object], *, run_at_start: bool = False) -> None:
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.run_at_start = run_at_start
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_once(self) -> None:
+        try:
+            self.fn()
+        except Exception:
+            print(f"Background job {self.name} failed", file=sys.stderr)
+            traceback.print_exc()
+
+    def _loop(self) -> None:
+        if self.run_at_start:
+            self.run_once()
+        while not self._stop.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,54 @@
+"""Shared fixtures: every test gets a fresh database file of its own."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+# the backend modules import each other by bare name (``from db import ...``)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app  # noqa: E402
+import db  # noqa: E402
+from bench import BenchServer  # noqa: E402
+from helpers import Client  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """An initialised, empty database in rollback mode."""
+    path = tmp_path / "club.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    db.configure_pool(size=4, db_path=path)
+    db.initialize_database()
+    yield path
+    db.stop_writer()
+    db.close_pool()
+    with db._recent_outcomes_lock:
+        db._recent_outcomes.clear()
+
+
+@pytest.fixture(params=db.STORAGE_MODES)
+def storage(request: pytest.FixtureRequest, database: Path) -> Iterator[str]:
+    """Runs the test once per storage mode."""
+    db.configure_storage(request.param, database)
+    yield request.param
+    db.stop_writer()
+
+
+@pytest.fixture
+def server(request: pytest.FixtureRequest, database: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Client]:
+    """The app on an ephemeral port, seeded with the sample players.
+
+    Runs the threading engine unless parametrized indirectly with
+    ``"asyncio"``. Rate limits are off so tests can post freely.
+    """
+    monkeypatch.setattr(app.ADMISSION, "enabled", False)
+    app.start_services(pool_size=4)
+    bench_server = BenchServer(getattr(request, "param", "threading"), workers=4, max_connections=32)
+    bench_server.start()
+    yield Client(bench_server.port)
+    bench_server.stop()
+    app.stop_services()
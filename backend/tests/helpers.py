@@ -0,0 +1,64 @@
+"""Helpers shared by the test modules."""
+from __future__ import annotations
+
+import base64
+import http.client
+import json
+import threading
+from typing import Callable, Optional
+
+import app
+
+
+def run_threads(targets: list[Callable[[], None]]) -> None:
+    errors: list[BaseException] = []
+
+    def guarded(target: Callable[[], None]) -> None:
+        try:
+            target()
+        except BaseException as exc:  # re-raised below on the test thread
+            errors.append(exc)
+
+    threads = [threading.Thread(target=guarded, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class Client:
+    """Minimal JSON client for a server started by the ``server`` fixture."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: object = None,
+        headers: Optional[dict[str, str]] = None,
+        *,
+        admin: bool = False,
+    ) -> tuple[int, dict[str, str], bytes]:
+        headers = dict(headers or {})
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if admin:
+            credentials = f"{app.ADMIN_USERNAME}:{app.ADMIN_PASSWORD}".encode("utf-8")
+            headers["Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            conn.close()
+
+    def json(self, method: str, path: str, body: object = None, **kwargs: object) -> tuple[int, object]:
+        status, _, payload = self.request(method, path, body, **kwargs)
+        return status, json.loads(payload) if payload else None
@@ -0,0 +1,114 @@
+"""Season analytics: Elo deltas and finishing statistics on both engines."""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import analytics
+import db
+from analytics import SeasonStats, elo_deltas
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Runs the test with NumPy (when installed) and with the pure-Python fallback."""
+    if request.param == "numpy":
+        monkeypatch.setattr(analytics, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(analytics, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def stats(database: Path, engine: str) -> Iterator[SeasonStats]:
+    stats = SeasonStats()
+    stats.start()
+    yield stats
+    stats.stop()
+
+
+def play(label: str, nicknames: list[str], played_at: str = "2026-03-01") -> None:
+    placements = [
+        {"nickname": nickname, "rank": rank, "played_at": played_at} for rank, nickname in enumerate(nicknames, 1)
+    ]
+    assert db.record_game_results(placements, game_label=label)["errors"] == []
+
+
+def test_heads_up_game_between_equals(engine: str) -> None:
+    assert elo_deltas([1500, 1500], [1, 2]) == pytest.approx([16.0, -16.0])
+    assert elo_deltas([1500, 1500], [1, 1]) == pytest.approx([0.0, 0.0])
+    assert elo_deltas([1500], [1]) == [0.0]
+
+
+def test_upsets_move_ratings_further(engine: str) -> None:
+    favourite_wins = elo_deltas([1700, 1500], [1, 2])
+    underdog_wins = elo_deltas([1700, 1500], [2, 1])
+    assert 0 < favourite_wins[0] < underdog_wins[1]
+    assert underdog_wins[1] == pytest.approx(32 / (1 + 10 ** (-200 / 400)))
+
+
+def test_deltas_are_zero_sum_and_ordered(engine: str) -> None:
+    rng = random.Random(7)
+    for size in range(2, 10):
+        ratings = [rng.uniform(1200, 1800) for _ in range(size)]
+        ranks = list(range(1, size + 1))
+        changes = elo_deltas([1500.0] * size, ranks)
+        assert sum(elo_deltas(ratings, ranks)) == pytest.approx(0.0, abs=1e-9)
+        # from equal ratings a better finish always earns more
+        assert changes == sorted(changes, reverse=True)
+
+
+def test_numpy_and_python_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    numpy = pytest.importorskip("numpy")
+    rng = random.Random(11)
+    for size in range(1, 12):
+        ratings = [rng.uniform(1000, 2000) for _ in range(size)]
+        ranks = [rng.randint(1, size) for _ in range(size)]
+        monkeypatch.setattr(analytics, "np", numpy)
+        vectorised = elo_deltas(ratings, ranks)
+        monkeypatch.setattr(analytics, "np", None)
+        assert vectorised == pytest.approx(elo_deltas(ratings, ranks))
+
+
+def test_finishing_statistics(stats: SeasonStats) -> None:
+    play("One", ["ace", "river", "chip", "shark"])
+    play("Two", ["river", "ace", "shark", "chip"], "2026-03-02")
+    ace = db.get_player_by_nickname("ace")["id"]
+
+    entry = stats.player(ace)
+    points = [db.DEFAULT_RANK_POINTS[1], db.DEFAULT_RANK_POINTS[2]]
+    assert entry["games"] == 2 and entry["wins"] == 1
+    assert entry["average_finish"] == 1.5
+    assert entry["itm_rate"] == 1.0
+    assert entry["points_per_game"] == sum(points) / 2
+    assert entry["volatility"] == abs(points[0] - points[1]) / 2
+    # a win and a second place against the same field leaves ace above 1500
+    assert entry["rating"] > analytics.INITIAL_RATING
+
+    summary = stats.summary(sort="average_finish")
+    assert summary["games"] == 2
+    assert [row["average_finish"] for row in summary["players"]] == [1.5, 1.5, 3.5, 3.5]
+    with pytest.raises(ValueError, match="sort must be one of"):
+        stats.summary(sort="luck")
+
+
+def test_incremental_refresh_matches_a_rebuild(stats: SeasonStats) -> None:
+    rng = random.Random(3)
+    field = ["ace", "river", "chip", "shark", "nuts", "fish"]
+    for day in range(1, 8):
+        play(f"Week {day}", rng.sample(field, 4), f"2026-04-{day:02d}")
+        stats.summary()
+    # a back-dated game changes the rating order, so the index starts over
+    play("Catch-up", rng.sample(field, 5), "2026-03-15")
+    incremental = stats.summary(limit=100)
+
+    fresh = SeasonStats()
+    fresh.start()
+    try:
+        assert fresh.summary(limit=100) == incremental
+    finally:
+        fresh.stop()
+    assert incremental["games"] == 8
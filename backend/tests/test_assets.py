@@ -0,0 +1,107 @@
+"""Preloaded static assets: compressed variants, ETags and conditional GETs."""
+from __future__ import annotations
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+import app
+from assets import AssetStore, load_asset, parse_accept_encoding
+from helpers import Client
+
+SCRIPT = "function rank(players) { return players.sort((a, b) => b.points - a.points); }\n" * 40
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> AssetStore:
+    root = tmp_path / "frontend"
+    (root / "js").mkdir(parents=True)
+    (root / "index.html").write_text("<!doctype html><title>Club</title>", encoding="utf-8")
+    (root / "js" / "app.js").write_text(SCRIPT, encoding="utf-8")
+    (root / "logo.png").write_bytes(b"\x89PNG" + bytes(1024))
+    store = AssetStore(root)
+    store.load()
+    return store
+
+
+def test_accept_encoding_qualities() -> None:
+    assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0, x;q=bad") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "identity": 0.0,
+        "x": 0.0,
+    }
+    assert parse_accept_encoding("") == {}
+
+
+def test_compressible_assets_get_a_gzip_variant(site: AssetStore) -> None:
+    script = site.get("js/app.js")
+    assert script.mime in {"text/javascript", "application/javascript"}
+    gzipped, etag = script.encodings["gzip"]
+    assert gzip.decompress(gzipped) == SCRIPT.encode("utf-8")
+    assert etag == script.etag[:-1] + '-gzip"'
+    # small files and already-compressed formats are stored as they are
+    assert site.get("index.html").encodings == {}
+    assert site.get("logo.png").encodings == {}
+
+
+def test_negotiation_picks_an_accepted_variant(site: AssetStore) -> None:
+    script = site.get("js/app.js")
+    body, etag, encoding = script.negotiate("deflate, gzip;q=0.8")
+    assert (body, etag, encoding) == (*script.encodings["gzip"], "gzip")
+    assert script.negotiate("gzip;q=0") == (script.body, script.etag, None)
+    assert script.negotiate("") == (script.body, script.etag, None)
+
+
+def test_etags_follow_content_not_mtime(tmp_path: Path) -> None:
+    path = tmp_path / "style.css"
+    path.write_text("body { color: red; }", encoding="utf-8")
+    first = load_asset(path)
+    os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    assert load_asset(path).etag == first.etag
+    path.write_text("body { color: blue; }", encoding="utf-8")
+    assert load_asset(path).etag != first.etag
+
+
+def test_refresh_picks_up_edits_and_removals(site: AssetStore) -> None:
+    assert not site.refresh()
+    index = site.root / "index.html"
+    index.write_text("<!doctype html><title>Club v2</title>", encoding="utf-8")
+    os.utime(index, ns=(site.get("index.html").mtime_ns + 10**9,) * 2)
+    (site.root / "logo.png").unlink()
+    assert site.refresh()
+    assert b"v2" in site.get("index.html").body
+    assert site.get("logo.png") is None
+    assert site.get("../frontend/index.html") is None
+
+
+def test_server_serves_variants_and_304s(server: Client, site: AssetStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app, "ASSETS", site)
+    script = site.get("js/app.js")
+
+    status, headers, body = server.request("GET", "/js/app.js", headers={"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert headers["ETag"] == script.encodings["gzip"][1]
+    assert gzip.decompress(body) == script.body
+
+    status, headers, body = server.request("GET", "/js/app.js")
+    assert (status, body) == (200, script.body)
+    assert "Content-Encoding" not in headers
+    assert headers["ETag"] == script.etag
+
+    # a validator only matches the representation it was issued for
+    assert server.request("GET", "/js/app.js", headers={"If-None-Match": script.etag})[0] == 304
+    gzip_etag = script.encodings["gzip"][1]
+    assert server.request("GET", "/js/app.js", headers={"If-None-Match": gzip_etag})[0] == 200
+    status, headers, _ = server.request(
+        "GET", "/js/app.js", headers={"If-None-Match": gzip_etag, "Accept-Encoding": "gzip"}
+    )
+    assert (status, headers["ETag"]) == (304, gzip_etag)
+
+    status, headers, body = server.request("GET", "/")
+    assert (status, body) == (200, site.get("index.html").body)
+    assert server.request("GET", "/../secret.txt")[0] == 404
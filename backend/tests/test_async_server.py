@@ -0,0 +1,116 @@
+"""The asyncio engine: keep-alive, pipelining, framing errors and the connection cap."""
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import time
+from typing import BinaryIO, Iterator
+
+import pytest
+
+from bench import BenchServer
+from helpers import Client
+
+pytestmark = pytest.mark.parametrize("server", ["asyncio"], indirect=True)
+
+
+def read_response(stream: BinaryIO) -> tuple[int, dict[str, str], bytes]:
+    status_line = stream.readline()
+    assert status_line, "connection closed before a response"
+    status = int(status_line.split()[1])
+    headers: dict[str, str] = {}
+    while (line := stream.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, stream.read(int(headers.get("content-length", 0)))
+
+
+@pytest.fixture
+def raw(server: Client) -> Iterator[socket.socket]:
+    sock = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+    yield sock
+    sock.close()
+
+
+def test_keep_alive_reuses_one_connection(server: Client) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    try:
+        conn.request("GET", "/api/leaderboard?limit=1")
+        response = conn.getresponse()
+        assert (response.status, response.version) == (200, 11)
+        response.read()
+        first_socket = conn.sock
+
+        for path in ("/api/players/1", "/api/leaderboard?limit=2"):
+            conn.request("GET", path)
+            response = conn.getresponse()
+            assert response.status == 200
+            response.read()
+        assert conn.sock is first_socket
+    finally:
+        conn.close()
+
+
+def test_pipelined_requests_are_answered_in_order(raw: socket.socket) -> None:
+    body = json.dumps({"delta": 5, "reason": "pipelined"}).encode("utf-8")
+    post = (
+        b"POST /api/players/1/scores HTTP/1.1\r\nHost: test\r\nContent-Type: application/json\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+    )
+    raw.sendall(
+        b"GET /api/players/1 HTTP/1.1\r\nHost: test\r\n\r\n"
+        + post
+        + b"GET /api/players/1 HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n"
+    )
+    stream = raw.makefile("rb")
+    first = read_response(stream)
+    second = read_response(stream)
+    third = read_response(stream)
+
+    assert [first[0], second[0], third[0]] == [200, 201, 200]
+    before, after = json.loads(first[2]), json.loads(third[2])
+    assert after["player"]["total_points"] == before["player"]["total_points"] + 5
+    # Connection: close on the last request ends the connection after its response
+    assert stream.read() == b""
+
+
+@pytest.mark.parametrize(
+    ("head", "status"),
+    [
+        (b"POST /api/players HTTP/1.1\r\nHost: test\r\nTransfer-Encoding: chunked\r\n\r\n", 411),
+        (b"POST /api/players HTTP/1.1\r\nHost: test\r\nContent-Length: many\r\n\r\n", 400),
+        (b"POST /api/players HTTP/1.1\r\nHost: test\r\nContent-Length: 99999999999\r\n\r\n", 413),
+        (b"GET / HTTP/1.1\r\nHost: test\r\nX-Filler: " + b"x" * 70_000 + b"\r\n\r\n", 431),
+    ],
+)
+def test_bad_framing_is_rejected_and_closed(raw: socket.socket, head: bytes, status: int) -> None:
+    raw.sendall(head)
+    stream = raw.makefile("rb")
+    assert read_response(stream)[0] == status
+    assert stream.read() == b""
+
+
+def test_connections_over_the_cap_get_503(server: Client) -> None:
+    capped = BenchServer("asyncio", workers=2, max_connections=1)
+    capped.start()
+    try:
+        held = http.client.HTTPConnection("127.0.0.1", capped.port, timeout=5)
+        held.request("GET", "/api/leaderboard?limit=1")
+        held.getresponse().read()
+
+        # the idle keep-alive connection still counts against the cap
+        status, headers, _ = Client(capped.port).request("GET", "/api/leaderboard?limit=1")
+        assert (status, headers["Retry-After"]) == (503, "1")
+
+        held.close()
+        status = 503
+        for _ in range(50):
+            status = Client(capped.port).request("GET", "/api/leaderboard?limit=1")[0]
+            if status == 200:
+                break
+            # the server frees the slot once it notices the close
+            time.sleep(0.02)
+        assert status == 200
+    finally:
+        capped.stop()
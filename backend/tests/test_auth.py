@@ -0,0 +1,99 @@
+"""Admin password hashing, verified-header caching and failed-login throttling."""
+from __future__ import annotations
+
+import base64
+
+import pytest
+
+import app
+import auth
+from auth import BasicAuthenticator, hash_password, is_password_hash, verify_password
+from helpers import Client
+from ratelimit import BucketTable
+
+
+def basic(username: str, password: str) -> str:
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+
+
+@pytest.fixture(autouse=True)
+def cheap_kdf(monkeypatch: pytest.MonkeyPatch) -> None:
+    # hashes record their own cost, so verification follows whatever they were made with
+    monkeypatch.setattr(auth, "PBKDF2_ITERATIONS", 1000)
+
+
+@pytest.mark.parametrize("scheme", auth.HASH_SCHEMES)
+def test_hash_round_trip(scheme: str) -> None:
+    stored = hash_password("s3cret ♠", scheme)
+    assert stored.startswith(f"{scheme}$")
+    assert is_password_hash(stored)
+    assert verify_password("s3cret ♠", stored)
+    assert not verify_password("s3cret", stored)
+    # a fresh salt every time
+    assert hash_password("s3cret ♠", scheme) != stored
+
+
+def test_plain_text_passwords_still_verify() -> None:
+    assert not is_password_hash("clubsecret")
+    assert verify_password("clubsecret", "clubsecret")
+    assert not verify_password("clubsecre", "clubsecret")
+
+
+def test_malformed_hashes_and_schemes_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Malformed pbkdf2_sha256"):
+        verify_password("x", "pbkdf2_sha256$many$salt$digest")
+    with pytest.raises(ValueError, match="Unknown password scheme"):
+        hash_password("x", "md5")
+
+
+def test_verified_headers_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    authenticator = BasicAuthenticator("admin", hash_password("pw"))
+    calls: list[str] = []
+    monkeypatch.setattr(auth, "verify_password", lambda password, stored: calls.append(password) or password == "pw")
+
+    for _ in range(3):
+        assert authenticator.check(basic("admin", "pw"), "10.0.0.1").allowed
+    assert calls == ["pw"]
+    # the password is still checked for a wrong username, so timing does not tell them apart
+    assert not authenticator.check(basic("root", "pw"), "10.0.0.1").allowed
+    assert calls == ["pw", "pw"]
+
+    authenticator.clear()
+    assert authenticator.check(basic("admin", "pw"), "10.0.0.1").allowed
+    assert len(calls) == 3
+
+
+def test_expired_cache_entries_verify_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    authenticator = BasicAuthenticator("admin", "pw", cache_ttl=0)
+    calls: list[str] = []
+    monkeypatch.setattr(auth, "verify_password", lambda password, stored: calls.append(password) or password == "pw")
+    for _ in range(2):
+        assert authenticator.check(basic("admin", "pw"), "10.0.0.1").allowed
+    assert calls == ["pw", "pw"]
+
+
+def test_failed_logins_are_throttled_per_client() -> None:
+    authenticator = BasicAuthenticator("admin", "pw", failure_burst=2, failure_rate=0.001)
+    # a request without credentials is the browser's first probe, not a failure
+    assert authenticator.check("", "10.0.0.1") == (False, 0.0)
+    assert authenticator.check(basic("admin", "guess1"), "10.0.0.1") == (False, 0.0)
+    assert authenticator.check(basic("admin", "guess2"), "10.0.0.1") == (False, 0.0)
+
+    decision = authenticator.check(basic("admin", "pw"), "10.0.0.1")
+    assert not decision.allowed and decision.retry_after > 0
+    # other clients are unaffected
+    assert authenticator.check(basic("admin", "pw"), "10.0.0.2").allowed
+
+
+def test_server_challenges_then_throttles(server: Client, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app.ADMIN_AUTH, "failures", BucketTable(1, 0.5))
+    body = {"nickname": "fresh"}
+
+    status, headers, _ = server.request("POST", "/api/games", body)
+    assert status == 401
+    assert headers["WWW-Authenticate"] == f'Basic realm="{app.ADMIN_REALM}"'
+
+    assert server.request("POST", "/api/games", body, {"Authorization": basic("admin", "wrong")})[0] == 401
+    status, headers, _ = server.request("POST", "/api/games", body, {"Authorization": basic("admin", "wrong")})
+    assert status == 429
+    assert headers["Retry-After"] == "2"
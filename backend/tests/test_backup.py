@@ -0,0 +1,146 @@
+"""Online snapshots, compaction, rotation and restoring a snapshot."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import backup
+import db
+
+
+def contents(path: Path) -> dict[str, list[tuple]]:
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY id;").fetchall()
+            for table in ("players", "score_history", "games", "game_placements")
+        }
+    finally:
+        conn.close()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def season(storage: str) -> Iterator[list[int]]:
+    players = [db.add_player(name) for name in ("ace", "river", "chip")]
+    db.record_game_results(
+        [{"nickname": name, "rank": rank} for rank, name in enumerate(("river", "ace", "chip"), 1)],
+        game_label="Opener",
+    )
+    yield players
+
+
+def test_snapshot_restore_round_trip(season: list[int], database: Path, tmp_path: Path) -> None:
+    backups = tmp_path / "backups"
+    snapshot = backup.take_snapshot(backups, db_path=database)
+    assert snapshot.name.startswith("club-snapshot-") and not list(backups.glob("*.partial"))
+    saved_state = contents(snapshot)
+    assert saved_state == contents(database)
+
+    db.record_score_change(season[0], 500, "Late bonus")
+    db.add_player("latecomer")
+    later_state = contents(database)
+    assert later_state != saved_state
+
+    db.stop_writer()
+    db.close_pool()
+    pre_restore = backup.restore_snapshot(snapshot, db_path=database, backup_dir=backups)
+    assert contents(database) == saved_state
+    # the state being replaced is kept, so the restore itself can be undone
+    assert pre_restore.name.startswith("club-pre-restore-")
+    assert contents(pre_restore) == later_state
+
+    db.configure_pool(size=2, db_path=database)
+    assert db.check_finals_played() == []
+    assert db.get_player_by_nickname("latecomer") is None
+
+
+def test_snapshot_while_writers_run(season: list[int], database: Path, tmp_path: Path) -> None:
+    stop = threading.Event()
+
+    def write() -> None:
+        while not stop.wait(0.001):
+            db.record_score_change(season[1], 1, "tick")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        snapshots = [backup.take_snapshot(tmp_path, db_path=database, pages=2, pause=0.001) for _ in range(3)]
+    finally:
+        stop.set()
+        writer.join()
+
+    for snapshot in snapshots:
+        conn = sqlite3.connect(snapshot)
+        try:
+            assert conn.execute("PRAGMA quick_check;").fetchone()[0] == "ok"
+            # each snapshot is one consistent point in time
+            drifted = conn.execute(
+                "SELECT id FROM players p WHERE total_points != "
+                "(SELECT COALESCE(SUM(delta), 0) FROM score_history WHERE player_id = p.id);"
+            ).fetchall()
+            assert drifted == []
+        finally:
+            conn.close()
+
+
+def test_compact_copy_matches_the_live_file(season: list[int], database: Path, tmp_path: Path) -> None:
+    compact = backup.compact_snapshot(tmp_path, db_path=database)
+    assert compact.name.startswith("club-compact-")
+    assert contents(compact) == contents(database)
+
+
+def test_rotation_keeps_the_newest(tmp_path: Path) -> None:
+    for index in range(5):
+        path = tmp_path / f"club-snapshot-2026010{index}-000000.db"
+        path.write_bytes(b"")
+        os.utime(path, (1_700_000_000 + index,) * 2)
+    (tmp_path / "club-compact-20260101-000000.db").write_bytes(b"")
+
+    removed = backup.rotate_snapshots(tmp_path, "snapshot", keep=2)
+    assert [path.name for path in removed] == [f"club-snapshot-2026010{index}-000000.db" for index in range(3)]
+    assert [path.name for path in backup.list_snapshots(tmp_path, "snapshot")] == [
+        "club-snapshot-20260103-000000.db",
+        "club-snapshot-20260104-000000.db",
+    ]
+    assert len(backup.list_snapshots(tmp_path)) == 3
+
+
+def test_restore_refuses_files_that_are_not_club_databases(database: Path, tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        backup.restore_snapshot(tmp_path / "missing.db", db_path=database)
+    other = tmp_path / "other.db"
+    conn = sqlite3.connect(other)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY);")
+    conn.close()
+    with pytest.raises(sqlite3.DatabaseError, match="not a club database"):
+        backup.restore_snapshot(other, db_path=database, backup_dir=tmp_path)
+    assert not backup.list_snapshots(tmp_path, "pre-restore")
+
+
+def test_running_server_notices_a_restore(database: Path, tmp_path: Path) -> None:
+    player = db.add_player("ace")
+    snapshot = backup.take_snapshot(tmp_path, db_path=database)
+    db.record_score_change(player, 100, "bonus")
+    db.watch_external_writes(interval=0.05)
+    try:
+        version = db.data_version()
+        backup.restore_snapshot(snapshot, db_path=database, backup_dir=tmp_path)
+        assert wait_for(lambda: db.data_version() > version)
+        assert db.get_player(player)["total_points"] == 0
+    finally:
+        db.stop_external_watch()
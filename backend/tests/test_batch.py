@@ -0,0 +1,77 @@
+"""Batched player lookups: get_players, get_recent_history and GET /api/players?ids=..."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import app
+import db
+from helpers import Client
+
+
+def test_lookups_span_several_sql_batches(database: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db, "SQL_BATCH_SIZE", 2)
+    ids = [db.add_player(f"player{index}") for index in range(5)]
+    for player_id in ids:
+        for delta in range(1, 4):
+            db.record_score_change(player_id, delta * player_id, "hand")
+
+    rows = db.get_players([*reversed(ids), ids[0], 999])
+    assert sorted(row["id"] for row in rows) == ids
+
+    history = db.get_recent_history([*ids, 999], limit=2)
+    assert set(history) == {*ids, 999}
+    # newest first; same-second events fall back to id order
+    assert [[row["delta"] for row in history[player_id]] for player_id in ids] == [
+        [3 * player_id, 2 * player_id] for player_id in ids
+    ]
+    assert history[999] == []
+    assert db.get_recent_history(ids, limit=0) == {player_id: [] for player_id in ids}
+
+
+def test_batch_endpoint_keeps_request_order(server: Client) -> None:
+    status, body = server.json("GET", "/api/players?ids=2,1,999,2")
+    assert status == 200
+    assert [player["id"] for player in body["players"]] == [2, 1]
+    assert body["missing"] == [999]
+    assert "history" not in body["players"][0]
+    single = server.json("GET", "/api/players/1")[1]["player"]
+    assert body["players"][1]["total_points"] == single["total_points"]
+
+
+def test_batch_endpoint_includes_capped_history(server: Client) -> None:
+    for delta in range(app.MAX_BATCH_HISTORY + 5):
+        db.record_score_change(1, delta, "hand")
+
+    status, body = server.json("GET", "/api/players?ids=1&history=3")
+    assert status == 200
+    assert [entry["delta"] for entry in body["players"][0]["history"]] == [
+        app.MAX_BATCH_HISTORY + 4,
+        app.MAX_BATCH_HISTORY + 3,
+        app.MAX_BATCH_HISTORY + 2,
+    ]
+    history = server.json("GET", "/api/players?ids=1&history=1000")[1]["players"][0]["history"]
+    assert len(history) == app.MAX_BATCH_HISTORY
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "ids=", "ids=1,x", "ids=1&history=some", "ids=" + ",".join(map(str, range(1, app.MAX_BATCH_IDS + 2)))],
+    ids=["missing", "empty", "not-a-number", "bad-history", "too-many"],
+)
+def test_batch_endpoint_rejects_bad_queries(server: Client, query: str) -> None:
+    status, body = server.json("GET", f"/api/players?{query}")
+    assert status == 400
+    assert "ids" in body["error"]
+
+
+def test_batch_endpoint_revalidates_until_a_listed_player_changes(server: Client) -> None:
+    status, headers, _ = server.request("GET", "/api/players?ids=1,2")
+    etag = headers["ETag"]
+    assert server.request("GET", "/api/players?ids=1,2", headers={"If-None-Match": etag})[0] == 304
+    # a different selection is a different resource
+    assert server.request("GET", "/api/players?ids=2,1", headers={"If-None-Match": etag})[0] == 200
+
+    assert server.json("POST", "/api/players/2/scores", {"delta": 1})[0] == 201
+    assert server.request("GET", "/api/players?ids=1,2", headers={"If-None-Match": etag})[0] == 200
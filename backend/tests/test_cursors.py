@@ -0,0 +1,80 @@
+"""Keyset page tokens: encoding round-trips and paging through ties."""
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+
+import pytest
+
+import db
+from app import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize(
+    ("values", "types"),
+    [
+        ((1260, "AceHigh"), (int, str)),
+        ((-40, "Ünïcode nick / with + and ="), (int, str)),
+        (("2026-10-17 03:00:00", 42), (str, int)),
+        ((0, ""), (int, str)),
+    ],
+)
+def test_cursor_round_trip(values: tuple, types: tuple[type, ...]) -> None:
+    token = encode_cursor(*values)
+    assert "=" not in token
+    assert decode_cursor(token, *types) == values
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not base64!",
+        encode_cursor(1260),
+        encode_cursor("1260", "AceHigh"),
+        encode_cursor(True, "AceHigh"),
+        encode_cursor(1260, "AceHigh", 3),
+        base64.urlsafe_b64encode(json.dumps({"points": 1260}).encode()).decode(),
+    ],
+)
+def test_tampered_cursor_is_rejected(token: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(token, int, str)
+
+
+def test_leaderboard_pages_follow_the_full_order(database: Path) -> None:
+    # several players share each score, so pages split runs of ties
+    for index in range(11):
+        player = db.add_player(f"player{index:02d}")
+        db.record_score_change(player, (index % 3) * 100, "seed")
+    expected = [row["id"] for row in db.list_leaderboard(limit=100)]
+
+    seen: list[int] = []
+    after = None
+    while True:
+        rows = db.list_leaderboard(limit=3, after=after)
+        seen.extend(row["id"] for row in rows)
+        if len(rows) < 3:
+            break
+        after = decode_cursor(encode_cursor(rows[-1]["total_points"], rows[-1]["nickname"]), int, str)
+    assert seen == expected
+
+
+def test_history_pages_follow_the_full_order(database: Path) -> None:
+    player = db.add_player("ace")
+    for delta in range(1, 10):
+        # same-second events are ordered by id
+        db.record_score_change(player, delta, "hand")
+    expected = [row["id"] for row in db.get_player_history(player, limit=100)]
+
+    seen: list[int] = []
+    before = None
+    while True:
+        rows = db.get_player_history(player, limit=4, before=before)
+        seen.extend(row["id"] for row in rows)
+        if len(rows) < 4:
+            break
+        before = decode_cursor(encode_cursor(rows[-1]["created_at"], rows[-1]["id"]), str, int)
+    assert seen == expected
+    assert len(seen) == 9
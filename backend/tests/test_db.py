@@ -0,0 +1,103 @@
+"""Write path: concurrent writers in both storage modes and the WAL writer queue."""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+import db
+from helpers import run_threads
+
+
+# --- concurrent writes ---------------------------------------------------
+def test_concurrent_writes_keep_aggregates_consistent(storage: str) -> None:
+    names = [f"player{i}" for i in range(6)]
+    ids = [db.add_player(name) for name in names]
+
+    def games(thread: int) -> Callable[[], None]:
+        def run() -> None:
+            for game in range(15):
+                db.record_game_results(
+                    [{"nickname": names[(thread + rank) % len(names)], "rank": rank + 1} for rank in range(3)],
+                    game_label=f"Table {thread} game {game}",
+                )
+
+        return run
+
+    def scores(thread: int) -> Callable[[], None]:
+        def run() -> None:
+            for _ in range(30):
+                db.record_score_change(ids[thread % len(ids)], thread + 1, "bonus")
+
+        return run
+
+    run_threads([games(thread) for thread in range(4)] + [scores(thread) for thread in range(4)])
+
+    assert db.check_finals_played() == []
+    with db.pooled_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM score_history;").fetchone()[0] == 4 * 15 * 3 + 4 * 30
+        drifted = conn.execute(
+            """
+            SELECT p.id FROM players p
+            WHERE p.total_points != (SELECT COALESCE(SUM(delta), 0) FROM score_history WHERE player_id = p.id);
+            """
+        ).fetchall()
+        assert drifted == []
+        mislinked = conn.execute(
+            """
+            SELECT gp.id FROM game_placements gp
+            LEFT JOIN score_history h ON h.id = gp.history_id
+            WHERE h.id IS NULL OR h.player_id != gp.player_id OR h.delta != gp.points;
+            """
+        ).fetchall()
+        assert mislinked == []
+        periods = conn.execute("SELECT * FROM period_totals ORDER BY period, player_id;").fetchall()
+
+    db.rebuild_period_totals()
+    with db.pooled_connection() as conn:
+        rebuilt = conn.execute("SELECT * FROM period_totals ORDER BY period, player_id;").fetchall()
+    assert [tuple(row) for row in periods] == [tuple(row) for row in rebuilt]
+
+
+# --- writer queue --------------------------------------------------------
+def _add(conn, nickname: str) -> str:
+    conn.execute("INSERT INTO players (nickname) VALUES (?);", (nickname,))
+    return nickname
+
+
+def _add_then_fail(conn, nickname: str) -> str:
+    _add(conn, nickname)
+    raise ValueError(f"cannot add {nickname}")
+
+
+def test_failing_job_rolls_back_only_its_own_savepoint(database: Path) -> None:
+    writer = db.WriteQueue(database)
+    started, release = threading.Event(), threading.Event()
+
+    def hold(conn) -> None:
+        started.set()
+        release.wait(5)
+
+    try:
+        writer.submit(hold)
+        started.wait(5)
+        # queued while the writer is busy, so all three land in the next batch
+        first = writer.submit(_add, "first")
+        failing = writer.submit(_add_then_fail, "failing")
+        last = writer.submit(_add, "last")
+        release.set()
+
+        assert first.result(5) == "first"
+        assert last.result(5) == "last"
+        with pytest.raises(ValueError, match="cannot add failing"):
+            failing.result(5)
+        assert (writer.batches, writer.jobs) == (2, 4)
+    finally:
+        release.set()
+        writer.close()
+
+    with db.pooled_connection() as conn:
+        nicknames = {row["nickname"] for row in conn.execute("SELECT nickname FROM players;")}
+    assert nicknames == {"first", "last"}
@@ -0,0 +1,61 @@
+"""Structured games: keyset paging and the ids a submission reports."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import db
+from app import decode_cursor, encode_cursor
+from helpers import Client
+
+
+def test_game_pages_follow_the_full_order(database: Path) -> None:
+    for night in range(7):
+        db.record_game_results(
+            [{"nickname": "ace", "rank": 1, "played_at": f"2026-03-0{night % 3 + 1}"}], game_label=f"Table {night}"
+        )
+    expected = [row["id"] for row in db.list_games(limit=100)]
+
+    seen: list[int] = []
+    after = None
+    while True:
+        rows = db.list_games(limit=2, after=after)
+        seen.extend(row["id"] for row in rows)
+        if len(rows) < 2:
+            break
+        after = decode_cursor(encode_cursor(rows[-1]["played_at"], rows[-1]["id"]), str, int)
+    assert seen == expected
+    assert len(seen) == 7
+
+
+def test_submission_reports_every_game_it_wrote(database: Path) -> None:
+    summary = db.record_game_results(
+        [
+            {"nickname": "ace", "rank": 1, "played_at": "2026-03-01"},
+            {"nickname": "river", "rank": 2, "played_at": "2026-03-01"},
+            {"nickname": "ace", "rank": 2, "played_at": "2026-03-08"},
+            {"nickname": "river", "rank": 1, "played_at": "2026-03-08"},
+        ],
+        game_label="Weekly final",
+    )
+    assert len(summary["game_ids"]) == 2
+    games = [db.get_game(game_id)[0] for game_id in summary["game_ids"]]
+    assert [(game["played_at"], game["entrants"]) for game in games] == [
+        ("2026-03-01 00:00:00", 2),
+        ("2026-03-08 00:00:00", 2),
+    ]
+
+    undated = db.record_game_results([{"nickname": "ace", "rank": 1}], game_label="Tonight")
+    assert len(undated["game_ids"]) == 1
+    assert db.record_game_results([{"rank": 1}])["game_ids"] == []
+
+
+def test_game_endpoint_returns_all_game_ids(server: Client) -> None:
+    placements = [
+        {"nickname": "AceHigh", "rank": 1, "played_at": "2026-03-01"},
+        {"nickname": "AceHigh", "rank": 1, "played_at": "2026-03-08"},
+    ]
+    status, body = server.json("POST", "/api/games", {"placements": placements, "label": "Final"}, admin=True)
+    assert status == 201
+    assert len(body["game_ids"]) == 2
+    for game_id in body["game_ids"]:
+        assert server.json("GET", f"/api/games/{game_id}")[0] == 200
@@ -0,0 +1,91 @@
+"""Idempotency keys: replay, conflicts and concurrent claims."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import db
+from helpers import Client, run_threads
+
+
+def _forget_recent_outcomes() -> None:
+    with db._recent_outcomes_lock:
+        db._recent_outcomes.clear()
+
+
+def test_idempotent_replay_applies_once(storage: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    placements = [{"nickname": "ace", "rank": 1}, {"nickname": "river", "rank": 2}]
+    first = db.record_game_results_once("key-1", "fingerprint", placements, game_label="Night 1")
+    assert not first.replayed
+    assert first.result["errors"] == []
+
+    from_memory = db.record_game_results_once("key-1", "fingerprint", placements, game_label="Night 1")
+    assert from_memory == (first.result, True)
+
+    _forget_recent_outcomes()
+    version = db.data_version()
+
+    def no_writes(*args: object, **kwargs: object) -> None:
+        raise AssertionError("a replay must not take the write path")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(db, "run_write", no_writes)
+        from_database = db.record_game_results_once("key-1", "fingerprint", placements, game_label="Night 1")
+    assert from_database == (first.result, True)
+    assert db.data_version() == version
+
+    with db.pooled_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM games;").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM score_history;").fetchone()[0] == 2
+
+
+def test_idempotency_key_reused_for_another_request_conflicts(storage: str) -> None:
+    player = db.add_player("ace")
+    db.record_score_change_once("key-1", "first request", player, 10, "bonus")
+
+    with pytest.raises(db.IdempotencyConflict):
+        db.record_score_change_once("key-1", "second request", player, 20, "bonus")
+    _forget_recent_outcomes()
+    with pytest.raises(db.IdempotencyConflict):
+        db.record_score_change_once("key-1", "second request", player, 20, "bonus")
+    assert db.get_player(player)["total_points"] == 10
+
+
+def test_concurrent_requests_with_one_key_apply_once(storage: str) -> None:
+    player = db.add_player("ace")
+    outcomes: list[db.IdempotentOutcome] = []
+
+    def submit() -> None:
+        outcomes.append(db.record_score_change_once("key-1", "fingerprint", player, 7, "bonus"))
+
+    run_threads([submit] * 6)
+
+    assert sorted(outcome.replayed for outcome in outcomes) == [False] + [True] * 5
+    assert db.get_player(player)["total_points"] == 7
+
+
+def test_failed_job_leaves_no_key_behind(storage: str) -> None:
+    with pytest.raises(sqlite3.IntegrityError):
+        db.record_score_change_once("key-1", "fingerprint", 999, 7, "bonus")
+    with db.pooled_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM idempotency_keys;").fetchone()[0] == 0
+
+    # the key is free again, so a corrected retry goes through
+    player = db.add_player("ace")
+    outcome = db.record_score_change_once("key-1", "fingerprint", player, 7, "bonus")
+    assert not outcome.replayed
+    assert db.get_player(player)["total_points"] == 7
+
+
+def test_keyed_score_for_a_missing_player_is_404(server: Client) -> None:
+    headers = {"Idempotency-Key": "retry-1"}
+    for _ in range(2):
+        status, body = server.json("POST", "/api/players/999/scores", {"delta": 10}, headers=headers)
+        assert (status, body) == (404, {"error": "Player not found"})
+    with db.pooled_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM idempotency_keys;").fetchone()[0] == 0
+
+    status, response_headers, _ = server.request("POST", "/api/players/1/scores", {"delta": 10}, headers)
+    assert status == 201
+    assert "Idempotent-Replayed" not in response_headers
@@ -0,0 +1,91 @@
+"""Streaming CSV/JSONL import: invalid rows, checkpoints and resuming."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import db
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_csv(path: Path, rows: list[str]) -> Path:
+    path.write_text("nickname,rank,points,game,date\n" + "".join(f"{row}\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def total_points() -> dict[str, int]:
+    with db.pooled_connection() as conn:
+        return {row["nickname"]: row["total_points"] for row in conn.execute("SELECT nickname, total_points FROM players;")}
+
+
+def test_invalid_rows_are_reported_and_skipped(database: Path, tmp_path: Path) -> None:
+    path = write_csv(
+        tmp_path / "season.csv",
+        [
+            "ace,1,,Week 1,",
+            ",2,,Week 1,",
+            "river,two,,Week 1,",
+            "chip,12,,Week 1,",
+            "shark,2,,Week 1,not-a-date",
+            "river,2,,Week 1,",
+        ],
+    )
+    errors: list[tuple[int, str]] = []
+    stats = db.import_results(path, chunk_size=4, on_error=lambda row, message: errors.append((row, message)))
+
+    assert (stats["rows"], stats["applied"], stats["errors"]) == (6, 2, 4)
+    assert [row for row, _ in errors] == [2, 3, 4, 5]
+    assert "Missing nickname" in errors[0][1]
+    assert "Invalid date" in errors[3][1]
+    assert total_points() == {"ace": db.DEFAULT_RANK_POINTS[1], "river": db.DEFAULT_RANK_POINTS[2]}
+
+
+def test_interrupted_import_resumes_after_the_last_chunk(database: Path, tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "season.csv", [f"player{row % 4},1,10,Week {row // 4}," for row in range(10)])
+
+    def stop_after_first_chunk(progress: dict[str, float]) -> None:
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        db.import_results(path, chunk_size=4, on_progress=stop_after_first_chunk)
+    assert db.get_import_checkpoint(str(path.resolve())) == 4
+    assert sum(total_points().values()) == 40
+
+    stats = db.import_results(path, chunk_size=4)
+    assert (stats["skipped"], stats["rows"], stats["applied"]) == (4, 6, 6)
+    assert total_points() == {"player0": 30, "player1": 30, "player2": 20, "player3": 20}
+    # nothing is applied twice when the finished import is run again
+    assert db.import_results(path, chunk_size=4)["applied"] == 0
+    assert sum(total_points().values()) == 100
+    assert db.check_finals_played() == []
+
+
+def test_jsonl_reports_malformed_lines(database: Path, tmp_path: Path) -> None:
+    path = tmp_path / "season.jsonl"
+    path.write_text(
+        '{"nickname": "ace", "rank": 1, "played_at": "2025-02-03"}\n'
+        "{not json\n"
+        "\n"
+        '["a", "list"]\n'
+        '{"nickname": "river", "rank": 2, "date": "2025-02-03"}\n',
+        encoding="utf-8",
+    )
+    errors: list[tuple[int, str]] = []
+    stats = db.import_results(path, on_error=lambda row, message: errors.append((row, message)))
+
+    assert (stats["applied"], stats["errors"]) == (2, 2)
+    assert [message.split(":")[0] for _, message in errors] == ["Invalid JSON", "Expected a JSON object"]
+    # the dated rows count towards the month they were played in
+    february = db.list_period_leaderboard("2025-02")
+    assert [(row["nickname"], row["total_points"]) for row in february] == [("ace", 200), ("river", 150)]
+
+
+def test_chunk_size_must_be_positive(database: Path, tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "season.csv", ["ace,1,,Week 1,"])
+    with pytest.raises(ValueError, match="chunk_size"):
+        db.import_results(path, chunk_size=0)
+    assert total_points() == {}
@@ -0,0 +1,95 @@
+"""Live leaderboard hub: snapshot and diff frames, eviction and disconnects."""
+from __future__ import annotations
+
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import app
+import db
+from helpers import Client
+from live import LeaderboardHub, Subscription
+
+
+def parse_frame(frame: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.decode("utf-8").strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def hub(database: Path) -> Iterator[LeaderboardHub]:
+    hub = LeaderboardHub(depth=10, max_subscribers=2)
+    hub.start()
+    yield hub
+    hub.stop()
+
+
+def test_subscribers_get_a_snapshot_then_diffs(hub: LeaderboardHub) -> None:
+    ace, river = db.add_player("ace"), db.add_player("river")
+    db.record_score_change(ace, 100, "seed")
+    assert wait_for(lambda: hub._version == db.data_version())
+
+    subscription = hub.subscribe()
+    event, data = parse_frame(subscription.next_frame(1))
+    assert event == "snapshot"
+    assert [(entry["nickname"], entry["rank"]) for entry in data["players"]] == [("ace", 1), ("river", 2)]
+
+    db.record_score_change(river, 150, "hand")
+    event, data = parse_frame(subscription.next_frame(5))
+    assert event == "diff"
+    assert [(entry["nickname"], entry["rank"]) for entry in data["changed"]] == [("river", 1), ("ace", 2)]
+    assert data["removed"] == []
+
+
+def test_full_hub_refuses_new_subscribers(hub: LeaderboardHub) -> None:
+    first, second = hub.subscribe(), hub.subscribe()
+    assert hub.subscribe() is None
+    hub.unsubscribe(first)
+    assert hub.subscribe() is not None
+    assert second.next_frame(1) is not None
+
+
+def test_a_subscriber_that_falls_behind_is_evicted(hub: LeaderboardHub) -> None:
+    slow, fast = hub.subscribe(), hub.subscribe()
+    while slow.offer(b": filler\n\n"):
+        pass
+    db.record_score_change(db.add_player("ace"), 100, "seed")
+
+    assert wait_for(lambda: hub.evicted == 1)
+    assert hub.subscriber_count() == 1
+    assert slow.closed
+    assert fast.next_frame(1) is not None  # snapshot
+    assert parse_frame(fast.next_frame(5))[0] == "diff"
+
+
+def test_closed_subscription_wakes_its_reader() -> None:
+    subscription = Subscription(max_pending=1)
+    subscription.offer(b"frame")
+    subscription.close()
+    assert subscription.next_frame(5) is None
+    assert not subscription.offer(b"late")
+
+
+def test_threading_stream_releases_a_closed_client_between_heartbeats(server: Client) -> None:
+    baseline = app.LIVE_HUB.subscriber_count()
+    with socket.create_connection(("127.0.0.1", server.port), timeout=5) as sock:
+        sock.sendall(b"GET /api/leaderboard/stream HTTP/1.1\r\nHost: test\r\n\r\n")
+        received = b""
+        while b"event: snapshot" not in received:
+            received += sock.recv(65536)
+        assert app.LIVE_HUB.subscriber_count() == baseline + 1
+    # well before the next heartbeat would have found the broken pipe
+    assert wait_for(lambda: app.LIVE_HUB.subscriber_count() == baseline, timeout=app.HEARTBEAT_SECONDS / 3)
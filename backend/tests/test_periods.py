@@ -0,0 +1,84 @@
+"""Period leaderboards: the period_totals summary against the raw score history."""
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+import db
+from helpers import Client
+
+
+def periods_of(created_at: str) -> list[str]:
+    year, month = created_at[:4], int(created_at[5:7])
+    return [year, f"{year}-S{1 if month <= 6 else 2}", created_at[:7]]
+
+
+def totals_from_history() -> dict[tuple[str, int], tuple[int, int]]:
+    totals: dict[tuple[str, int], list[int]] = defaultdict(lambda: [0, 0])
+    with db.pooled_connection() as conn:
+        for row in conn.execute("SELECT player_id, delta, created_at FROM score_history;"):
+            for period in periods_of(row["created_at"]):
+                totals[period, row["player_id"]][0] += row["delta"]
+                totals[period, row["player_id"]][1] += 1
+    return {key: tuple(value) for key, value in totals.items()}
+
+
+def totals_from_summary() -> dict[tuple[str, int], tuple[int, int]]:
+    with db.pooled_connection() as conn:
+        rows = conn.execute("SELECT period, player_id, points, finals FROM period_totals;").fetchall()
+    return {(row["period"], row["player_id"]): (row["points"], row["finals"]) for row in rows}
+
+
+def play(label: str, played_at: str, nicknames: list[str]) -> None:
+    placements = [
+        {"nickname": nickname, "rank": rank, "played_at": played_at} for rank, nickname in enumerate(nicknames, 1)
+    ]
+    assert db.record_game_results(placements, game_label=label)["errors"] == []
+
+
+@pytest.fixture
+def season(database: Path) -> None:
+    play("Opener", "2025-12-31T23:30:00", ["ace", "river", "chip"])
+    play("Midyear", "2026-06-30 12:00:00", ["river", "chip", "ace"])
+    # 08:00 in Sydney on 1 July is still 30 June in UTC, so semester one
+    play("Sydney morning", "2026-07-01T08:00:00+10:00", ["chip", "ace"])
+    play("Second half", "2026-07-01", ["ace", "chip", "river"])
+    db.record_score_change(db.get_player_by_nickname("river")["id"], -25, "Penalty")
+
+
+def test_summary_matches_the_history(season: None) -> None:
+    summary = totals_from_summary()
+    assert summary == totals_from_history()
+    ace = db.get_player_by_nickname("ace")["id"]
+    assert summary["2026-S1", ace] == (db.DEFAULT_RANK_POINTS[3] + db.DEFAULT_RANK_POINTS[2], 2)
+    assert summary["2026-07", ace] == (db.DEFAULT_RANK_POINTS[1], 1)
+    assert summary["2025", ace] == (db.DEFAULT_RANK_POINTS[1], 1)
+
+
+def test_rebuild_reproduces_the_incremental_summary(season: None) -> None:
+    before = totals_from_summary()
+    db.rebuild_period_totals()
+    assert totals_from_summary() == before
+
+
+def test_period_leaderboard_orders_and_pages(season: None) -> None:
+    rows = db.list_period_leaderboard("2026")
+    totals = {player_id: points for (period, player_id), (points, _) in totals_from_history().items() if period == "2026"}
+    expected = sorted(
+        ((points, db.get_player(player_id)["nickname"]) for player_id, points in totals.items()),
+        key=lambda entry: (-entry[0], entry[1]),
+    )
+    assert [(row["total_points"], row["nickname"]) for row in rows] == expected
+
+    first = db.list_period_leaderboard("2026", limit=1)
+    rest = db.list_period_leaderboard("2026", after=(first[0]["total_points"], first[0]["nickname"]))
+    assert [row["id"] for row in first + rest] == [row["id"] for row in rows]
+    assert db.list_period_leaderboard("2024") == []
+
+
+def test_period_query_parameter(server: Client) -> None:
+    assert server.json("GET", "/api/leaderboard?period=2026-13")[0] == 400
+    assert server.json("GET", "/api/leaderboard?period=2026-S3")[0] == 400
+    assert server.json("GET", "/api/leaderboard?period=1999")[0] == 200
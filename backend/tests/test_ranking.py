@@ -0,0 +1,60 @@
+"""IndexableSkipList checked against a plain sorted list."""
+from __future__ import annotations
+
+import random
+
+from ranking import IndexableSkipList, RankKey, rank_key
+
+
+def random_keys(rng: random.Random, count: int) -> list[RankKey]:
+    # few distinct point values, so ties fall back to nickname and id
+    return [rank_key(player_id, f"p{rng.randrange(50):02d}", rng.randrange(10) * 50) for player_id in range(count)]
+
+
+def test_rank_and_slice_match_a_sorted_list() -> None:
+    rng = random.Random(2026)
+    index = IndexableSkipList()
+    expected: list[RankKey] = []
+    keys = random_keys(rng, 400)
+
+    for key in keys:
+        index.insert(key)
+        expected.append(key)
+    for key in rng.sample(keys, 150):
+        assert index.remove(key)
+        expected.remove(key)
+    expected.sort()
+
+    assert len(index) == len(expected)
+    assert list(index.slice(0, len(index))) == expected
+    for position, key in enumerate(expected):
+        assert index.index(key) == position
+    for _ in range(200):
+        start = rng.randrange(-5, len(expected) + 5)
+        stop = start + rng.randrange(0, 30)
+        assert list(index.slice(start, stop)) == expected[max(start, 0) : max(stop, 0)]
+
+
+def test_missing_keys() -> None:
+    index = IndexableSkipList()
+    assert index.index(rank_key(1, "ace", 100)) is None
+    assert not index.remove(rank_key(1, "ace", 100))
+    assert list(index.slice(0, 10)) == []
+
+    index.insert(rank_key(1, "ace", 100))
+    assert index.index(rank_key(1, "ace", 90)) is None
+    assert not index.remove(rank_key(2, "ace", 100))
+    assert len(index) == 1
+
+
+def test_moving_a_key_updates_ranks() -> None:
+    index = IndexableSkipList()
+    for player_id, points in enumerate([300, 200, 100]):
+        index.insert(rank_key(player_id, f"p{player_id}", points))
+
+    # the last player overtakes everyone: remove the old key, insert the new one
+    index.remove(rank_key(2, "p2", 100))
+    index.insert(rank_key(2, "p2", 400))
+
+    assert [key[2] for key in index.slice(0, 3)] == [2, 0, 1]
+    assert index.index(rank_key(1, "p1", 200)) == 2
@@ -0,0 +1,79 @@
+"""Token buckets, bounded bucket tables and admission control."""
+from __future__ import annotations
+
+import pytest
+
+import app
+from helpers import Client
+from ratelimit import AdmissionController, BucketTable, TokenBucket
+
+
+def test_token_bucket_spends_and_refills() -> None:
+    bucket = TokenBucket(capacity=3, rate=2, now=100.0)
+    assert [bucket.take(100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take(100.0) == pytest.approx(0.5)
+    assert bucket.peek(100.25) == pytest.approx(0.25)
+    assert bucket.take(100.5) == 0.0
+    # refills stop at capacity
+    assert bucket.full(110.0)
+    assert bucket.tokens == 3
+
+
+def test_bucket_table_forgets_the_stalest_key() -> None:
+    table = BucketTable(capacity=1, rate=0.001, max_keys=2)
+    assert table.take("a") == 0.0
+    assert table.take("b") == 0.0
+    assert table.take("a") > 0
+    table.take("c")
+    assert len(table) == 2
+    # "b" was evicted, so it starts again with a full bucket
+    assert table.take("b") == 0.0
+    assert table.peek("unseen") == 0.0
+
+
+@pytest.mark.parametrize(("capacity", "rate"), [(0, 1), (5, 0), (5, -1)])
+def test_bucket_table_rejects_limits_without_a_finite_wait(capacity: float, rate: float) -> None:
+    with pytest.raises(ValueError, match="must be positive"):
+        BucketTable(capacity, rate)
+
+
+def test_admission_charges_only_requests_it_admits() -> None:
+    controller = AdmissionController((1, 0.001), {"POST /scores": (5, 0.001)}, max_concurrent=4)
+    assert controller.check("alice", "POST /scores") == 0.0
+    # the client bucket refuses the next four, which must not drain the route bucket
+    for _ in range(4):
+        assert controller.check("alice", "POST /scores") > 0
+    assert controller.routes["POST /scores"].peek("alice", 4) == 0.0
+    assert controller.check("bob", "POST /scores") == 0.0
+    assert controller.check("alice", "POST /other") > 0
+
+    controller.enabled = False
+    assert controller.check("alice", "POST /scores") == 0.0
+
+
+def test_admission_caps_concurrent_requests() -> None:
+    controller = AdmissionController(None, {}, max_concurrent=2)
+    assert controller.enter() and controller.enter()
+    assert not controller.enter()
+    controller.leave()
+    assert controller.enter()
+    assert controller.active == 2
+
+
+def test_server_answers_429_with_retry_after(server: Client, monkeypatch: pytest.MonkeyPatch) -> None:
+    limits = {"POST /api/players/{player_id:int}/scores": (2, 0.5)}
+    monkeypatch.setattr(app, "ADMISSION", AdmissionController((100, 100), limits, max_concurrent=8))
+
+    for _ in range(2):
+        assert server.request("POST", "/api/players/1/scores", {"delta": 1})[0] == 201
+    status, headers, _ = server.request("POST", "/api/players/1/scores", {"delta": 1})
+    assert status == 429
+    assert headers["Retry-After"] == "2"
+    # other write routes are limited by the client bucket only
+    assert server.request("POST", "/api/players", {"nickname": "fresh"})[0] == 201
+
+
+def test_zero_rate_in_config_is_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app, "CONFIG", {"rate_limits": {"client": [10, 0]}})
+    with pytest.raises(RuntimeError, match="Invalid rate_limits"):
+        app.build_admission_controller()
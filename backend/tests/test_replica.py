@@ -0,0 +1,71 @@
+"""Snapshot read routing: staleness, read-your-writes and monotonic versions."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import db
+from helpers import Client
+
+
+@pytest.fixture
+def replica(database: Path, tmp_path: Path) -> Iterator[db.SnapshotReplica]:
+    """A snapshot route that never refreshes on its own during the test."""
+    db.configure_reads("snapshot", size=2, refresh_interval=3600, max_staleness=3600, replica_dir=tmp_path / "replica")
+    yield db._replica
+    db.close_reads()
+
+
+def test_replica_serves_its_snapshot_until_refreshed(replica: db.SnapshotReplica) -> None:
+    player = db.add_player("ace")
+    with db.replica_reads():
+        assert db.read_version() == replica.version < db.data_version()
+        assert db.get_player(player) is None
+    replica.refresh()
+    with db.replica_reads():
+        assert db.read_version() == db.data_version()
+        assert db.get_player(player)["nickname"] == "ace"
+
+
+def test_a_session_reads_its_own_writes(replica: db.SnapshotReplica) -> None:
+    player = db.add_player("ace")
+    db.note_session_write("writer")
+    with db.replica_reads("writer"):
+        assert db.read_version() == db.data_version()
+        assert db.get_player(player)["nickname"] == "ace"
+    # other clients may still be served the older copy
+    with db.replica_reads("reader"):
+        assert db.read_version() == replica.version
+        assert db.get_player(player) is None
+
+
+def test_a_session_never_sees_the_version_go_backwards(replica: db.SnapshotReplica) -> None:
+    db.add_player("ace")
+    seen: list[int] = []
+    with db.replica_reads("client"):
+        seen.append(db.read_version())
+    # the replica is too far behind, so this read falls back to the primary...
+    replica.max_staleness = 0.0
+    with db.replica_reads("client"):
+        seen.append(db.read_version())
+    # ...and once the replica counts as fresh again it is still older than that
+    replica.max_staleness = 3600
+    with db.replica_reads("client"):
+        seen.append(db.read_version())
+    with db.replica_reads("other"):
+        other = db.read_version()
+    assert seen == [replica.version, db.data_version(), db.data_version()]
+    assert other == replica.version
+
+
+def test_games_list_shows_a_game_right_after_it_is_posted(server: Client, tmp_path: Path) -> None:
+    db.configure_reads("snapshot", size=2, refresh_interval=3600, max_staleness=3600, replica_dir=tmp_path / "replica")
+    status, body = server.json(
+        "POST", "/api/games", {"label": "Final", "placements": [{"nickname": "AceHigh", "rank": 1}]}, admin=True
+    )
+    assert status == 201
+    status, page = server.json("GET", "/api/games")
+    assert status == 200
+    assert body["game_ids"][0] in [game["id"] for game in page["games"]]
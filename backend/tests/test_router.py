@@ -0,0 +1,77 @@
+"""Route table compilation, typed parameters and the 404/405 split."""
+from __future__ import annotations
+
+import pytest
+
+from helpers import Client
+from router import Router
+
+
+def make_router() -> Router:
+    router = Router()
+    router.add("GET", "/api/players", "list_players")
+    router.add("GET", "/api/players/{player_id:int}", "player_detail")
+    router.add("GET", "/api/players/{player_id:int}/history", "player_history")
+    router.add("GET", "/api/tags/{name}", "tag_detail")
+    router.add("POST", "/api/players/{player_id:int}/scores", "record_score", admin=True, cors=False)
+    return router.compile()
+
+
+def test_static_and_dynamic_routes_match() -> None:
+    router = make_router()
+
+    match = router.match("GET", "/api/players?ids=1,2&ids=3")
+    assert match.route.handler == "list_players"
+    assert match.params == {}
+    assert match.query == {"ids": ["1,2", "3"]}
+
+    match = router.match("GET", "/api/players/42/history?limit=5")
+    assert match.route.handler == "player_history"
+    assert match.params == {"player_id": 42}
+    assert match.query == {"limit": ["5"]}
+
+    match = router.match("POST", "/api/players/7/scores")
+    assert (match.route.handler, match.route.admin, match.route.cors) == ("record_score", True, False)
+
+
+def test_converters() -> None:
+    router = make_router()
+    assert router.match("GET", "/api/players/007").params == {"player_id": 7}
+    assert router.match("GET", "/api/tags/high%20roller").params == {"name": "high roller"}
+    assert router.match("GET", "/api/players/abc") is None
+    assert router.match("GET", "/api/players/-1") is None
+    assert router.match("GET", "/api/tags/a/b") is None
+
+
+def test_unknown_converter_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown converter"):
+        Router().add("GET", "/api/players/{player_id:uuid}", "player_detail")
+
+
+def test_allowed_methods_tell_405_from_404() -> None:
+    router = make_router()
+    assert router.match("POST", "/api/players/7") is None
+    assert router.allowed_methods("/api/players/7") == ["GET"]
+    assert router.allowed_methods("/api/players/7/scores?x=1") == ["POST"]
+    assert router.allowed_methods("/api/nowhere") == []
+
+
+def test_server_answers_404_and_405(server: Client) -> None:
+    status, headers, _ = server.request("POST", "/api/leaderboard", {})
+    assert status == 405
+    assert headers["Allow"] == "GET, OPTIONS"
+
+    status, headers, _ = server.request("GET", "/api/players/1/scores")
+    assert status == 405
+    assert headers["Allow"] == "POST, OPTIONS"
+
+    assert server.request("POST", "/api/nowhere", {})[0] == 404
+    assert server.request("GET", "/api/players/999")[0] == 404
+    assert server.request("GET", "/no-such-page.html")[0] == 404
+
+
+@pytest.mark.parametrize("server", ["threading", "asyncio"], indirect=True)
+def test_score_for_a_missing_player_is_404(server: Client) -> None:
+    status, body = server.json("POST", "/api/players/999/scores", {"delta": 10})
+    assert (status, body) == (404, {"error": "Player not found"})
+    assert server.json("POST", "/api/players/1/scores", {"delta": 10})[0] == 201